@@ -1,4 +1,13 @@
 
-from .celery_config import app as celery_app
+# The Celery app is created on first access rather than at import, so the web
+# process only pays for Celery when it first queues a task
+# (JobPortal.views._enqueue). ``app`` is what ``celery -A JobHunt`` looks up.
+def __getattr__(name):
+    if name in ('celery_app', 'app'):
+        from .celery_config import app
 
-__all__ = ('celery_app',)
\ No newline at end of file
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+__all__ = ('celery_app',)
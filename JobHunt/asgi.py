@@ -13,4 +13,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'JobHunt.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up.
+from JobPortal.push import sse_app  # noqa: E402
+
+PUSH_PATH = '/events/'
+
+
+async def application(scope, receive, send):
+    # Server-Sent Events are served by a plain ASGI app: each stream is a
+    # coroutine on the event loop instead of a request held in a thread.
+    if scope['type'] == 'http' and scope['path'] == PUSH_PATH:
+        return await sse_app(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -1,7 +1,11 @@
 # TalentHunt/celery_config.py
 
 from celery import Celery
+from celery.signals import task_prerun, task_postrun
 import os
+import time
+
+from JobPortal import metrics
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'JobHunt.settings')
@@ -15,6 +19,44 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Automatically discover tasks from all apps
 app.autodiscover_tasks()
 
+
+@task_prerun.connect
+@task_postrun.connect
+def close_stale_db_connections(task=None, **kwargs):
+    """
+    Reuse the worker's DB connections across tasks, dropping only those that
+    are past CONN_MAX_AGE or fail the health check (like Django does at the
+    start and end of every request). Eager tasks share the caller's
+    connection and are left alone.
+    """
+    from django.db import close_old_connections
+
+    if task is not None and getattr(task.request, 'is_eager', False):
+        return
+
+    close_old_connections()
+
+
+@task_prerun.connect
+def start_task_timer(task=None, **kwargs):
+    task.request.metrics_started = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_metrics(task=None, state=None, **kwargs):
+    """
+    Count every run of a task by outcome (``tasks.<name>.success``,
+    ``.failure``, ``.retry``, ...) and time it (``tasks.<name>.duration``),
+    in this process' JobPortal.metrics. This is what reports on tasks whose
+    results are not stored.
+    """
+    name = task.name.rsplit('.', 1)[-1]
+    metrics.incr(f'tasks.{name}.{(state or "unknown").lower()}')
+    started = getattr(task.request, 'metrics_started', None)
+    if started is not None:
+        metrics.timing(f'tasks.{name}.duration', time.perf_counter() - started)
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -51,7 +51,16 @@ INSTALLED_APPS = [
     
 ]
 
+# APPS_PROFILE=production drops apps the API does not use at runtime:
+# django_extensions is a development toolbox and no djoser routes are
+# mounted. Both are imported at startup otherwise, which autoscaled web and
+# worker containers pay on every cold start (see benchmarks/bench_startup.py).
+DEV_ONLY_APPS = ('django_extensions', 'djoser')
+if os.getenv('APPS_PROFILE') == 'production':
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEV_ONLY_APPS]
+
 MIDDLEWARE = [
+    'JobPortal.middleware.RequestCaptureMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,7 +76,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -75,6 +83,14 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Templates (including the notification emails) are compiled once
+            # per process and served from memory afterwards.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -85,23 +101,114 @@ WSGI_APPLICATION = 'JobHunt.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE picks the backend: the local SQLite file by default, or the
+# production MySQL/PostgreSQL server configured through the DB_* variables.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+
+# Connections are kept open between requests/tasks for DB_CONN_MAX_AGE seconds
+# and checked before reuse, instead of reconnecting for every request.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+if DB_ENGINE == 'sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / os.getenv('SQLITE_PATH', 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
     }
-}
-
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.mysql',
-#         'NAME': 'JobHunt',
-#         'USER': 'root',
-#         'PASSWORD': 'semi@123',
-#         'HOST': 'localhost',
-#         'PORT': '3306',
-#     }
-# }
+    # SQLITE_PROFILE=production is for regional instances where several
+    # gunicorn workers share the file: WAL lets readers run alongside the
+    # writer, busy_timeout makes writers queue instead of failing with
+    # "database is locked", and BEGIN IMMEDIATE takes the write lock up front
+    # so a transaction never has to upgrade a read lock mid-way.
+    if os.getenv('SQLITE_PROFILE') == 'production':
+        DATABASES['default']['OPTIONS'] = {
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA cache_size=-20000;'  # 20 MB page cache per connection
+                'PRAGMA mmap_size=268435456;'  # 256 MB memory-mapped reads
+                'PRAGMA busy_timeout=10000;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        }
+elif DB_ENGINE == 'mysql':
+    # Django has no MySQL pool; persistent connections give one pooled
+    # connection per worker thread.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': os.getenv('DB_NAME', 'JobHunt'),
+            'USER': os.getenv('DB_USER', 'root'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '3306'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+elif DB_ENGINE == 'postgresql':
+    from psycopg_pool import ConnectionPool
+
+    # Native psycopg pool shared by the threads of a process; the pool does
+    # its own connection lifecycle, so persistent connections are disabled.
+    # CONN_HEALTH_CHECKS does not apply to pooled connections: 'check' pings
+    # each one as it leaves the pool, so a connection the server or a proxy
+    # dropped while idle is replaced rather than handed to a request.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'JobHunt'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                    'max_idle': int(os.getenv('DB_POOL_MAX_IDLE', 300)),
+                    'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+                    'check': ConnectionPool.check_connection,
+                },
+            },
+        }
+    }
+else:
+    raise ValueError(f'Unsupported DB_ENGINE: {DB_ENGINE}')
+
+# Read replicas: every entry in DB_REPLICAS (comma separated) becomes a
+# 'replica_<n>' alias with the primary's settings. Entries are file paths for
+# SQLite and host names for the server backends. Locally a copy of the
+# primary file stands in for a replica, e.g.
+#   cp db.sqlite3 db.replica.sqlite3
+#   DB_REPLICAS=db.replica.sqlite3 python manage.py runserver
+DATABASE_REPLICAS = []
+for _index, _replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(','))):
+    _alias = f'replica_{_index + 1}'
+    DATABASES[_alias] = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if DB_ENGINE == 'sqlite3':
+        DATABASES[_alias]['NAME'] = BASE_DIR / _replica.strip()
+    else:
+        DATABASES[_alias]['HOST'] = _replica.strip()
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ['JobPortal.db_routers.PrimaryReplicaRouter']
+
+# After a write, the user's reads stay on the primary for this many seconds so
+# they never see replication lag on their own changes.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+
+# Tests (JobHunt.test_runner): the SQLite test database is migrated once
+# into a template file under TEST_DATABASE_DIR, named after a hash of the
+# migrations, and reused (copied per worker under --parallel) until a
+# migration changes. Pass --rebuild-template to start from scratch.
+TEST_RUNNER = 'JobHunt.test_runner.TemplateDatabaseRunner'
+TEST_DATABASE_DIR = BASE_DIR / '.test-db'
 
 
 # Password validation
@@ -161,16 +268,200 @@ SITE_URL = 'http://127.0.0.1:8000/'
 # TalentHunt/settings.py
 
 # Celery settings
-CELERY_BROKER_URL = 'redis://localhost:6379/0'  # Redis as the broker
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')  # Redis as the broker
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+# Only tasks that keep their results write here; the notification tasks are
+# fire-and-forget (ignore_result) and report to JobPortal.metrics instead.
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+# Celery's Django fixup closes every DB connection around every task unless
+# reuse is enabled; with it, JobHunt.celery_config applies CONN_MAX_AGE and
+# health checks between tasks and the fixup only force-recycles every
+# CELERY_DB_REUSE_MAX tasks.
+CELERY_DB_REUSE_MAX = int(os.getenv('CELERY_DB_REUSE_MAX', 1000))
+
+# Task routing. Each class of task has its own queue so a burst in one (e.g.
+# a bulk rejection producing thousands of status updates) cannot delay
+# another, and each queue gets its own worker pool, e.g.
+#   celery -A JobHunt worker -Q transactional -c 4
+#   celery -A JobHunt worker -Q notifications,bulk -c 8
+#   celery -A JobHunt worker -Q maintenance,default -c 1
+# A worker serving several queues drains them in the order given to -Q
+# (queue_order_strategy 'priority'), so notifications go before bulk.
+CELERY_TASK_QUEUES = {
+    name: {'exchange': name, 'routing_key': name}
+    for name in ('transactional', 'notifications', 'bulk', 'maintenance', 'default')
+}
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'JobPortal.tasks.send_welcome_email': {'queue': 'transactional'},
+    'JobPortal.tasks.send_application_notification': {'queue': 'notifications'},
+    'JobPortal.tasks.send_application_status_update_notification': {'queue': 'bulk'},
+    'JobPortal.tasks.send_recruiter_digests': {'queue': 'notifications'},
+    'JobPortal.tasks.deactivate_expired_jobs': {'queue': 'maintenance'},
+    'JobPortal.tasks.archive_closed_jobs': {'queue': 'maintenance'},
+    'JobPortal.tasks.cleanup_upload_sessions': {'queue': 'maintenance'},
+    'JobPortal.tasks.prune_application_tombstones': {'queue': 'maintenance'},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'queue_order_strategy': 'priority',
+    # Must exceed the longest task runtime, or acks_late tasks get redelivered.
+    'visibility_timeout': 3600,
+}
+
+# SMTP provider quotas per queue. Celery rate limits apply per worker
+# process and task, so divide by the number of worker processes of the queue.
+EMAIL_RATE_LIMITS = {
+    'transactional': os.getenv('EMAIL_RATE_LIMIT_TRANSACTIONAL', '120/m'),
+    'notifications': os.getenv('EMAIL_RATE_LIMIT_NOTIFICATIONS', '60/m'),
+    'bulk': os.getenv('EMAIL_RATE_LIMIT_BULK', '30/m'),
+}
+CELERY_TASK_ANNOTATIONS = {
+    task: {'rate_limit': EMAIL_RATE_LIMITS[route['queue']]}
+    for task, route in CELERY_TASK_ROUTES.items()
+    if route['queue'] in EMAIL_RATE_LIMITS
+}
+
+# Acknowledge after the task ran so a crashed worker's task is redelivered;
+# tasks are idempotent (JobPortal.tasks.claim_task). A task that raises is
+# acknowledged all the same: email tasks retry failed sends themselves
+# (JobPortal.tasks.EMAIL_TASK_OPTIONS). One message prefetched
+# per process keeps long sends from holding a backlog hostage.
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+TASK_IDEMPOTENCY_TTL = 24 * 60 * 60
+# How long a delivery holds a task's claim while it sends. A redelivery that
+# finds the claim retries after this long, so it must exceed a send.
+TASK_CLAIM_LEASE = 5 * 60
+
+CELERY_BEAT_SCHEDULE = {
+    'deactivate-expired-jobs': {
+        'task': 'JobPortal.tasks.deactivate_expired_jobs',
+        'schedule': timedelta(minutes=15),
+    },
+    'archive-closed-jobs': {
+        'task': 'JobPortal.tasks.archive_closed_jobs',
+        'schedule': timedelta(days=1),
+    },
+    'cleanup-upload-sessions': {
+        'task': 'JobPortal.tasks.cleanup_upload_sessions',
+        'schedule': timedelta(hours=1),
+    },
+    'prune-application-tombstones': {
+        'task': 'JobPortal.tasks.prune_application_tombstones',
+        'schedule': timedelta(days=1),
+    },
+    'send-recruiter-digests': {
+        'task': 'JobPortal.tasks.send_recruiter_digests',
+        'schedule': timedelta(minutes=int(os.getenv('RECRUITER_DIGEST_MINUTES', 60))),
+    },
+}
+
+# Job expiry and archival (JobPortal.archival). Work is done in small batches
+# with a pause in between to keep lock hold times short.
+JOB_EXPIRY_BATCH_SIZE = 500
+JOB_ARCHIVE_BATCH_SIZE = 200
+JOB_ARCHIVE_MAX_APPLICATIONS = 5000  # per batch; a single larger job still goes in one
+JOB_MAINTENANCE_PAUSE = 0.1  # seconds between batches
+JOB_ARCHIVE_AFTER_DAYS = int(os.getenv('JOB_ARCHIVE_AFTER_DAYS', 180))
+JOB_ARCHIVE_DIR = BASE_DIR / os.getenv('JOB_ARCHIVE_DIR', 'archive')
+
+# Resumable chunked uploads (JobPortal.uploads). Chunks are appended to a
+# staging file per session; sessions idle for CHUNKED_UPLOAD_EXPIRY seconds
+# are garbage-collected by the cleanup_upload_sessions task.
+CHUNKED_UPLOAD_DIR = BASE_DIR / os.getenv('CHUNKED_UPLOAD_DIR', 'upload-staging')
+CHUNKED_UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 2 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY = 24 * 60 * 60
+
+# Employee inbox delta sync (JobPortal.sync). Changes younger than the settle
+# window wait for the next call so in-flight transactions cannot be skipped;
+# tokens older than the tombstone retention get 410 and a full resync.
+APPLICATION_SYNC_PAGE_SIZE = 500
+APPLICATION_SYNC_SETTLE_SECONDS = 2
+APPLICATION_TOMBSTONE_RETENTION_DAYS = 30
+
+# Server-Sent Events push channel (JobPortal.push, served at /events/ by
+# JobHunt.asgi). Events queue per connection up to PUSH_QUEUE_SIZE; a comment
+# line every PUSH_HEARTBEAT_SECONDS keeps idle streams open through proxies.
+PUSH_QUEUE_SIZE = 100
+PUSH_HEARTBEAT_SECONDS = 25
+
+# Traffic capture for manage.py replay_requests: set REQUEST_CAPTURE_PATH to
+# a file and every request is appended to it as a JSON line (credentials
+# redacted). Unset, the middleware removes itself at startup.
+REQUEST_CAPTURE_PATH = os.getenv('REQUEST_CAPTURE_PATH')
+
+# Write throttling (JobPortal.throttling): a token bucket per scope and user
+# (client address when anonymous) at the rate of the user's role, 'default'
+# for roles not listed and None for no limit. THROTTLE_BACKEND 'cache' shares
+# buckets through the default cache (atomic on Redis); 'memory' keeps them
+# per process.
+THROTTLE_BACKEND = os.getenv('THROTTLE_BACKEND', 'cache')
+THROTTLE_RATES = {
+    'application-create': {'employee': '30/m', 'superadmin': None, 'default': '60/m'},
+    'job-create': {'recruiter': '20/m', 'superadmin': None, 'default': '60/m'},
+    'auth': {'default': '10/m'},
+}
+# Admission control: throttled writes get 429 + Retry-After while this
+# process' average query time is over ADMISSION_DB_LATENCY_MS, or a Celery
+# queue the scope feeds holds more than its limit (read every
+# ADMISSION_CHECK_SECONDS in the background, giving up on a broker that does
+# not answer within ADMISSION_PROBE_TIMEOUT).
+ADMISSION_DB_LATENCY_MS = int(os.getenv('ADMISSION_DB_LATENCY_MS', 250))
+ADMISSION_SAMPLE_TTL = 30
+ADMISSION_QUEUE_LIMITS = {
+    'application-create': {'notifications': 10000},
+    'auth': {'transactional': 5000},
+}
+ADMISSION_CHECK_SECONDS = 2
+ADMISSION_PROBE_TIMEOUT = 0.5
+ADMISSION_RETRY_AFTER = 5
+
+
+# Shared cache (idempotency keys, primary pins). Set CACHE_URL to a Redis URL
+# whenever more than one process serves the app; the local-memory fallback is
+# per process.
+if os.getenv('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Job board facets (JobPortal.facets): values listed per facet, and how long
+# a facet result is cached. Job writes invalidate the cache immediately.
+JOB_FACET_LIMIT = 20
+JOB_FACET_CACHE_TTL = 300
+
+# Near-duplicate job postings (JobPortal.dedupe): a job saved through the API
+# within JOB_DUPLICATE_MAX_DISTANCE bits (SimHash of title and description)
+# of an active job of the same recruiter is rejected ('reject'), saved with
+# duplicate_of pointing at the original ('flag') or let through ('off').
+# Distances up to 5 are always found (the signature has six LSH bands); at 5,
+# 99% of one-word edits and ~80% of three-word edits count as duplicates.
+JOB_DUPLICATE_ACTION = os.getenv('JOB_DUPLICATE_ACTION', 'reject')
+JOB_DUPLICATE_MAX_DISTANCE = 5
 
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'JobPortal.tokens.DenylistJWTAuthentication',
     ),
+    # Reverse proxies in front of the app. Anonymous clients are throttled
+    # by address: with 0 that is REMOTE_ADDR, otherwise the X-Forwarded-For
+    # entry the outermost trusted proxy added. Unset, DRF would take the
+    # whole client-supplied header and a new value would mean a new bucket.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 AUTH_USER_MODEL = 'JobPortal.User'
 CORS_ALLOW_ALL_ORIGINS = True
@@ -181,7 +472,8 @@ CORS_ALLOW_ALL_ORIGINS = True
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=2),
-    "ROTATE_REFRESH_TOKENS": False,
+    "ROTATE_REFRESH_TOKENS": True,
+    # Rotated and logged-out tokens go on JobPortal.denylist, not token_blacklist.
     "BLACKLIST_AFTER_ROTATION": False,
     "UPDATE_LAST_LOGIN": False,
 
@@ -196,8 +488,18 @@ SIMPLE_JWT = {
     "TOKEN_USER_CLASS": "rest_framework_simplejwt.models.TokenUser",
 
     "JTI_CLAIM": "jti",
+    "TOKEN_REFRESH_SERIALIZER": "JobPortal.tokens.RotatingTokenRefreshSerializer",
 
 }
+
+# Revoked token ids (JobPortal.denylist): each process keeps a Bloom filter
+# sized for DENYLIST_CAPACITY revocations per refresh-token lifetime and pulls
+# other processes' revocations every DENYLIST_SYNC_SECONDS. Entries live in
+# the cache until the token expires, so CACHE_URL must not evict them.
+DENYLIST_CAPACITY = 200000
+DENYLIST_FALSE_POSITIVE_RATE = 0.001
+DENYLIST_SYNC_SECONDS = 5
+
 PASSWORD_RESET_TIMEOUT=900
 
 CSRF_COOKIE_SECURE = True
@@ -205,3 +507,19 @@ CSRF_COOKIE_SECURE = True
 
 
 
+
+# JobPortal.metrics: every process logs the counters and timings of the last
+# METRICS_REPORT_SECONDS as one JSON line on the JobPortal.metrics logger.
+# 0 turns the reporter off.
+METRICS_REPORT_SECONDS = int(os.getenv('METRICS_REPORT_SECONDS', 60))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'JobPortal.metrics': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
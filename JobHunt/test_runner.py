@@ -0,0 +1,123 @@
+"""
+Test runner with a cached, pre-migrated SQLite template database.
+
+Every SQLite alias gets its test database at
+``TEST_DATABASE_DIR/test_<alias>_<fingerprint>.sqlite3``, where the
+fingerprint hashes the migration files and the Django version. The first
+run migrates it; later runs find it and only check that nothing is left to
+apply. Under ``--parallel`` each worker gets a fresh copy of the template.
+Tests leave the template as they found it (TestCase rolls back), and a
+template whose fingerprint no longer matches is deleted. Where workers are
+spawned rather than forked (macOS, Windows) Django only supports in-memory
+test databases, so there the database is migrated on every run as usual.
+
+Tasks run eagerly (TEST_SETTINGS) and mail goes to the locmem backend that
+Django's test environment installs, so tests read ``mail.outbox``.
+"""
+import hashlib
+import multiprocessing
+import sys
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django.test.runner import DiscoverRunner, ParallelTestSuite
+from django.test.utils import override_settings
+
+TEST_SETTINGS = {
+    # Tasks run inline in the calling test; exceptions propagate.
+    'CELERY_TASK_ALWAYS_EAGER': True,
+    'CELERY_TASK_EAGER_PROPAGATES': True,
+    'CELERY_BROKER_URL': 'memory://',
+    'CELERY_RESULT_BACKEND': 'cache+memory://',
+    # PBKDF2 costs ~0.3s per password; tests don't need it to be slow.
+    'PASSWORD_HASHERS': ['django.contrib.auth.hashers.MD5PasswordHasher'],
+    # Every test client comes from 127.0.0.1; throttling tests set their own rates.
+    'THROTTLE_RATES': {},
+    # Tests read metrics.snapshot(); a reporter would reset it under them.
+    'METRICS_REPORT_SECONDS': 0,
+}
+
+
+def apply_test_settings():
+    """Enable TEST_SETTINGS and return the override, for disable()."""
+    test_settings = override_settings(**TEST_SETTINGS)
+    test_settings.enable()
+    return test_settings
+
+
+def setup_worker():
+    # Spawned --parallel workers start from scratch: the settings must be
+    # loaded before they can be overridden.
+    django.setup()
+    apply_test_settings()
+
+
+def migrations_fingerprint():
+    """Short hash of every migration file on disk and the Django version."""
+    digest = hashlib.sha256(django.get_version().encode())
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key in sorted(loader.disk_migrations):
+        module = sys.modules[type(loader.disk_migrations[key]).__module__]
+        digest.update(repr(key).encode())
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class TemplateParallelTestSuite(ParallelTestSuite):
+    process_setup = setup_worker
+
+
+class TemplateDatabaseRunner(DiscoverRunner):
+    parallel_test_suite = TemplateParallelTestSuite
+
+    def __init__(self, *args, rebuild_template=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rebuild_template = rebuild_template
+        self.test_settings = None
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--rebuild-template', action='store_true',
+            help='Delete the cached template database and migrate a new one.',
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_settings = apply_test_settings()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def setup_databases(self, **kwargs):
+        if multiprocessing.get_start_method() == 'fork' and self.use_templates():
+            # Keep the template between runs; Django then only migrates
+            # what is missing, which for a cached template is nothing.
+            self.keepdb = True
+        return super().setup_databases(**kwargs)
+
+    def use_templates(self):
+        """Point every SQLite alias at its template file; False if none is SQLite."""
+        directory = Path(settings.TEST_DATABASE_DIR)
+        fingerprint = None
+        used = False
+        for alias in connections:
+            settings_dict = connections[alias].settings_dict
+            test = settings_dict['TEST']
+            if settings_dict['ENGINE'] != 'django.db.backends.sqlite3' or test.get('MIRROR') or test.get('NAME'):
+                continue
+            fingerprint = fingerprint or migrations_fingerprint()
+            directory.mkdir(parents=True, exist_ok=True)
+            template = directory / f'test_{alias}_{fingerprint}.sqlite3'
+            for path in directory.glob(f'test_{alias}_*.sqlite3'):
+                # Stale templates, and worker copies, which are recopied from the template.
+                if path != template or self.rebuild_template:
+                    path.unlink()
+            test['NAME'] = str(template)
+            used = True
+        return used
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import User, Recruiter, Employee, Job, Application
+from .pagination import EstimatedCountPaginator
 
 
 class UserAdmin(BaseUserAdmin):
@@ -24,32 +25,55 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+# The changelists below are built for tables with millions of rows:
+# - list_select_related joins the rows each __str__ needs into the page query,
+# - '^' search fields are prefix (istartswith) lookups, each backed by a
+#   case-insensitive index (migration 0009),
+# - EstimatedCountPaginator avoids COUNT(*) on the unfiltered list,
+# - FK inputs are autocomplete widgets instead of <select>s of every row.
+
 class RecruiterAdmin(admin.ModelAdmin):
     list_display = ('user', 'company_name', 'website', 'created_at', 'updated_at')
-    search_fields = ('user__email', 'company_name')
-    list_filter = ('created_at', 'updated_at')
+    list_select_related = ('user',)
+    search_fields = ('^user__email', '^company_name')
+    list_filter = ('notification_mode', 'created_at', 'updated_at')
     ordering = ('-created_at',)
+    autocomplete_fields = ('user',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class EmployeeAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone_number', 'location')
-    search_fields = ('user__email', 'phone_number', 'location')
+    list_select_related = ('user',)
+    search_fields = ('^user__email', '^phone_number', '^location')
     ordering = ('user',)
+    autocomplete_fields = ('user',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class JobAdmin(admin.ModelAdmin):
     list_display = ( 'id','title', 'recruiter', 'location', 'job_type', 'salary', 'posted_date', 'application_deadline')
-    search_fields = ('title', 'recruiter__user__email', 'location', 'job_type')
-    list_filter = ('job_type', 'posted_date', 'application_deadline')
+    list_select_related = ('recruiter__user',)
+    search_fields = ('^title', '^recruiter__user__email', '^location', '=job_type')
+    list_filter = ('job_type', 'posted_date', 'application_deadline', ('duplicate_of', admin.EmptyFieldListFilter))
     ordering = ('-posted_date',)
+    autocomplete_fields = ('recruiter', 'duplicate_of')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('employee', 'job', 'submitted_at', 'status')
-    search_fields = ('employee__user__email', 'job__title', 'status')
+    list_select_related = ('employee__user', 'job__recruiter')
+    search_fields = ('^employee__user__email', '^job__title', '=status')
     list_filter = ('status', 'submitted_at')
     ordering = ('-submitted_at',)
+    autocomplete_fields = ('employee', 'job')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 
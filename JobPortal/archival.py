@@ -0,0 +1,159 @@
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import metrics
+from .models import Application, Job
+from .signals import application_tombstones
+
+logger = logging.getLogger(__name__)
+
+
+def deactivate_expired_jobs(batch_size=None, pause=None, max_batches=None):
+    """
+    Set ``is_active=False`` on active jobs whose application deadline has passed.
+
+    Works through the expired jobs in primary-key order, one short ``UPDATE``
+    per batch with a pause in between so writers are never locked out for
+    long. Every batch commits on its own, so an interrupted run simply
+    continues where it stopped on the next call.
+    """
+    batch_size = batch_size or settings.JOB_EXPIRY_BATCH_SIZE
+    pause = settings.JOB_MAINTENANCE_PAUSE if pause is None else pause
+    now = timezone.now()
+    expired = Job.objects.filter(is_active=True, application_deadline__lt=now).order_by('id')
+
+    deactivated = batches = 0
+    last_id = 0
+    start = time.perf_counter()
+    while max_batches is None or batches < max_batches:
+        ids = list(expired.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deactivated += Job.objects.filter(id__in=ids, is_active=True).update(is_active=False)
+        batches += 1
+        last_id = ids[-1]
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+
+    elapsed = time.perf_counter() - start
+    metrics.incr('jobs.expiry.deactivated', deactivated)
+    metrics.incr('jobs.expiry.batches', batches)
+    metrics.timing('jobs.expiry.duration', elapsed)
+    logger.info('Deactivated %s expired jobs in %s batches (%.2fs)', deactivated, batches, elapsed)
+    return {'deactivated': deactivated, 'batches': batches, 'seconds': elapsed}
+
+
+def archive_closed_jobs(older_than_days=None, batch_size=None, max_applications=None, pause=None, max_batches=None,
+                        archive_dir=None):
+    """
+    Move closed jobs and their applications out of the hot tables.
+
+    A job is archivable once it is inactive and its deadline (or posting
+    date, when it has no deadline) is more than ``older_than_days`` old. A
+    batch is at most ``batch_size`` jobs and, past its first job, at most
+    ``max_applications`` applications. Each batch locks its jobs, is written
+    to ``<archive_dir>/jobs-<first id>-<last id>.jsonl.gz`` (one line per job
+    with its applications), fsynced and atomically renamed into place, and
+    deleted, all in one transaction. A run that dies before the commit picks
+    the same batch again and rewrites the same file, so re-running is always
+    safe.
+    """
+    older_than_days = settings.JOB_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.JOB_ARCHIVE_BATCH_SIZE
+    max_applications = max_applications or settings.JOB_ARCHIVE_MAX_APPLICATIONS
+    pause = settings.JOB_MAINTENANCE_PAUSE if pause is None else pause
+    archive_dir = Path(archive_dir or settings.JOB_ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    closed = Job.objects.filter(is_active=False).filter(
+        Q(application_deadline__lt=cutoff)
+        | Q(application_deadline__isnull=True, posted_date__lt=cutoff)
+    ).order_by('id')
+
+    jobs_archived = applications_archived = batches = 0
+    start = time.perf_counter()
+    while max_batches is None or batches < max_batches:
+        ids = list(closed.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        job_count, application_count = _archive_batch(closed, ids, max_applications, archive_dir)
+        jobs_archived += job_count
+        applications_archived += application_count
+        batches += 1
+        if len(ids) < batch_size and job_count == len(ids):
+            break
+        time.sleep(pause)
+
+    elapsed = time.perf_counter() - start
+    metrics.incr('jobs.archive.jobs', jobs_archived)
+    metrics.incr('jobs.archive.applications', applications_archived)
+    metrics.incr('jobs.archive.batches', batches)
+    metrics.timing('jobs.archive.duration', elapsed)
+    logger.info(
+        'Archived %s jobs and %s applications in %s batches (%.2fs)',
+        jobs_archived, applications_archived, batches, elapsed,
+    )
+    return {
+        'jobs': jobs_archived,
+        'applications': applications_archived,
+        'batches': batches,
+        'seconds': elapsed,
+    }
+
+
+def _archive_batch(closed, job_ids, max_applications, archive_dir):
+    with transaction.atomic():
+        # Locked until the delete commits; re-filtered, as a job may have
+        # been reopened since the ids were read.
+        ids = list(closed.select_for_update().filter(id__in=job_ids).values_list('id', flat=True))
+        ids = _within_application_budget(ids, max_applications)
+        if not ids:
+            return 0, 0
+        jobs = list(Job.objects.filter(id__in=ids).order_by('id').values())
+        applications = {}
+        for row in Application.objects.filter(job_id__in=ids).order_by('id').values():
+            applications.setdefault(row['job_id'], []).append(row)
+        archived = [(row['id'], row['employee_id']) for rows in applications.values() for row in rows]
+
+        path = archive_dir / f'jobs-{ids[0]}-{ids[-1]}.jsonl.gz'
+        partial = path.with_name(path.name + '.partial')
+        with open(partial, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+            for job in jobs:
+                line = {'job': job, 'applications': applications.get(job['id'], [])}
+                archive.write(json.dumps(line, cls=DjangoJSONEncoder).encode() + b'\n')
+            archive.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(partial, path)
+
+        with application_tombstones(archived):
+            Application.objects.filter(id__in=[pk for pk, _ in archived]).delete()
+        # Cascades (and tombstones) any application that arrived after the read.
+        Job.objects.filter(id__in=ids).delete()
+    return len(jobs), len(archived)
+
+
+def _within_application_budget(job_ids, max_applications):
+    """The leading ``job_ids`` whose applications add up to ``max_applications``; at least one."""
+    counts = dict(
+        Application.objects.filter(job_id__in=job_ids).values_list('job_id').annotate(Count('id')).order_by()
+    )
+    total = 0
+    for index, job_id in enumerate(job_ids):
+        total += counts.get(job_id, 0)
+        if index and total > max_applications:
+            return job_ids[:index]
+    return job_ids
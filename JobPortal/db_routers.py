@@ -0,0 +1,86 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def _sticky_key(user_id):
+    return f'db:pin-primary:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """
+    Keep the user's reads on the primary for REPLICA_STICKY_SECONDS.
+    The pin lives in the default cache, so it must be a shared cache
+    (e.g. Redis) when several worker processes serve the same users.
+    """
+    cache.set(_sticky_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(_sticky_key(user_id)) is not None
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to a random replica while a replica-eligible request is
+    being handled (see ReplicaReadMixin); everything else, and every write,
+    goes to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication (or a file copy locally).
+        return db == 'default'
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin routing safe-method traffic to the read replicas.
+
+    Authentication runs against the primary, then reads for GET/HEAD/OPTIONS
+    go to a replica unless the user wrote something in the last
+    REPLICA_STICKY_SECONDS. A successful write pins the user to the primary.
+    Actions listed in ``primary_only_actions`` always read from the primary.
+    """
+
+    primary_only_actions = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica = (
+            request.method in SAFE_METHODS
+            and getattr(self, 'action', None) not in self.primary_only_actions
+            and not is_pinned_to_primary(request.user.pk)
+        )
+        self._replica_token = _read_from_replica.set(use_replica)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _read_from_replica.reset(token)
+            self._replica_token = None
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,121 @@
+"""
+Near-duplicate job postings.
+
+A job's signature is a 64-bit SimHash over the distinct words of its title
+and description. A repost with a word or two changed lands a few bits
+away; different postings by one recruiter, even ones sharing a company
+blurb, rarely come within 12 bits. The SimHash is cut into six LSH bands
+of 10-11 bits, each stored in its own column and indexed with the
+recruiter, so by pigeonhole two signatures at most five bits apart always
+share a band. A lookup reads only the recruiter's jobs in one of the six
+band buckets and checks the real distance on those.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, router
+
+from .geo import normalize
+
+try:
+    import numpy
+except ImportError:  # numpy is optional; the bit count falls back to pure Python
+    numpy = None
+
+
+SIMHASH_BITS = 64
+BANDS = 6
+# Bit offsets of the bands: 0, 11, 21, 32, 43, 53, 64.
+BAND_BOUNDS = [round(band * SIMHASH_BITS / BANDS) for band in range(BANDS + 1)]
+BAND_FIELDS = tuple(f'simhash_band{band}' for band in range(BANDS))
+SIGNATURE_FIELDS = ('simhash', *BAND_FIELDS)
+
+
+def simhash(text):
+    """Unsigned 64-bit SimHash of ``text``: bit i is set when most word hashes have it set."""
+    # Single words beat word shingles here: an edited word moves one
+    # feature instead of three, while distinct postings stay as far apart.
+    features = set(normalize(text).split())
+    if not features:
+        return 0
+    digests = b''.join(hashlib.blake2b(feature.encode(), digest_size=8).digest() for feature in features)
+    if numpy is not None:
+        bits = numpy.unpackbits(numpy.frombuffer(digests, dtype=numpy.uint8).reshape(-1, 8), axis=1)
+        return int.from_bytes(numpy.packbits(bits.sum(axis=0) * 2 > len(features)).tobytes(), 'big')
+    hashes = [int.from_bytes(digests[i:i + 8], 'big') for i in range(0, len(digests), 8)]
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if sum(h >> bit & 1 for h in hashes) * 2 > len(hashes):
+            value |= 1 << bit
+    return value
+
+
+def signature(title, description):
+    """
+    ``{'simhash': ..., 'simhash_band0': ..., ...}`` column values for a job.
+    The SimHash is stored signed to fit a BigIntegerField.
+    """
+    value = simhash(f'{title}\n{description}')
+    columns = {
+        field: value >> BAND_BOUNDS[band] & (1 << BAND_BOUNDS[band + 1] - BAND_BOUNDS[band]) - 1
+        for band, field in enumerate(BAND_FIELDS)
+    }
+    columns['simhash'] = value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+    return columns
+
+
+def distance(a, b):
+    """Hamming distance between two stored (signed) SimHashes."""
+    return ((a ^ b) & (1 << SIMHASH_BITS) - 1).bit_count()
+
+
+@lru_cache(maxsize=None)
+def _candidates_sql(using):
+    """
+    The duplicate lookup, written out once per database: building it with
+    the ORM on every call costs ten times more than running it. The WHERE
+    clause is only the ``(recruiter, band)`` terms, one index each, so the
+    planner ORs the indexes; with is_active in it as well SQLite prefers
+    the is_active index and reads every active job.
+    """
+    from .models import Job
+
+    quote = connections[using].ops.quote_name
+    opts = Job._meta
+
+    def column(name):
+        return quote(opts.get_field(name).column)
+
+    buckets = ' OR '.join(f'({column("recruiter")} = %s AND {column(field)} = %s)' for field in BAND_FIELDS)
+    # No ORDER BY: sorting the candidates costs more than picking the oldest match in Python.
+    return (
+        f'SELECT {column("posted_date")}, {column("id")}, {column("simhash")}, {column("duplicate_of")}, '
+        f'{column("is_active")} FROM {quote(opts.db_table)} WHERE {buckets}'
+    )
+
+
+def find_duplicate(recruiter_id, title, description, exclude=None):
+    """
+    Id of the active job of ``recruiter_id`` that a posting with this title
+    and description duplicates (the original when that job is itself a
+    flagged duplicate), or None. ``exclude`` skips the job being edited.
+    Reads the primary database, which has the recruiter's latest jobs.
+    """
+    from .models import Job
+
+    columns = signature(title, description)
+    using = router.db_for_write(Job)
+    with connections[using].cursor() as cursor:
+        cursor.execute(_candidates_sql(using), [
+            value for field in BAND_FIELDS for value in (recruiter_id, columns[field])
+        ])
+        candidates = cursor.fetchall()
+    matches = [
+        (posted, pk, original) for posted, pk, other, original, is_active in candidates
+        if is_active and pk != exclude and distance(columns['simhash'], other) <= settings.JOB_DUPLICATE_MAX_DISTANCE
+    ]
+    if not matches:
+        return None
+    _, pk, original = min(matches)
+    return original or pk
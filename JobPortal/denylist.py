@@ -0,0 +1,229 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'jwt-deny:'
+SEQ_KEY = 'jwt-deny:seq'
+LOG_KEY = 'jwt-deny:log:{}'
+MARK_KEY = 'jwt-deny:mark:{}'
+MARK_SECONDS = 60 * 60
+SYNC_BATCH = 1000
+# Revocations that can be between taking a sequence number and logging it.
+IN_FLIGHT = 100
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over token ids.
+
+    Sized for ``capacity`` entries at ``error_rate`` false positives; it keeps
+    answering past capacity, only with more false positives. The ``k`` bit
+    positions come from two 64-bit halves of the id (h1 + i * h2), so a
+    lookup is a few integer operations and byte reads.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        h1, h2 = key & 0xFFFFFFFFFFFFFFFF, (key >> 64) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, key):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits, size, h1, h2 = self.bits, self.size, key & 0xFFFFFFFFFFFFFFFF, (key >> 64) | 1
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def _key(jti):
+    """128-bit integer for a jti: simplejwt's are uuid4 hex, anything else is hashed."""
+    try:
+        return int(jti, 16)
+    except (TypeError, ValueError):
+        return int.from_bytes(hashlib.blake2b(str(jti).encode(), digest_size=16).digest(), 'big')
+
+
+class Denylist:
+    """
+    Revoked JWT ids: a per-process Bloom filter in front of the shared cache.
+
+    The cache is the source of truth: a revoked jti is a key that expires
+    with the token, so the store never holds more than the tokens still
+    alive. Most checks are for tokens that were never revoked and end at the
+    Bloom filter without I/O; only a hit (a revoked token or a false
+    positive) is confirmed against the cache.
+
+    Revocations from other processes reach this filter through a sequence of
+    log keys in the cache, pulled at most every DENYLIST_SYNC_SECONDS, so a
+    token revoked elsewhere can be accepted here for up to that long. Each
+    hour's first sequence number is marked in the cache for as long as its
+    tokens can live, and a new process starts reading the log at the oldest
+    mark, not at 1. The filter has two generations of REFRESH_TOKEN_LIFETIME
+    each: entries older than that belong to expired tokens and are dropped
+    when the older generation is.
+
+    The cache must not evict these keys before they expire (a dedicated Redis
+    database without an eviction policy); the local-memory default only works
+    for a single process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held by the one thread pulling the log (sync); separate from
+        # self._lock so that filter updates never wait on cache I/O.
+        self._sync_lock = threading.Lock()
+        self._current = self._previous = None
+        self._rotate_at = self._next_sync = 0.0
+        self._seen = None
+        self._missing = {}
+
+    def _new_filter(self):
+        return BloomFilter(settings.DENYLIST_CAPACITY, settings.DENYLIST_FALSE_POSITIVE_RATE)
+
+    def _ensure(self, now):
+        # Called with the lock held.
+        if self._current is None:
+            self._current, self._previous = self._new_filter(), self._new_filter()
+            self._rotate_at = now + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+        elif now >= self._rotate_at:
+            self._previous, self._current = self._current, self._new_filter()
+            self._rotate_at = now + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+
+    def _remember(self, key, now):
+        with self._lock:
+            self._ensure(now)
+            self._current.add(key)
+
+    def revoke(self, jti, exp):
+        """
+        Deny ``jti`` until ``exp`` (epoch seconds). Returns False if it was
+        already denied, which makes revocation an atomic claim: of two
+        requests rotating the same refresh token, one gets False.
+        """
+        ttl = max(1, math.ceil(exp - time.time()))
+        if not cache.add(KEY_PREFIX + jti, 1, ttl):
+            return False
+        cache.add(SEQ_KEY, 0, None)
+        try:
+            sequence = cache.incr(SEQ_KEY)
+        except ValueError:  # evicted between add() and incr()
+            cache.add(SEQ_KEY, 1, None)
+            sequence = 1
+        cache.set(LOG_KEY.format(sequence), jti, ttl)
+        cache.add(MARK_KEY.format(int(time.time() // MARK_SECONDS)), sequence, self._lifetime() + MARK_SECONDS)
+        self._remember(_key(jti), time.monotonic())
+        return True
+
+    @staticmethod
+    def _lifetime():
+        return int(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+
+    def _floor(self, latest):
+        """Sequence number a new process starts after: every entry up to it has expired."""
+        now = time.time()
+        buckets = range(int((now - self._lifetime()) // MARK_SECONDS), int(now // MARK_SECONDS) + 1)
+        keys = [MARK_KEY.format(bucket) for bucket in buckets]
+        marks = cache.get_many(keys)
+        for key in keys:
+            if key in marks:
+                # Concurrent revokers can set a mark out of order.
+                return max(0, marks[key] - 1 - IN_FLIGHT)
+        # No marks: nothing revoked within a lifetime, or a log written
+        # before marks were. The filter holds DENYLIST_CAPACITY entries.
+        return max(0, latest - settings.DENYLIST_CAPACITY)
+
+    def is_revoked(self, jti):
+        now = time.monotonic()
+        if now >= self._next_sync:
+            # Only the first sync is waited for; after that one thread pulls
+            # the log while the others check the filter they have.
+            self.sync(now, blocking=self._seen is None)
+        key = _key(jti)
+        if key not in self._current and key not in self._previous:
+            return False
+        return cache.get(KEY_PREFIX + jti) is not None
+
+    def sync(self, now=None, blocking=True):
+        """
+        Add the revocations logged by every process since the last sync.
+        Without ``blocking``, returns at once if another thread is syncing.
+        """
+        now = time.monotonic() if now is None else now
+        if not self._sync_lock.acquire(blocking=blocking):
+            return
+        try:
+            if now < self._next_sync:
+                return
+            self._next_sync = now + settings.DENYLIST_SYNC_SECONDS
+            with self._lock:
+                self._ensure(now)
+            # The cache reads below run without self._lock, which only guards
+            # the filters: revoke() and other threads' checks carry on.
+            latest = cache.get(SEQ_KEY) or 0
+            seen, missing = self._seen, self._missing
+            if seen is None or latest < seen:  # a new process, or the counter was reset
+                seen, missing = self._floor(latest), {}
+            # A sequence number is taken before its log key is written, so a
+            # number found missing among the last IN_FLIGHT is retried on later
+            # syncs until its token would have expired anyway. Older gaps are
+            # expired entries.
+            wanted = [*missing, *range(seen + 1, latest + 1)]
+            revoked, found = [], set()
+            for start in range(0, len(wanted), SYNC_BATCH):
+                keys = [LOG_KEY.format(n) for n in wanted[start:start + SYNC_BATCH]]
+                for key, jti in cache.get_many(keys).items():
+                    revoked.append(_key(jti))
+                    found.add(int(key.rsplit(':', 1)[1]))
+            with self._lock:
+                self._ensure(now)
+                for key in revoked:
+                    self._current.add(key)
+            missing = {n: deadline for n, deadline in missing.items() if n not in found and deadline > now}
+            deadline = now + self._lifetime()
+            for n in range(max(seen, latest - IN_FLIGHT) + 1, latest + 1):
+                if n not in found:
+                    missing[n] = deadline
+            self._missing = missing
+            self._seen = latest
+        finally:
+            self._sync_lock.release()
+
+    def reset(self):
+        with self._sync_lock, self._lock:
+            self._current = self._previous = None
+            self._rotate_at = self._next_sync = 0.0
+            self._seen = None
+            self._missing = {}
+
+
+denylist = Denylist()
+
+
+def revoke_token(token):
+    """Deny a validated simplejwt token until it expires; False if it already was."""
+    from rest_framework_simplejwt.settings import api_settings
+
+    return denylist.revoke(token[api_settings.JTI_CLAIM], token['exp'])
+
+
+def is_token_revoked(token):
+    from rest_framework_simplejwt.settings import api_settings
+
+    return denylist.is_revoked(token[api_settings.JTI_CLAIM])
@@ -0,0 +1,45 @@
+from itertools import groupby
+from operator import itemgetter
+
+from .models import Application
+
+
+DIGEST_COLUMNS = (
+    'id',
+    'job__recruiter_id',
+    'job__recruiter__user__email',
+    'job_id',
+    'job__title',
+    'employee__user__name',
+    'employee__user__email',
+    'submitted_at',
+)
+
+
+def pending_digests():
+    """
+    Yield ``(recruiter_email, jobs, application_ids)`` for every recruiter
+    with applications waiting for a digest, where ``jobs`` is a list of
+    ``(job_title, [(applicant_name, applicant_email, submitted_at), ...])``.
+
+    Everything comes from one query ordered by recruiter and job, grouped in
+    Python, so the cost does not grow with per-application lookups. The rows
+    are fetched up front (one digest window is small) because the caller
+    clears ``digest_pending`` while it goes through the recruiters.
+    """
+    rows = list(
+        Application.objects
+        .filter(digest_pending=True)
+        .order_by('job__recruiter_id', 'job_id', 'submitted_at')
+        .values_list(*DIGEST_COLUMNS)
+    )
+    for (_, recruiter_email), recruiter_rows in groupby(rows, key=itemgetter(1, 2)):
+        jobs = []
+        application_ids = []
+        for (_, job_title), job_rows in groupby(recruiter_rows, key=itemgetter(3, 4)):
+            applicants = []
+            for row in job_rows:
+                application_ids.append(row[0])
+                applicants.append((row[5] or row[6], row[6], row[7]))
+            jobs.append((job_title, applicants))
+        yield recruiter_email, jobs, application_ids
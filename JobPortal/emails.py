@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template import Context
+from django.template.loader import get_template
+
+
+def _templates(name):
+    # get_template goes through the cached loader, so each file is parsed
+    # once per process; .template is the compiled django.template.Template.
+    return (
+        get_template(f'JobPortal/emails/{name}.txt').template,
+        get_template(f'JobPortal/emails/{name}.html').template,
+    )
+
+
+def render_email(name, context):
+    """Render the ``(text, html)`` bodies of the ``name`` email (autoescaped HTML)."""
+    text_template, html_template = _templates(name)
+    context = Context(context)
+    return text_template.render(context), html_template.render(context)
+
+
+def render_batch(name, shared_context, recipient_contexts):
+    """
+    Render the ``name`` email once per recipient in a single pass.
+
+    The templates are looked up once and one Context holding
+    ``shared_context`` is reused; each recipient's values are pushed on top
+    of it and popped after rendering. Returns a list of ``(text, html)``.
+    """
+    text_template, html_template = _templates(name)
+    context = Context(shared_context)
+    rendered = []
+    for recipient_context in recipient_contexts:
+        with context.push(recipient_context):
+            rendered.append((text_template.render(context), html_template.render(context)))
+    return rendered
+
+
+def _message(subject, text_message, html_message, to, connection):
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_message,
+        from_email=settings.EMAIL_HOST_USER,
+        to=to,
+        connection=connection,
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def build_email(name, subject, context, to, connection=None):
+    text_message, html_message = render_email(name, context)
+    return _message(subject, text_message, html_message, to, connection)
+
+
+def build_batch(name, shared_context, messages, connection=None):
+    """
+    Build one ``name`` email per ``(subject, context, to)`` in ``messages``,
+    rendered in one pass by render_batch. Sending them over one open
+    ``connection`` is the caller's part.
+    """
+    messages = list(messages)
+    rendered = render_batch(name, shared_context, [context for _, context, _ in messages])
+    return [
+        _message(subject, text_message, html_message, to, connection)
+        for (subject, _, to), (text_message, html_message) in zip(messages, rendered)
+    ]
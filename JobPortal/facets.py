@@ -0,0 +1,130 @@
+import hashlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+from rest_framework.exceptions import ValidationError
+
+
+# (label, lower bound inclusive, upper bound exclusive)
+SALARY_BUCKETS = [
+    ('0-25000', 0, 25000),
+    ('25000-50000', 25000, 50000),
+    ('50000-100000', 50000, 100000),
+    ('100000-200000', 100000, 200000),
+    ('200000+', 200000, None),
+]
+NO_SALARY = 'unspecified'
+
+# facet name -> Job lookup it filters on (salary is filtered by bucket).
+FACET_FIELDS = {
+    'job_type': 'job_type',
+    'salary': 'salary',
+    'location': 'location',
+    'company': 'recruiter__company_name',
+}
+VERSION_KEY = 'job-facets:version'
+
+
+def _salary_range(label):
+    for bucket, low, high in SALARY_BUCKETS:
+        if bucket == label:
+            return Q(salary__gte=low) & (Q() if high is None else Q(salary__lt=high))
+    if label == NO_SALARY:
+        return Q(salary__isnull=True)
+    raise ValidationError({'salary': f'Unknown salary bucket {label!r}.'})
+
+
+def filter_jobs(queryset, params):
+    """
+    Apply the facet filters in ``params`` (``job_type``, ``salary`` bucket,
+    ``location``, ``company``; comma-separated values are OR-ed).
+    """
+    for facet, lookup in FACET_FIELDS.items():
+        values = [value for value in params.get(facet, '').split(',') if value]
+        if not values:
+            continue
+        if facet == 'salary':
+            condition = Q()
+            for label in values:
+                condition |= _salary_range(label)
+        else:
+            condition = Q(**{f'{lookup}__in': values})
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def _salary_bucket():
+    whens = [When(salary__isnull=True, then=Value(NO_SALARY))]
+    whens += [When(salary__lt=high, then=Value(label)) for label, _, high in SALARY_BUCKETS if high is not None]
+    return Case(*whens, default=Value(SALARY_BUCKETS[-1][0]), output_field=CharField())
+
+
+def _facet_expressions():
+    return {
+        'job_type': F('job_type'),
+        'salary': _salary_bucket(),
+        'location': F('location'),
+        'company': F('recruiter__company_name'),
+    }
+
+
+def compute_facets(queryset, limit=None):
+    """
+    Count the jobs in ``queryset`` by every facet in one query.
+
+    Each facet is its own ``GROUP BY`` branch of a ``UNION ALL``, so the
+    database aggregates every facet in a single round trip and returns one
+    row per distinct facet value (a single GROUP BY over all four columns
+    would return one row per *combination*, close to one per job). Values
+    are listed by count, at most ``limit`` per facet.
+    """
+    limit = limit or settings.JOB_FACET_LIMIT
+    queryset = queryset.order_by()
+    branches = [
+        queryset.values(facet=Value(facet, output_field=CharField()), value=expression).annotate(count=Count('pk'))
+        for facet, expression in _facet_expressions().items()
+    ]
+    counters = {facet: Counter() for facet in FACET_FIELDS}
+    for row in branches[0].union(*branches[1:], all=True):
+        counters[row['facet']][row['value']] = row['count']
+    return {
+        'total': sum(counters['job_type'].values()),
+        'facets': {
+            facet: [{'value': value, 'count': count} for value, count in counter.most_common(limit)]
+            for facet, counter in counters.items()
+        },
+    }
+
+
+def _version():
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+
+def invalidate():
+    """Make every cached facet result stale (called when jobs or company names change)."""
+    if not cache.add(VERSION_KEY, 2, None):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:  # evicted between add() and incr()
+            cache.add(VERSION_KEY, 2, None)
+
+
+def cached_facets(queryset, scope, params):
+    """
+    ``compute_facets(queryset)`` through the cache.
+
+    The key covers the visibility ``scope`` (whose jobs the queryset holds)
+    and the normalized query parameters, so every common filter combination
+    is computed once per TTL. A version counter bumped by invalidate() is part
+    of the key: a job write retires all entries at once without a key scan.
+    """
+    normalized = '&'.join(f'{key}={",".join(sorted(params.getlist(key)))}' for key in sorted(params) if key != 'format')
+    digest = hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()
+    key = f'job-facets:{_version()}:{scope}:{digest}'
+    result = cache.get(key)
+    if result is None:
+        result = compute_facets(queryset)
+        cache.set(key, result, settings.JOB_FACET_CACHE_TTL)
+    return result
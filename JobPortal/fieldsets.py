@@ -0,0 +1,54 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SparseFieldsetMixin:
+    """
+    ViewSet mixin for sparse fieldsets on reads.
+
+    - ``?fields=id,title`` renders only those fields, picked from the full
+      serializer (so a list can still ask for ``description``).
+    - ``?omit=salary`` renders the action's default fields minus those.
+    - ``list`` defaults to ``list_serializer_class``, a compact card.
+
+    The serializer must take ``fields=`` (serializers.DynamicFieldsMixin).
+    List views pass get_sparse_fields() on to streaming_list_response or
+    narrow_queryset so the SELECT only reads the chosen columns.
+    """
+
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if (
+            getattr(self, 'action', None) == 'list'
+            and self.list_serializer_class is not None
+            and 'fields' not in self.request.query_params
+        ):
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def get_sparse_fields(self):
+        """The field names to render, or None for the serializer's own."""
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not ('fields' in params or 'omit' in params):
+            return None
+        if 'fields' in params and 'omit' in params:
+            raise ValidationError({'fields': 'Use either fields or omit, not both.'})
+        param = 'fields' if 'fields' in params else 'omit'
+        available = list(self.get_serializer_class().Meta.fields)
+        names = [name for name in params[param].split(',') if name]
+        unknown = [name for name in names if name not in available]
+        if unknown or not names:
+            raise ValidationError({param: f'Choose from: {", ".join(available)}.'})
+        if param == 'fields':
+            return [name for name in available if name in names]
+        fields = [name for name in available if name not in names]
+        if not fields:
+            raise ValidationError({'omit': 'At least one field must remain.'})
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
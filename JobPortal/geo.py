@@ -0,0 +1,208 @@
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache, reduce
+from operator import or_
+from pathlib import Path
+
+from django.db.models import F, Q
+from django.db.models.functions import Cos, Power, Radians, Sin
+
+try:
+    import numpy
+except ImportError:  # numpy is optional; haversine_km falls back to math
+    numpy = None
+
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 7  # ~153 m x 153 m cells
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Upper bound on the geohash cells a radius query scans: the precision is
+# lowered until the search box is covered by at most this many cells.
+MAX_COVERING_CELLS = 16
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 500
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation: ``'São Paulo, BR'`` -> ``'sao paulo br'``."""
+    text = text or ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', text.lower()).split())
+
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    """``{normalized name or alias: (latitude, longitude)}`` from the bundled CSV."""
+    places = {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as source:
+        for row in csv.DictReader(source):
+            point = (float(row['latitude']), float(row['longitude']))
+            for name in [row['name'], *filter(None, row['aliases'].split('|'))]:
+                places.setdefault(normalize(name), point)
+    return places
+
+
+def geocode(location):
+    """
+    Return ``(latitude, longitude)`` for a free-text location, or None.
+
+    The whole string is tried first, then each comma-separated part from the
+    most specific one, so ``'Koramangala, Bangalore, India'`` resolves to
+    Bangalore.
+    """
+    places = gazetteer()
+    for candidate in [location, *(location or '').split(',')]:
+        point = places.get(normalize(candidate))
+        if point is not None:
+            return point
+    return None
+
+
+def parse_point(text):
+    """Return the point for ``'lat,lon'`` or a place name, or None."""
+    try:
+        latitude, longitude = (float(part) for part in text.split(','))
+    except ValueError:
+        return geocode(text)
+    if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+        return latitude, longitude
+    return None
+
+
+def _bits(precision):
+    lon_bits = (5 * precision + 1) // 2
+    return 5 * precision - lon_bits, lon_bits
+
+
+def geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bit = value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bit = value = 0
+    return ''.join(chars)
+
+
+def locate(location):
+    """Return the ``(latitude, longitude, geohash)`` columns for ``location``."""
+    point = geocode(location)
+    if point is None:
+        return None, None, ''
+    return point[0], point[1], geohash(*point)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    ``(south, north, west, east)`` of the box around the circle of
+    ``radius_km``. West and east are not wrapped: they leave [-180, 180]
+    when the box crosses the antimeridian.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = max(-90.0, latitude - dlat), min(90.0, latitude + dlat)
+    coslat = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+    dlon = 180.0 if coslat < 1e-9 else min(180.0, dlat / coslat)
+    return south, north, longitude - dlon, longitude + dlon
+
+
+def covering_cells(latitude, longitude, radius_km, max_cells=MAX_COVERING_CELLS):
+    """
+    Geohash prefixes whose cells together cover the circle of ``radius_km``
+    around the point. Every row within the radius has a geohash starting with
+    one of them; the cells reach past the circle, so within_radius filters
+    the rows they return further.
+    """
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_bits, lon_bits = _bits(precision)
+        cell_height, cell_width = 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+        rows = int((north - south) // cell_height) + 2
+        cols = int((east - west) // cell_width) + 2
+        if rows * cols <= max_cells:
+            break
+
+    cells = set()
+    for row in range(rows):
+        lat = min(north, south + row * cell_height)
+        for col in range(cols):
+            lon = min(east, west + col * cell_width)
+            cells.add(geohash(lat, (lon + 180.0) % 360.0 - 180.0, precision))
+    return sorted(cells)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """
+    Great-circle distances in km from one point to many (a sequence of floats).
+
+    Reference implementation: searches compute the distance test in SQL
+    (within_radius). Tests and benchmarks use this one to check it.
+    """
+    if numpy is not None:
+        lat1, lon1 = numpy.radians(latitude), numpy.radians(longitude)
+        lat2 = numpy.radians(numpy.asarray(latitudes, dtype=float))
+        lon2 = numpy.radians(numpy.asarray(longitudes, dtype=float))
+        a = numpy.sin((lat2 - lat1) / 2) ** 2 + numpy.cos(lat1) * numpy.cos(lat2) * numpy.sin((lon2 - lon1) / 2) ** 2
+        return (2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))).tolist()
+
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for lat2, lon2 in zip(latitudes, longitudes):
+        lat2, lon2 = math.radians(lat2), math.radians(lon2)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+    return distances
+
+
+def _in_box(latitude, longitude, radius_km):
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+    condition = Q(latitude__gte=south, latitude__lte=north)
+    if east - west >= 360.0:
+        return condition
+    if west < -180.0:
+        return condition & (Q(longitude__gte=west + 360.0) | Q(longitude__lte=east))
+    if east > 180.0:
+        return condition & (Q(longitude__gte=west) | Q(longitude__lte=east - 360.0))
+    return condition & Q(longitude__gte=west, longitude__lte=east)
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Narrow ``queryset`` (a model with latitude/longitude/geohash columns) to
+    rows within ``radius_km`` of the point.
+
+    Everything happens in the one query: geohash range scans on the indexed
+    column find the candidates (a prefix ``p`` is the range
+    ``p <= geohash < p + '{'``, which every backend serves from a b-tree),
+    the bounding box drops the cells' overhang, and the haversine term
+    ``a`` drops the box corners. ``a <= sin(radius / 2R)^2`` is the same
+    test as ``distance <= radius`` without the arcsine and square root.
+    """
+    prefixes = covering_cells(latitude, longitude, radius_km)
+    cells = reduce(or_, (Q(geohash__gte=p, geohash__lt=p + '{') for p in prefixes))
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    haversine = (
+        Power(Sin((Radians(F('latitude')) - lat1) / 2), 2)
+        + math.cos(lat1) * Cos(Radians(F('latitude'))) * Power(Sin((Radians(F('longitude')) - lon1) / 2), 2)
+    )
+    return queryset.filter(cells & _in_box(latitude, longitude, radius_km)).alias(
+        haversine=haversine,
+    ).filter(haversine__lte=math.sin(radius_km / (2 * EARTH_RADIUS_KM)) ** 2)
@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from JobPortal import dedupe, facets
+from JobPortal.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        'Find near-duplicate job postings (JobPortal.dedupe) among the active '
+        'jobs of each recruiter. Jobs without a signature are signed first. '
+        'Every job is compared with the earlier ones of its recruiter; a match '
+        'joins the cluster of the oldest posting. Reports only, unless --apply '
+        'is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--apply', choices=['flag', 'deactivate'],
+                            help='flag: set duplicate_of on duplicates (and clear it on jobs that no longer are); '
+                                 'deactivate: flag and also set is_active=False.')
+        parser.add_argument('--resign', action='store_true', help='Recompute every signature, not only missing ones.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        signed = self.sign(options['resign'], options['batch_size'])
+        if signed:
+            self.stdout.write(f'{signed} jobs signed')
+
+        duplicates, flags, scanned = self.find_duplicates()
+        # Flags to write: new or changed originals, and jobs no longer duplicates.
+        changed = {pk: original for pk, original in duplicates.items() if flags.get(pk) != original}
+        cleared = [pk for pk in flags if pk not in duplicates]
+        self.stdout.write(f'{scanned} active jobs scanned: {len(duplicates)} duplicates, '
+                          f'{len(changed)} not flagged yet, {len(cleared)} stale flags')
+        if not options['apply']:
+            shown = list(duplicates.items())[:20]
+            for pk, original in shown:
+                self.stdout.write(f'  job {pk} duplicates job {original}')
+            if len(duplicates) > len(shown):
+                self.stdout.write(f'  ... and {len(duplicates) - len(shown)} more')
+            return
+
+        if options['apply'] == 'deactivate':
+            changes = [Job(pk=pk, duplicate_of_id=original, is_active=False) for pk, original in duplicates.items()]
+            fields = ['duplicate_of', 'is_active']
+        else:
+            changes = [Job(pk=pk, duplicate_of_id=original) for pk, original in changed.items()]
+            fields = ['duplicate_of']
+        changes += [Job(pk=pk, duplicate_of_id=None, is_active=True) for pk in cleared]
+        Job.objects.bulk_update(changes, fields, batch_size=options['batch_size'])
+        # bulk_update bypasses the post_save signal that invalidates facets.
+        facets.invalidate()
+        done = 'deactivated' if options['apply'] == 'deactivate' else 'flagged'
+        self.stdout.write(f'{len(changes) - len(cleared)} duplicates {done}, {len(cleared)} stale flags cleared')
+
+    def sign(self, resign, batch_size):
+        queryset = Job.objects.order_by('pk').only('pk', 'title', 'description')
+        if not resign:
+            queryset = queryset.filter(simhash__isnull=True)
+
+        signed = 0
+        last_pk = 0
+        # Keyset batches, as in geocode_locations: bulk_update bypasses
+        # save(), so the signature columns are filled here.
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for job in batch:
+                for field, value in dedupe.signature(job.title, job.description).items():
+                    setattr(job, field, value)
+            Job.objects.bulk_update(batch, dedupe.SIGNATURE_FIELDS)
+            signed += len(batch)
+            last_pk = batch[-1].pk
+        return signed
+
+    def find_duplicates(self):
+        """
+        ``({duplicate pk: original pk}, {flagged pk: stored duplicate_of},
+        jobs scanned)``. Only one recruiter's band buckets are held in memory
+        at a time.
+        """
+        jobs = Job.objects.filter(is_active=True, simhash__isnull=False).order_by(
+            'recruiter_id', 'posted_date', 'pk',
+        ).values_list('pk', 'recruiter_id', 'duplicate_of', 'simhash', *dedupe.BAND_FIELDS)
+
+        max_distance = settings.JOB_DUPLICATE_MAX_DISTANCE
+        duplicates, flags = {}, {}
+        recruiter = None
+        buckets = []
+        scanned = 0
+        for pk, recruiter_id, flagged, simhash, *bands in jobs.iterator(chunk_size=2000):
+            scanned += 1
+            if recruiter_id != recruiter:
+                recruiter = recruiter_id
+                buckets = [{} for _ in dedupe.BAND_FIELDS]
+            # Buckets hold earlier jobs in scan order, so the first match in
+            # each is its oldest; the oldest of those wins.
+            first = None
+            for bucket, band in zip(buckets, bands):
+                for order, other_hash, other_root in bucket.get(band, ()):
+                    if first is not None and order >= first[0]:
+                        break
+                    if dedupe.distance(simhash, other_hash) <= max_distance:
+                        first = (order, other_root)
+                        break
+            root = pk if first is None else first[1]
+            if root != pk:
+                duplicates[pk] = root
+            if flagged is not None:
+                flags[pk] = flagged
+            for bucket, band in zip(buckets, bands):
+                bucket.setdefault(band, []).append((scanned, simhash, root))
+        return duplicates, flags, scanned
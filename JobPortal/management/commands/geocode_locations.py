@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from JobPortal import geo
+from JobPortal.models import Employee, Job
+
+
+class Command(BaseCommand):
+    help = (
+        'Geocode job and employee locations against the bundled gazetteer '
+        '(JobPortal/data/gazetteer.csv). Only rows never geocoded are '
+        'processed unless --all is given; rows the gazetteer did not match '
+        'are not retried until then.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-geocode every row, e.g. after extending the gazetteer.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for model in (Job, Employee):
+            queryset = model.objects.order_by('pk').only('pk', 'location')
+            if not options['all']:
+                queryset = queryset.filter(geocoded_at__isnull=True)
+
+            updated = located = 0
+            last_pk = 0
+            # Keyset batches rather than one open cursor, so the updates never
+            # interleave with a running SELECT. bulk_update bypasses save(),
+            # so the columns are filled here.
+            while True:
+                batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+                if not batch:
+                    break
+                now = timezone.now()
+                for instance in batch:
+                    instance.latitude, instance.longitude, instance.geohash = geo.locate(instance.location)
+                    instance.geocoded_at = now
+                    located += instance.geohash != ''
+                model.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash', 'geocoded_at'])
+                updated += len(batch)
+                last_pk = batch[-1].pk
+            self.stdout.write(f'{model.__name__}: {updated} rows processed, {located} located')
@@ -0,0 +1,231 @@
+import http.client
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+ID_SEGMENT = re.compile(r'/(\d+|[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{32})(?=/|$)')
+
+
+def read_capture(path):
+    """Yield the records of a capture file one line at a time."""
+    with open(path, encoding='utf-8') as capture:
+        for number, line in enumerate(capture, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise CommandError(f'{path}:{number}: not a JSON line')
+            if 'method' not in record or 'path' not in record:
+                raise CommandError(f'{path}:{number}: a record needs at least "method" and "path"')
+            yield record
+
+
+def route_of(record):
+    """Captured view name, else the path with ids collapsed: /jobs/{id}/."""
+    return record.get('route') or ID_SEGMENT.sub('/{id}', record['path'])
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class TestClientTarget:
+    """Requests go through Django's test client in this process (no network)."""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def send(self, method, url, body, headers):
+        from django.test import Client
+
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+        extra = {f'HTTP_{name.upper().replace("-", "_")}': value for name, value in headers.items()}
+        response = client.generic(method, url, body or '', content_type='application/json', **extra)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response.status_code
+
+
+class HTTPTarget:
+    """Requests go to a running server, one keep-alive connection per thread."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise CommandError(f'Invalid --base-url {base_url!r}')
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host, self.port = parts.hostname, parts.port
+        self.local = threading.local()
+
+    def send(self, method, url, body, headers):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = self.connection_class(self.host, self.port, timeout=60)
+        headers = {'Content-Type': 'application/json', **headers}
+        try:
+            connection.request(method, url, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self.local.connection = None
+            raise
+        return response.status
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a request capture (JSON lines written by RequestCaptureMiddleware: '
+        'ts, method, path, query, body, user) against this app and report latency '
+        'percentiles and error rates per route. Requests are authenticated as the '
+        'captured user with a freshly minted access token.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('capture', help='Capture file (JSON lines).')
+        parser.add_argument('--base-url', help='Replay against a running server instead of the in-process test client.')
+        parser.add_argument('--speed', type=float, default=0,
+                            help='Timing: 1 keeps the captured gaps, 10 replays ten times faster, 0 (default) sends as fast as --concurrency allows.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--limit', type=int, help='Stop after this many requests.')
+        parser.add_argument('--read-only', action='store_true', help='Skip requests that are not GET/HEAD/OPTIONS.')
+        parser.add_argument('--output', help='Write the per-route summary as JSON (to diff runs with --baseline).')
+        parser.add_argument('--baseline', help='A previous --output file; p50/p99 changes are shown against it.')
+
+    def handle(self, *args, **options):
+        if options['speed'] < 0 or options['concurrency'] < 1:
+            raise CommandError('--speed must be >= 0 and --concurrency >= 1.')
+        target = HTTPTarget(options['base_url']) if options['base_url'] else TestClientTarget()
+        samples = defaultdict(list)
+        outcomes = defaultdict(lambda: {'4xx': 0, 'errors': 0})
+        lock = threading.Lock()
+        tokens = {}
+
+        def authorization(user_id):
+            from rest_framework_simplejwt.tokens import AccessToken
+
+            from JobPortal.models import User
+
+            token = tokens.get(user_id)
+            if token is None:
+                token = tokens[user_id] = f'Bearer {AccessToken.for_user(User(pk=user_id))}'
+            return token
+
+        def replay(record):
+            url = record['path'] + (f'?{record["query"]}' if record.get('query') else '')
+            body = json.dumps(record['body']) if record.get('body') is not None else None
+            # X-Replay keeps a capturing server from recording the replay.
+            headers = {'X-Replay': '1'}
+            if record.get('user'):
+                headers['Authorization'] = authorization(record['user'])
+            route = f'{record["method"]} {route_of(record)}'
+            start = time.perf_counter()
+            try:
+                status = target.send(record['method'], url, body, headers)
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples[route].append(elapsed)
+                if status is None or status >= 500:
+                    outcomes[route]['errors'] += 1
+                elif status >= 400:
+                    outcomes[route]['4xx'] += 1
+
+        # Records are read lazily and at most a few batches are in flight,
+        # so captures of any size replay in constant memory.
+        in_flight = threading.BoundedSemaphore(options['concurrency'] * 4)
+        sent = 0
+        wall_start = time.perf_counter()
+        first_ts = None
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            for record in read_capture(options['capture']):
+                if options['limit'] is not None and sent >= options['limit']:
+                    break
+                if options['read_only'] and record['method'] not in SAFE_METHODS:
+                    continue
+                if options['speed'] and record.get('ts') is not None:
+                    first_ts = record['ts'] if first_ts is None else first_ts
+                    delay = wall_start + (record['ts'] - first_ts) / options['speed'] - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                in_flight.acquire()
+                future = pool.submit(replay, record)
+                future.add_done_callback(lambda _: in_flight.release())
+                sent += 1
+
+            # Database connections belong to the thread that opened them, so
+            # every worker closes its own. The barrier keeps a worker from
+            # taking a second close before each one has taken one.
+            barrier = threading.Barrier(options['concurrency'])
+
+            def close_connections():
+                barrier.wait()
+                connections.close_all()
+
+            for _ in range(options['concurrency']):
+                pool.submit(close_connections)
+        wall = time.perf_counter() - wall_start
+
+        summary = self.summarize(samples, outcomes)
+        self.report(summary, sent, wall, options['baseline'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(summary, output, indent=2)
+
+    def summarize(self, samples, outcomes):
+        summary = {}
+        for route in sorted(samples, key=lambda route: -len(samples[route])):
+            ordered = sorted(samples[route])
+            summary[route] = {
+                'count': len(ordered),
+                'errors': outcomes[route]['errors'],
+                '4xx': outcomes[route]['4xx'],
+                'p50_ms': percentile(ordered, 0.50) * 1000,
+                'p90_ms': percentile(ordered, 0.90) * 1000,
+                'p99_ms': percentile(ordered, 0.99) * 1000,
+                'max_ms': ordered[-1] * 1000,
+            }
+        return summary
+
+    def report(self, summary, sent, wall, baseline_path):
+        baseline = {}
+        if baseline_path:
+            with open(baseline_path, encoding='utf-8') as source:
+                baseline = json.load(source)
+
+        rows = []
+        for route, stats in summary.items():
+            row = {'route': route, 'count': str(stats['count']),
+                   'error_%': f'{stats["errors"] / stats["count"] * 100:.1f}',
+                   '4xx_%': f'{stats["4xx"] / stats["count"] * 100:.1f}'}
+            for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms'):
+                row[key] = f'{stats[key]:.1f}'
+            if baseline:
+                before = baseline.get(route)
+                for key in ('p50_ms', 'p99_ms'):
+                    row[f'{key[:3]}_change'] = f'{(stats[key] / before[key] - 1) * 100:+.0f}%' if before and before[key] else '-'
+            rows.append(row)
+
+        errors = sum(stats['errors'] for stats in summary.values())
+        self.stdout.write(f'{sent} requests in {wall:.1f}s ({sent / max(wall, 1e-9):.0f}/s), '
+                          f'{errors} errors ({errors / max(sent, 1) * 100:.2f}%)')
+        if not rows:
+            return
+        columns = list(rows[0])
+        widths = [max(len(column), *(len(row[column]) for row in rows)) for column in columns]
+        self.stdout.write('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+        for row in rows:
+            self.stdout.write('  '.join(row[column].ljust(width) for column, width in zip(columns, widths)))
@@ -0,0 +1,363 @@
+import csv
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import DateTimeField, DecimalField, Max
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from JobPortal import facets, geo
+from JobPortal.models import Application, Employee, Job, Recruiter, User
+
+SEED_DOMAIN = 'seed.invalid'
+CHUNK_SIZE = 20000
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Sara', 'Arjun', 'Meera', 'Kabir', 'Isha',
+               'James', 'Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'Lucas', 'Mia', 'Omar', 'Fatima']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Khan', 'Reddy', 'Gupta', 'Singh', 'Das', 'Nair', 'Mehta',
+              'Smith', 'Jones', 'Brown', 'Garcia', 'Miller', 'Wilson', 'Taylor', 'Lee', 'Martin', 'Clark']
+COMPANY_WORDS = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne', 'Hooli', 'Vandelay', 'Soylent',
+                 'Cyberdyne', 'Tyrell', 'Wonka', 'Aperture', 'Nakatomi', 'Oscorp', 'Massive']
+COMPANY_SUFFIXES = ['Labs', 'Systems', 'Technologies', 'Solutions', 'Analytics', 'Works', 'Digital', 'Group']
+ROLES = ['Backend Engineer', 'Frontend Developer', 'Data Analyst', 'Product Manager', 'DevOps Engineer',
+         'QA Engineer', 'UX Designer', 'Sales Executive', 'Accountant', 'HR Generalist', 'Data Scientist',
+         'Support Engineer', 'Marketing Associate', 'Mobile Developer', 'Business Analyst']
+SENIORITY = ['Junior', '', '', 'Senior', 'Lead', 'Intern']
+
+# (value, weight) mixes.
+JOB_TYPES = [('full_time', 60), ('contract', 15), ('part_time', 15), ('internship', 10)]
+STATUSES = [('submitted', 45), ('under_review', 25), ('rejected', 20), ('interview', 7), ('offered', 3)]
+# Median yearly salary per job type; salaries are log-normal around it.
+SALARY_MEDIANS = {'full_time': 900000, 'contract': 700000, 'part_time': 300000, 'internship': 120000}
+
+# Popularity skew: the i-th most popular job/recruiter/location is picked
+# with probability ~ i ** (1 / SKEW - 1), a power law with a long tail.
+SKEW = 3.0
+HISTORY_DAYS = 365
+
+
+def skewed(rng, n):
+    """Index in ``range(n)`` drawn from the power law, 0 the most popular."""
+    return min(n - 1, int(n * rng.random() ** SKEW))
+
+
+def scatter(index, n):
+    """Spread popular indexes over the id range instead of the oldest rows."""
+    return index * 2654435761 % n if n % 2654435761 else index
+
+
+def job_age_days(index):
+    """
+    Days since the index-th job was posted. A hash of the index instead of a
+    draw from the chunk's stream, so applications can place themselves after
+    their job's posting without reading it back. Recent postings are denser.
+    """
+    return HISTORY_DAYS * (index * 0x9E3779B97F4A7C15 % 2 ** 64 / 2 ** 64) ** 2
+
+
+def weighted(rng, mix):
+    values, weights = zip(*mix)
+    return rng.choices(values, weights)[0]
+
+
+@contextmanager
+def model_signals_muted():
+    """
+    Disconnect every receiver of the model signals for the duration. Seeding
+    writes raw INSERTs (which send none) and flushing would otherwise
+    write a tombstone per deleted application and re-invalidate the facet
+    cache per job; the command does the invalidation once at the end.
+    """
+    saved = {}
+    for signal in (pre_save, post_save, pre_delete, post_delete):
+        with signal.lock:
+            saved[signal] = signal.receivers
+            signal.receivers = []
+            signal.sender_receivers_cache.clear()
+    try:
+        yield
+    finally:
+        for signal, receivers in saved.items():
+            with signal.lock:
+                signal.receivers = receivers
+                signal.sender_receivers_cache.clear()
+
+
+class Table:
+    """
+    Column layout for raw batched INSERTs of ``model``.
+
+    bulk_create prepares every value through the field API, which costs more
+    than the INSERT itself at this volume. Builders emit plain tuples for
+    ``fields`` instead; datetimes and decimals go through the backend's
+    adapters and every other column gets its model default, prepared once.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        columns = [model._meta.get_field(name) for name in fields]
+        self.defaults = [
+            (field, field.get_db_prep_save(field.get_default(), connection))
+            for field in model._meta.concrete_fields if field not in columns
+        ]
+        self.columns = columns + [field for field, _ in self.defaults]
+        self.fill = tuple(value for _, value in self.defaults)
+        self.adapters = [self._adapter(field) for field in columns]
+
+    @staticmethod
+    def _adapter(field):
+        ops = connection.ops
+        if isinstance(field, DateTimeField):
+            return ops.adapt_datetimefield_value
+        if isinstance(field, DecimalField):
+            return lambda value: ops.adapt_decimalfield_value(value, field.max_digits, field.decimal_places)
+        return None
+
+    def insert(self, rows, batch_size):
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(self.model._meta.db_table),
+            ', '.join(quote(field.column) for field in self.columns),
+            ', '.join(['%s'] * len(self.columns)),
+        )
+        adapted = [i for i, adapter in enumerate(self.adapters) if adapter]
+        fill = self.fill
+        with connection.cursor() as cursor:
+            for offset in range(0, len(rows), batch_size):
+                batch = []
+                for row in rows[offset:offset + batch_size]:
+                    row = list(row)
+                    for i in adapted:
+                        if row[i] is not None:
+                            row[i] = self.adapters[i](row[i])
+                    batch.append((*row, *fill))
+                cursor.executemany(sql, batch)
+
+
+def build_users(plan, rng, start, stop):
+    rows = []
+    for i in range(start, stop):
+        is_recruiter = i >= plan['employees']
+        number = i - plan['employees'] if is_recruiter else i
+        role = 'recruiter' if is_recruiter else 'employee'
+        rows.append((
+            plan['user_base'] + i + 1,
+            f'{role}{number}@{SEED_DOMAIN}',
+            f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            role,
+            plan['password'],
+            plan['now'] - timedelta(days=rng.uniform(0, 3 * HISTORY_DAYS)),
+        ))
+    return rows
+
+
+def build_employees(plan, rng, start, stop):
+    rows = []
+    for i in range(start, stop):
+        location = plan['locations'][skewed(rng, len(plan['locations']))]
+        rows.append((
+            plan['employee_base'] + i + 1,
+            plan['user_base'] + i + 1,
+            f'+91{rng.randrange(6000000000, 9999999999)}',
+            location,
+            *plan['coordinates'][location],
+            plan['now'],
+        ))
+    return rows
+
+
+def build_recruiters(plan, rng, start, stop):
+    rows = []
+    for i in range(start, stop):
+        created_at = plan['now'] - timedelta(days=rng.uniform(0, 2 * HISTORY_DAYS))
+        rows.append((
+            plan['recruiter_base'] + i + 1,
+            plan['user_base'] + plan['employees'] + i + 1,
+            f'{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {i}',
+            'digest' if rng.random() < 0.2 else 'instant',
+            created_at,
+            created_at,
+        ))
+    return rows
+
+
+def build_jobs(plan, rng, start, stop):
+    now, rows = plan['now'], []
+    for i in range(start, stop):
+        job_type = weighted(rng, JOB_TYPES)
+        location = plan['locations'][skewed(rng, len(plan['locations']))]
+        posted = now - timedelta(days=job_age_days(i))
+        deadline = None if rng.random() < 0.2 else posted + timedelta(days=rng.randint(7, 90))
+        salary = None
+        if rng.random() < 0.85:
+            salary = Decimal(round(rng.lognormvariate(0, 0.4) * SALARY_MEDIANS[job_type], -3))
+        rows.append((
+            plan['job_base'] + i + 1,
+            f'{rng.choice(SENIORITY)} {rng.choice(ROLES)}'.strip(),
+            f'Seeded job {i}.',
+            plan['recruiter_base'] + scatter(skewed(rng, plan['recruiters']), plan['recruiters']) + 1,
+            location,
+            *plan['coordinates'][location],
+            plan['now'],
+            job_type,
+            salary,
+            posted,
+            deadline,
+            deadline is None or deadline > now,
+        ))
+    return rows
+
+
+def build_applications(plan, rng, start, stop):
+    now, rows = plan['now'], []
+    for i in range(start, stop):
+        job = scatter(skewed(rng, plan['jobs']), plan['jobs'])
+        # Most applications arrive within days of the posting.
+        submitted = now - timedelta(days=max(0.0, job_age_days(job) - rng.expovariate(1 / 5)))
+        status = weighted(rng, STATUSES)
+        updated = submitted if status == 'submitted' else min(now, submitted + timedelta(days=rng.expovariate(1 / 7)))
+        rows.append((
+            plan['application_base'] + i + 1,
+            plan['employee_base'] + rng.randrange(plan['employees']) + 1,
+            plan['job_base'] + job + 1,
+            None if rng.random() < 0.6 else 'Seeded cover letter.',
+            submitted,
+            updated,
+            status,
+        ))
+    return rows
+
+
+# Phases run in order (foreign keys point backwards); chunks within a phase
+# are independent. Fields list the tuple layout of each builder.
+PHASES = [
+    ('users', User, build_users, ['id', 'email', 'name', 'role', 'password', 'date_joined']),
+    ('employees', Employee, build_employees,
+     ['id', 'user', 'phone_number', 'location', 'latitude', 'longitude', 'geohash', 'geocoded_at']),
+    ('recruiters', Recruiter, build_recruiters,
+     ['id', 'user', 'company_name', 'notification_mode', 'created_at', 'updated_at']),
+    ('jobs', Job, build_jobs,
+     ['id', 'title', 'description', 'recruiter', 'location', 'latitude', 'longitude', 'geohash', 'geocoded_at',
+      'job_type', 'salary', 'posted_date', 'application_deadline', 'is_active']),
+    ('applications', Application, build_applications,
+     ['id', 'employee', 'job', 'cover_letter', 'submitted_at', 'updated_at', 'status']),
+]
+
+
+def insert_chunk(task):
+    """Generate and insert one chunk. Each chunk has its own random stream, so
+    the data does not depend on the number of workers."""
+    plan, phase, chunk, start, stop = task
+    _, model, builder, fields = next(entry for entry in PHASES if entry[0] == phase)
+    rng = random.Random(f'{plan["seed"]}:{phase}:{chunk}')
+    rows = builder(plan, rng, start, stop)
+    if connection.vendor == 'sqlite':
+        # The default 2 MB page cache thrashes on the secondary indexes once
+        # tables pass a few hundred thousand rows.
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size=-262144')
+    with transaction.atomic():
+        Table(model, fields).insert(rows, plan['batch_size'])
+    return len(rows)
+
+
+def init_worker():
+    # Connections are closed before the pool starts; each worker opens its
+    # own. SQLite writers take turns on the file lock, so give them time.
+    django.setup()
+    if connection.vendor == 'sqlite':
+        connection.settings_dict.setdefault('OPTIONS', {})['timeout'] = 600
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic users, recruiters, employees, jobs and applications '
+        'for benchmarks: skewed applications per job, realistic status, salary '
+        'and deadline mixes. Output is deterministic for a given --seed and '
+        'independent of --workers. Seeded users have @seed.invalid emails.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=10000)
+        parser.add_argument('--recruiters', type=int, default=500)
+        parser.add_argument('--jobs', type=int, default=5000)
+        parser.add_argument('--applications', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int, default=1, help='Processes generating and inserting chunks.')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per executemany() batch.')
+        parser.add_argument('--password', default='seed-password', help='Password of every seeded user (hashed once).')
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded rows first.')
+
+    def handle(self, *args, **options):
+        counts = {name: options[name] for name in ('employees', 'recruiters', 'jobs', 'applications')}
+        if min(counts.values()) < 0 or (counts['jobs'] and not counts['recruiters']) or \
+                (counts['applications'] and not (counts['jobs'] and counts['employees'])):
+            raise CommandError('Jobs need recruiters, and applications need jobs and employees.')
+
+        if options['flush']:
+            with model_signals_muted():
+                deleted, _ = User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').delete()
+            self.stdout.write(f'Flushed {deleted} seeded rows')
+
+        plan = self.plan(counts, options)
+        total_start = time.perf_counter()
+        with model_signals_muted():
+            for phase, *_ in PHASES:
+                size = plan['employees'] + plan['recruiters'] if phase == 'users' else plan[phase]
+                tasks = [(plan, phase, chunk, start, min(start + CHUNK_SIZE, size))
+                         for chunk, start in enumerate(range(0, size, CHUNK_SIZE))]
+                start = time.perf_counter()
+                inserted = sum(self.run(tasks, options['workers']))
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f'{phase}: {inserted} rows in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):.0f}/s)')
+
+        self.reset_sequences()
+        facets.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.perf_counter() - total_start:.1f}s'))
+
+    def plan(self, counts, options):
+        def base(model):
+            return model.objects.aggregate(top=Max('pk'))['top'] or 0
+
+        with open(geo.GAZETTEER_PATH, newline='', encoding='utf-8') as source:
+            locations = [row['name'] for row in csv.DictReader(source)]
+        return {
+            **counts,
+            'seed': options['seed'],
+            'batch_size': options['batch_size'],
+            'now': timezone.now(),
+            # One hash for everybody: hashing per user would dominate the run.
+            'password': make_password(options['password']),
+            'locations': locations,
+            'coordinates': {location: geo.locate(location) for location in locations},
+            # Explicit primary keys above the current maximum: workers need no
+            # coordination and foreign keys are known without reading back.
+            'user_base': base(User),
+            'employee_base': base(Employee),
+            'recruiter_base': base(Recruiter),
+            'job_base': base(Job),
+            'application_base': base(Application),
+        }
+
+    def run(self, tasks, workers):
+        if workers <= 1 or len(tasks) <= 1:
+            return map(insert_chunk, tasks)
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+            return pool.map(insert_chunk, tasks, chunksize=1)
+
+    def reset_sequences(self):
+        # Explicit ids leave server-side sequences behind (PostgreSQL).
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Employee, Recruiter, Job, Application])
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
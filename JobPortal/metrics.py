@@ -0,0 +1,113 @@
+"""
+Counters and timings, aggregated per process and reported as logs.
+
+Every METRICS_REPORT_SECONDS a daemon thread in each process logs what was
+recorded since the last report as one JSON line on this module's logger
+and starts over, as a statsd client flushes; summing the lines across
+processes is left to the log pipeline. A process starts its reporter on
+its first metric, so forked workers get their own.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_timings = {}
+_reporter_lock = threading.Lock()
+_reporter_pid = None
+
+
+def incr(name, value=1):
+    """Add ``value`` to the counter ``name``."""
+    _ensure_reporter()
+    with _lock:
+        _counters[name] += value
+
+
+def timing(name, seconds):
+    """Record one duration sample for ``name`` (count, total and max are kept)."""
+    _ensure_reporter()
+    with _lock:
+        count, total, maximum = _timings.get(name, (0, 0.0, 0.0))
+        _timings[name] = (count + 1, total + seconds, max(maximum, seconds))
+    logger.debug('%s took %.3fs', name, seconds)
+
+
+@contextmanager
+def timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing(name, time.perf_counter() - start)
+
+
+def snapshot():
+    """Return this process' counters and timing aggregates since the last report."""
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'timings': {
+                name: {'count': count, 'total': total, 'max': maximum}
+                for name, (count, total, maximum) in _timings.items()
+            },
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timings.clear()
+
+
+
+def report():
+    """Log the metrics recorded since the last report and start over."""
+    with _lock:
+        counters, timings = dict(_counters), dict(_timings)
+        _counters.clear()
+        _timings.clear()
+    if not counters and not timings:
+        return
+    logger.info(json.dumps({
+        'pid': os.getpid(),
+        'counters': counters,
+        'timings': {
+            name: {'count': count, 'total': round(total, 6), 'max': round(maximum, 6)}
+            for name, (count, total, maximum) in timings.items()
+        },
+    }, sort_keys=True))
+
+
+def _report_every(seconds):
+    while True:
+        time.sleep(seconds)
+        try:
+            report()
+        except Exception:
+            logger.exception('Failed to report metrics')
+
+
+def _ensure_reporter():
+    global _reporter_pid
+    pid = os.getpid()
+    if _reporter_pid == pid:
+        return
+    with _reporter_lock:
+        if _reporter_pid == pid:
+            return
+        _reporter_pid = pid
+        from django.conf import settings
+
+        seconds = settings.METRICS_REPORT_SECONDS
+        if seconds:
+            threading.Thread(target=_report_every, args=(seconds,), name='metrics-reporter', daemon=True).start()
+            atexit.register(report)
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# Body keys never written to the capture.
+REDACTED_KEYS = {'password', 'password2', 'old_password', 'new_password', 'refresh', 'access', 'token'}
+MAX_CAPTURED_BODY = 64 * 1024
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {key: '[redacted]' if key in REDACTED_KEYS else _redact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+class RequestCaptureMiddleware:
+    """
+    Append every request to REQUEST_CAPTURE_PATH as one JSON line, for
+    replay with ``manage.py replay_requests``.
+
+    Off unless the setting is set. A line holds the arrival time, method,
+    path, query string, the JSON body (small bodies only, credentials
+    redacted), the authenticated user id instead of any token, and the
+    status, duration and view name of the response; a streamed response is
+    timed until it is closed, after its last chunk. Each line is a single
+    O_APPEND write, so several worker processes can share the file.
+    Requests sent by the replay itself (``X-Replay`` header) are not captured.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_CAPTURE_PATH:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.fd = os.open(settings.REQUEST_CAPTURE_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if 'HTTP_X_REPLAY' in request.META:
+            return self.get_response(request)
+
+        body = None
+        if request.content_type == 'application/json' and 0 < int(request.META.get('CONTENT_LENGTH') or 0) <= MAX_CAPTURED_BODY:
+            try:
+                body = _redact(json.loads(request.body))
+            except ValueError:
+                pass
+
+        arrived = time.time()
+        start = time.perf_counter()
+        response = self.get_response(request)
+        if not response.streaming:
+            self.record(request, response, body, arrived, time.perf_counter() - start)
+            return response
+
+        # A streaming view returns before its body is produced; the request
+        # is done when the server closes the response.
+        close = response.close
+
+        def close_and_record():
+            try:
+                close()
+            finally:
+                self.record(request, response, body, arrived, time.perf_counter() - start)
+
+        response.close = close_and_record
+        return response
+
+    def record(self, request, response, body, arrived, duration):
+        user = getattr(request, 'user', None)
+        match = request.resolver_match
+        record = {
+            'ts': round(arrived, 6),
+            'method': request.method,
+            'path': request.path,
+            'query': request.META.get('QUERY_STRING', ''),
+            'body': body,
+            'user': user.pk if user is not None and user.is_authenticated else None,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'route': match.view_name if match else None,
+        }
+        line = (json.dumps(record, separators=(',', ':'), default=str) + '\n').encode()
+        with self.lock:
+            os.write(self.fd, line)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'application_deadline'], name='job_active_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0003_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='digest_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='recruiter',
+            name='notification_mode',
+            field=models.CharField(choices=[('instant', 'One email per application'), ('digest', 'Periodic digest')], default='instant', max_length=10),
+        ),
+        # Partial index: MySQL has none and Django skips it there without a
+        # warning; 0011_mysql_fallback_indexes adds a plain index instead.
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('digest_pending', True)), fields=['submitted_at'], name='application_digest_pending_idx'),
+        ),
+    ]
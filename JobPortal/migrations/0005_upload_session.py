@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:17
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0004_recruiter_digest_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('resume', 'Employee resume'), ('logo', 'Recruiter logo')], max_length=10)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('checksum', models.CharField(blank=True, max_length=64)),
+                ('offset', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
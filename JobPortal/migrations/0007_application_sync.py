@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:33
+
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing rows get their submission time rather than the migration time.
+    Application = apps.get_model('JobPortal', 'Application')
+    Application.objects.update(updated_at=models.F('submitted_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0006_job_employee_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application_id', models.BigIntegerField()),
+                ('employee_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['employee', 'updated_at', 'id'], name='application_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtombstone',
+            index=models.Index(fields=['employee_id', 'deleted_at', 'id'], name='tombstone_sync_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:57
+
+from django.db import migrations, models
+
+# (model, field, index) for every '^' search field of the admin.
+PREFIX_SEARCH_INDEXES = [
+    ('User', 'email', 'user_email_prefix_idx'),
+    ('Recruiter', 'company_name', 'recruiter_company_prefix_idx'),
+    ('Employee', 'phone_number', 'employee_phone_prefix_idx'),
+    ('Employee', 'location', 'employee_location_prefix_idx'),
+    ('Job', 'title', 'job_title_prefix_idx'),
+    ('Job', 'location', 'job_location_prefix_idx'),
+]
+
+
+def create_prefix_search_indexes(apps, schema_editor):
+    """
+    Index every column the admin searches by prefix the way its backend
+    runs istartswith, which a plain b-tree index cannot serve on PostgreSQL
+    (UPPER(col::text) LIKE ...) or SQLite (case-insensitive LIKE). MySQL
+    compares with the column's case-insensitive collation, so an ordinary
+    index does, and is only added where the column has none.
+    """
+    vendor = schema_editor.connection.vendor
+    quote = schema_editor.quote_name
+    for model_name, field_name, name in PREFIX_SEARCH_INDEXES:
+        model = apps.get_model('JobPortal', model_name)
+        field = model._meta.get_field(field_name)
+        table, column = quote(model._meta.db_table), quote(field.column)
+        if vendor == 'postgresql':
+            columns = f'(UPPER({column}::text)) text_pattern_ops'
+        elif vendor == 'sqlite':
+            columns = f'{column} COLLATE NOCASE'
+        elif field.db_index or field.unique:
+            continue
+        else:
+            columns = column
+        schema_editor.execute(f'CREATE INDEX {quote(name)} ON {table} ({columns})')
+
+
+def drop_prefix_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    quote = schema_editor.quote_name
+    for model_name, field_name, name in PREFIX_SEARCH_INDEXES:
+        model = apps.get_model('JobPortal', model_name)
+        field = model._meta.get_field(field_name)
+        if vendor == 'mysql':
+            if not (field.db_index or field.unique):
+                schema_editor.execute(f'DROP INDEX {quote(name)} ON {quote(model._meta.db_table)}')
+        else:
+            schema_editor.execute(f'DROP INDEX {quote(name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0008_job_simhash'),
+    ]
+
+    operations = [
+        # Only the admin searched these two, by prefix; their plain indexes
+        # are replaced by the ones below.
+        migrations.AlterField(
+            model_name='employee',
+            name='location',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='title',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.RunPython(create_prefix_search_indexes, drop_prefix_search_indexes),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:59
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+def backfill_geocoded_at(apps, schema_editor):
+    # Rows with a geohash were geocoded; the others may predate geocoding
+    # and are left for geocode_locations to try once.
+    for model_name in ('Job', 'Employee'):
+        model = apps.get_model('JobPortal', model_name)
+        model.objects.exclude(geohash='').update(geocoded_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0009_admin_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='geocoded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='geocoded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_geocoded_at, migrations.RunPython.noop),
+        # Partial index: MySQL has none and Django skips it there without a
+        # warning; 0011_mysql_fallback_indexes adds a plain index instead.
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('geocoded_at__isnull', True)), fields=['id'], name='employee_geocode_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('geocoded_at__isnull', True)), fields=['id'], name='job_geocode_pending_idx'),
+        ),
+    ]
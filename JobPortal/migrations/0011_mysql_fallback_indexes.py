@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+# MySQL has no partial indexes, so the conditional indexes of 0004 and 0010
+# are skipped there. These plain indexes lead with the condition's column
+# and serve the same lookups (pending digests, locations left to geocode).
+FALLBACK_INDEXES = [
+    ('Application', ['digest_pending', 'submitted_at'], 'application_digest_mysql_idx'),
+    ('Employee', ['geocoded_at', 'id'], 'employee_geocode_mysql_idx'),
+    ('Job', ['geocoded_at', 'id'], 'job_geocode_mysql_idx'),
+]
+
+
+def add_fallback_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    for model_name, fields, name in FALLBACK_INDEXES:
+        schema_editor.add_index(apps.get_model('JobPortal', model_name), models.Index(fields=fields, name=name))
+
+
+def remove_fallback_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    for model_name, fields, name in FALLBACK_INDEXES:
+        schema_editor.remove_index(apps.get_model('JobPortal', model_name), models.Index(fields=fields, name=name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobPortal', '0010_geocoded_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fallback_indexes, remove_fallback_indexes),
+    ]
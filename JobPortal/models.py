@@ -1,6 +1,11 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+
+from . import dedupe, geo
 
 
 
@@ -76,13 +81,50 @@ class User(AbstractUser):
         ordering = ['email']
 
 
+def set_coordinates(instance, update_fields=None):
+    """
+    Geocode ``instance.location`` into its latitude/longitude/geohash columns,
+    stamp ``geocoded_at``, and return the ``update_fields`` to save with
+    (extended when the location is among them, untouched when a partial save
+    leaves it out).
+    """
+    if update_fields is not None and 'location' not in update_fields:
+        return update_fields
+    instance.latitude, instance.longitude, instance.geohash = geo.locate(instance.location)
+    instance.geocoded_at = timezone.now()
+    if update_fields is not None:
+        update_fields = {*update_fields, 'latitude', 'longitude', 'geohash', 'geocoded_at'}
+    return update_fields
+
+
+def set_signature(instance, update_fields=None):
+    """
+    Compute a job's near-duplicate signature (JobPortal.dedupe) from its
+    title and description, with the same ``update_fields`` handling as
+    set_coordinates.
+    """
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return update_fields
+    for field, value in dedupe.signature(instance.title, instance.description).items():
+        setattr(instance, field, value)
+    if update_fields is not None:
+        update_fields = {*update_fields, *dedupe.SIGNATURE_FIELDS}
+    return update_fields
+
+
 class Recruiter(models.Model):
+    NOTIFICATION_MODE_CHOICES = [
+        ('instant', 'One email per application'),
+        ('digest', 'Periodic digest'),
+    ]
+
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    company_name = models.CharField(max_length=255)  
+    company_name = models.CharField(max_length=255, db_index=True)
     website = models.URLField(blank=True, null=True)
     logo = models.ImageField(upload_to='company_logos/', blank=True, null=True) 
-    created_at = models.DateTimeField(auto_now_add=True) 
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True) 
+    notification_mode = models.CharField(max_length=10, choices=NOTIFICATION_MODE_CHOICES, default='instant')
 
     def __str__(self):
         return f"{self.user.email if self.user and self.user.email else 'Unknown Recruiter'} from {self.company_name}"
@@ -94,7 +136,7 @@ class Job(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     recruiter = models.ForeignKey(Recruiter, on_delete=models.CASCADE, related_name='jobs')
-    location = models.CharField(max_length=255)
+    location = models.CharField(max_length=255, db_index=True)
     job_type = models.CharField(max_length=50, choices=[
         ('full_time', 'Full Time'),
         ('part_time', 'Part Time'),
@@ -102,16 +144,51 @@ class Job(models.Model):
         ('contract', 'Contract'),
     ])
     salary = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, validators=[MinValueValidator(0)])
-    posted_date = models.DateTimeField(auto_now_add=True)
+    posted_date = models.DateTimeField(auto_now_add=True, db_index=True)
     application_deadline = models.DateTimeField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Filled from ``location`` by the offline gazetteer (JobPortal.geo) on save.
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)
+    # When the location was last looked up, matched or not.
+    geocoded_at = models.DateTimeField(blank=True, null=True, editable=False)
+    # Near-duplicate detection (JobPortal.dedupe): SimHash of title and
+    # description and its six LSH bands, filled on save.
+    simhash = models.BigIntegerField(blank=True, null=True, editable=False)
+    simhash_band0 = models.IntegerField(blank=True, null=True, editable=False)
+    simhash_band1 = models.IntegerField(blank=True, null=True, editable=False)
+    simhash_band2 = models.IntegerField(blank=True, null=True, editable=False)
+    simhash_band3 = models.IntegerField(blank=True, null=True, editable=False)
+    simhash_band4 = models.IntegerField(blank=True, null=True, editable=False)
+    simhash_band5 = models.IntegerField(blank=True, null=True, editable=False)
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, blank=True, null=True, related_name='duplicates')
 
     def __str__(self):
         return f"{self.title} at {self.recruiter.company_name}"
 
+    def save(self, *args, **kwargs):
+        update_fields = set_coordinates(self, kwargs.get('update_fields'))
+        kwargs['update_fields'] = set_signature(self, update_fields)
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['-posted_date']
         verbose_name_plural = 'Jobs'
+        indexes = [
+            # Expiry scan: active jobs past their deadline.
+            models.Index(fields=['is_active', 'application_deadline'], name='job_active_deadline_idx'),
+            # Duplicate lookups: a recruiter's jobs in one LSH band bucket.
+            models.Index(fields=['recruiter', 'simhash_band0'], name='job_recruiter_band0_idx'),
+            models.Index(fields=['recruiter', 'simhash_band1'], name='job_recruiter_band1_idx'),
+            models.Index(fields=['recruiter', 'simhash_band2'], name='job_recruiter_band2_idx'),
+            models.Index(fields=['recruiter', 'simhash_band3'], name='job_recruiter_band3_idx'),
+            models.Index(fields=['recruiter', 'simhash_band4'], name='job_recruiter_band4_idx'),
+            models.Index(fields=['recruiter', 'simhash_band5'], name='job_recruiter_band5_idx'),
+            # geocode_locations: rows never geocoded.
+            models.Index(fields=['id'], condition=models.Q(geocoded_at__isnull=True),
+                         name='job_geocode_pending_idx'),
+        ]
 
 
 class Employee(models.Model):
@@ -119,12 +196,25 @@ class Employee(models.Model):
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
     phone_number = models.CharField(max_length=20)
     location = models.CharField(max_length=255)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)
+    geocoded_at = models.DateTimeField(blank=True, null=True, editable=False)
 
     def __str__(self):
         return self.user.email if self.user and self.user.email else "Unknown Employee"
 
+    def save(self, *args, **kwargs):
+        kwargs['update_fields'] = set_coordinates(self, kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name_plural = 'Employees'
+        indexes = [
+            # geocode_locations: rows never geocoded.
+            models.Index(fields=['id'], condition=models.Q(geocoded_at__isnull=True),
+                         name='employee_geocode_pending_idx'),
+        ]
 
 
 
@@ -132,7 +222,7 @@ class Application(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='applications')
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     cover_letter = models.TextField(blank=True, null=True)
-    submitted_at = models.DateTimeField(auto_now_add=True)
+    submitted_at = models.DateTimeField(auto_now_add=True, db_index=True)
     status = models.CharField(max_length=50, choices=[
         ('submitted', 'Submitted'),
         ('under_review', 'Under Review'),
@@ -141,6 +231,10 @@ class Application(models.Model):
         ('rejected', 'Rejected'),
     ], default='submitted')
     is_active = models.BooleanField(default=True)
+    # Set while the application waits for its recruiter's next digest email.
+    digest_pending = models.BooleanField(default=False)
+    # Bumped on every save; the sync cursor of JobPortal.sync.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.employee.user.email} applied for {self.job.title}"
@@ -149,3 +243,53 @@ class Application(models.Model):
             self.status = new_status
             self.changed_by = user  
             self.save()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['submitted_at'],
+                condition=models.Q(digest_pending=True),
+                name='application_digest_pending_idx',
+            ),
+            # Employee inbox sync: one employee's rows in cursor order.
+            models.Index(fields=['employee', 'updated_at', 'id'], name='application_sync_idx'),
+        ]
+
+
+class ApplicationTombstone(models.Model):
+    """
+    Marker left behind by a deleted application so incremental sync clients
+    learn about the delete. Pruned after APPLICATION_TOMBSTONE_RETENTION_DAYS.
+    """
+    application_id = models.BigIntegerField()
+    # Plain ids: the employee row may be deleted along with the application.
+    employee_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employee_id', 'deleted_at', 'id'], name='tombstone_sync_idx'),
+        ]
+
+
+class UploadSession(models.Model):
+    """A resumable, chunked upload of an employee resume or a recruiter logo."""
+
+    TARGET_CHOICES = [
+        ('resume', 'Employee resume'),
+        ('logo', 'Recruiter logo'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    target = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField(validators=[MinValueValidator(1)])
+    # Optional SHA-256 (hex) of the whole file, verified on finalize.
+    checksum = models.CharField(max_length=64, blank=True)
+    offset = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.target} upload {self.id} ({self.offset}/{self.size} bytes)"
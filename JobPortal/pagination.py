@@ -1,3 +1,6 @@
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
@@ -17,3 +20,54 @@ class MyPageNumberPagination(PageNumberPagination):
             'count': self.page.paginator.count,
             'results': data
         })
+
+
+def estimated_row_count(model, using):
+    """
+    Row count of ``model``'s table from the database statistics, without
+    scanning it. Returns None when the backend has no estimate (SQLite only
+    has one after ANALYZE).
+    """
+    table = model._meta.db_table
+    connection = connections[using]
+    queries = {
+        'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+        'mysql': (
+            'SELECT TABLE_ROWS FROM information_schema.TABLES '
+            'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s'
+        ),
+        'sqlite': 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+    }
+    sql = queries.get(connection.vendor)
+    if sql is None:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists on very large tables.
+
+    An unfiltered changelist uses the planner's row estimate instead of an
+    exact COUNT(*) once the table is bigger than ``exact_count_limit``;
+    filtered or searched lists, and small tables, are still counted exactly.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query') and not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return super().count
@@ -1,25 +1,153 @@
-from rest_framework.permissions import BasePermission, SAFE_METHODS
+from dataclasses import dataclass
+from types import MappingProxyType
 
-class IsRecruiterOrSuperadmin(BasePermission):
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F
+from rest_framework.permissions import BasePermission
+
+from .models import User
+
+ALL = 'all'
+OWN = 'own'
+
+ACTIONS = MappingProxyType({
+    'GET': 'read', 'HEAD': 'read', 'OPTIONS': 'read',
+    'POST': 'create', 'PUT': 'update', 'PATCH': 'update', 'DELETE': 'delete',
+})
+
+# resource -> action -> role -> ALL (every row) or OWN (rows whose
+# OWNER_LOOKUPS column is the user). Anything not listed is denied: writes
+# answer 403, reads just don't see the rows (empty lists, 404 on detail).
+# Which fields a granted update may change is up to the view.
+PERMISSION_RULES = {
+    'job': {
+        'read': {'recruiter': OWN, 'superadmin': ALL, 'subadmin': ALL},
+        'create': {'recruiter': ALL, 'superadmin': ALL},
+        'update': {'recruiter': OWN, 'superadmin': ALL, 'subadmin': ALL},
+        'delete': {'recruiter': OWN, 'superadmin': ALL, 'subadmin': ALL},
+    },
+    'application': {
+        'read': {'employee': OWN, 'recruiter': OWN, 'superadmin': ALL, 'subadmin': ALL},
+        'create': {'employee': ALL},
+        'update': {'employee': OWN, 'recruiter': OWN},
+        'delete': {'employee': OWN, 'superadmin': ALL},
+    },
+}
+OWNER_LOOKUPS = {
+    'job': {'recruiter': 'recruiter__user_id'},
+    'application': {'employee': 'employee__user_id', 'recruiter': 'job__recruiter__user_id'},
+}
+
+
+@dataclass(frozen=True)
+class Owner:
+    """An OWN grant: the owning user id's lookup, its annotation name and attribute path."""
+    lookup: str
+    annotation: str
+    path: tuple
+
+    @classmethod
+    def from_lookup(cls, lookup):
+        return cls(lookup, lookup.replace('__', '_'), tuple(lookup.split('__')))
+
+
+def compile_matrix(rules, owner_lookups):
+    """
+    Flatten ``rules`` into a read-only ``{(role, resource, action): ALL or
+    Owner}``, checking every role, action and OWN grant up front so a typo
+    fails at startup instead of silently denying.
+    """
+    roles = {role for role, _ in User.ROLE_CHOICES}
+    matrix = {}
+    for resource, actions in rules.items():
+        for action, grants in actions.items():
+            if action not in ACTIONS.values():
+                raise ImproperlyConfigured(f'Unknown action {action!r} for {resource}.')
+            for role, scope in grants.items():
+                if role not in roles:
+                    raise ImproperlyConfigured(f'Unknown role {role!r} for {resource}/{action}.')
+                if scope == ALL:
+                    matrix[role, resource, action] = ALL
+                elif scope == OWN and role in owner_lookups.get(resource, {}):
+                    matrix[role, resource, action] = Owner.from_lookup(owner_lookups[resource][role])
+                else:
+                    raise ImproperlyConfigured(f'Invalid grant {scope!r} to {role} for {resource}/{action}.')
+    return MappingProxyType(matrix)
+
+
+PERMISSION_MATRIX = compile_matrix(PERMISSION_RULES, OWNER_LOOKUPS)
+# Owner user id annotations per resource, added by scope_queryset.
+OWNER_ANNOTATIONS = MappingProxyType({
+    resource: MappingProxyType({
+        owner.annotation: F(owner.lookup) for owner in map(Owner.from_lookup, lookups.values())
+    })
+    for resource, lookups in OWNER_LOOKUPS.items()
+})
+
+
+def grant(user, resource, action):
+    """ALL, an Owner, or None when ``user`` may not ``action`` ``resource``: one dict lookup."""
+    if not user.is_authenticated:
+        return None
+    return PERMISSION_MATRIX.get((user.role, resource, action))
+
+
+def _owner_user_id(obj, annotation, path):
+    """
+    Id of the user owning ``obj``: the annotation added by scope_queryset, or
+    (for objects that did not come from a scoped queryset) the FK id reached
+    by following ``path`` without loading the User row.
     """
-    Custom permission to allow only recruiters and superadmins to create jobs.
-    Employees can view all jobs but cannot create or edit any jobs.
-    Recruiters can perform all actions on jobs they created.
+    if hasattr(obj, annotation):
+        return getattr(obj, annotation)
+    for attribute in path[:-1]:
+        obj = getattr(obj, attribute)
+    return getattr(obj, path[-1])
+
+
+class MatrixPermission(BasePermission):
+    """
+    Answers from PERMISSION_MATRIX for ``resource``. Reads pass
+    has_permission for any authenticated user and are narrowed by
+    scope_queryset; writes need a grant, and an OWN grant is checked
+    against the object's owner.
     """
 
+    resource = None
+
     def has_permission(self, request, view):
-        if request.method in SAFE_METHODS:
-            return request.user.is_authenticated
-        return request.user.is_authenticated and (
-            request.user.role == 'recruiter' or request.user.is_superuser
-        )
+        if not request.user.is_authenticated:
+            return False
+        action = ACTIONS.get(request.method)
+        return action == 'read' or grant(request.user, self.resource, action) is not None
+
+    def scope_queryset(self, request, queryset):
+        """
+        Restrict a queryset of ``resource`` to the rows the user may read,
+        annotating the owners' user ids so object checks need no extra query.
+        """
+        rule = grant(request.user, self.resource, 'read')
+        if rule is None:
+            return queryset.none()
+        if rule is not ALL:
+            queryset = queryset.filter(**{rule.lookup: request.user.pk})
+        return queryset.annotate(**OWNER_ANNOTATIONS[self.resource])
 
     def has_object_permission(self, request, view, obj):
-        if request.method in SAFE_METHODS:
-            return True
-        if request.user.role == 'recruiter':
-            return obj.recruiter.user == request.user
-        return request.user.is_superuser
+        rule = grant(request.user, self.resource, ACTIONS.get(request.method))
+        if rule is None:
+            return False
+        return rule is ALL or _owner_user_id(obj, rule.annotation, rule.path) == request.user.pk
+
+
+class IsRecruiterOrSuperadmin(MatrixPermission):
+    """
+    Jobs (PERMISSION_RULES['job']): recruiters manage their own jobs,
+    superadmins everything, subadmins moderate (read, edit and delete any
+    job, but post none).
+    """
+
+    resource = 'job'
 
 # class IsEmployeeRecruiterOrSuperadmin(BasePermission):
 #     """
@@ -47,32 +175,12 @@ class IsRecruiterOrSuperadmin(BasePermission):
 #                 return obj.job.recruiter.user == request.user
 #         return False
 
-class IsEmployeeRecruiterOrSuperadmin(BasePermission):
+class IsEmployeeRecruiterOrSuperadmin(MatrixPermission):
     """
-    Custom permission to allow:
-    - Employees to create, view, update, and delete their own applications.
-    - Recruiters to view applications for jobs they've posted and update status.
-    - Superadmins to view and delete applications only.
+    Applications (PERMISSION_RULES['application']):
+    - Employees create, view, update and delete their own applications.
+    - Recruiters view applications to their jobs and update the status.
+    - Superadmins view and delete any application; subadmins only view.
     """
 
-    def has_permission(self, request, view):
-        return request.user.is_authenticated
-
-    def has_object_permission(self, request, view, obj):
-        if request.user.is_superuser:
-            if request.method in ('GET', 'DELETE'):
-                return True
-            return False
-
-        if request.user.role == 'employee':
-            if request.method in ('GET', 'PUT', 'PATCH', 'DELETE'):
-                return obj.employee.user == request.user
-        
-        elif request.user.role == 'recruiter':
-            if request.method == 'GET':
-                return obj.job.recruiter.user == request.user
-            elif request.method in ('PUT', 'PATCH'):
-                # Allow changing only the 'status' field for recruiters
-                return obj.job.recruiter.user == request.user
-
-        return False
+    resource = 'application'
@@ -0,0 +1,174 @@
+import asyncio
+import itertools
+import json
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from . import metrics
+
+
+class Hub:
+    """
+    In-process pub/sub fanning events out to the SSE connections of a user.
+
+    Every connection is a bounded asyncio.Queue on the server's event loop;
+    publish() may be called from any thread (Django runs sync views in a
+    thread pool under ASGI) and hands the event to the loop with
+    call_soon_threadsafe. A connection whose queue is full misses events
+    rather than stalling the others; clients catch up through
+    /applications/sync/ after reconnecting.
+
+    Subscribers only exist in the process serving their connection, so
+    events published by another process (a WSGI worker, a Celery task) do not
+    reach them; fanning out across processes needs a shared broker in front
+    of publish().
+    """
+
+    def __init__(self):
+        # Keyed by str(user id): JWT claims carry the id as a string.
+        self._subscribers = defaultdict(set)
+        self._loop = None
+        self._ids = itertools.count(1)
+
+    def subscribe(self, user_id):
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=settings.PUSH_QUEUE_SIZE)
+        self._subscribers[str(user_id)].add(queue)
+        metrics.incr('push.connections')
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        queues = self._subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(user_id)]
+        metrics.incr('push.disconnections')
+
+    def connection_count(self):
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, user_id, event_type, data):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        event = (next(self._ids), event_type, data)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(user_id, event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, user_id, event)
+
+    def _deliver(self, user_id, event):
+        for queue in self._subscribers.get(str(user_id), ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                metrics.incr('push.dropped')
+        metrics.incr('push.published')
+
+
+hub = Hub()
+
+
+def publish_on_commit(user_id, event_type, data):
+    """Publish to ``user_id``'s connections once the current transaction commits."""
+    transaction.on_commit(lambda: hub.publish(user_id, event_type, data))
+
+
+def format_event(event):
+    event_id, event_type, data = event
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n'.encode()
+
+
+def authenticate(scope):
+    """
+    User id from the JWT access token in ``?token=`` (EventSource cannot set
+    headers) or an ``Authorization: Bearer`` header, or None.
+    """
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from .denylist import is_token_revoked
+
+    token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+    if token is None:
+        for name, value in scope.get('headers', ()):
+            if name == b'authorization' and value.startswith(b'Bearer '):
+                token = value[7:].decode()
+    if not token:
+        return None
+    try:
+        access = AccessToken(token)
+        if is_token_revoked(access):
+            return None
+        return access[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+async def sse_app(scope, receive, send):
+    """
+    ASGI app streaming the authenticated user's events as Server-Sent Events.
+
+    Each connection is a coroutine waiting on its queue, so idle connections
+    cost a few kilobytes and no thread. A comment line is sent every
+    PUSH_HEARTBEAT_SECONDS to keep proxies from closing idle streams.
+    """
+    # The revocation check can sync the denylist from the cache; keep that
+    # I/O off the event loop serving every other connection.
+    user_id = await sync_to_async(authenticate)(scope)
+    if user_id is None:
+        await send({'type': 'http.response.start', 'status': 401,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"detail":"Authentication credentials were not provided or are invalid."}'})
+        return
+
+    queue = hub.subscribe(user_id)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    next_event = None
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        await send({'type': 'http.response.body', 'body': b': connected\n\n', 'more_body': True})
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnected},
+                timeout=settings.PUSH_HEARTBEAT_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnected in done:
+                break
+            if next_event in done:
+                body = format_event(next_event.result())
+                next_event = None
+            else:
+                body = b': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+        disconnected.cancel()
+        hub.unsubscribe(user_id, queue)
@@ -1,10 +1,26 @@
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
-from .models import User, Recruiter, Job, Employee, Application
+from .models import User, Recruiter, Job, Employee, Application, UploadSession
+from . import dedupe
+from django.conf import settings
+import os
 import re
 from decimal import Decimal
 
 
+class DynamicFieldsMixin:
+    """
+    Serializer mixin taking ``fields=[...]``: only those of its fields are
+    rendered (the sparse fieldsets of JobPortal.fieldsets).
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -71,11 +87,11 @@ class EmployeeSerializer(serializers.ModelSerializer):
         model = Employee
         fields = ['id', 'phone_number', 'user']
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = ['id', 'title', 'description', 'location', 'salary']
-        read_only_fields = ['recruiter']
+        fields = ['id', 'title', 'description', 'location', 'salary', 'duplicate_of']
+        read_only_fields = ['recruiter', 'duplicate_of']
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -89,12 +105,39 @@ class JobSerializer(serializers.ModelSerializer):
         validated_data['recruiter'] = recruiter
         return super().create(validated_data)
 
+    def validate(self, attrs):
+        """
+        Reject or flag near-duplicates of the recruiter's active jobs
+        (JOB_DUPLICATE_ACTION, see JobPortal.dedupe).
+        """
+        action = settings.JOB_DUPLICATE_ACTION
+        if action == 'off' or not {'title', 'description'} & set(attrs):
+            return attrs
+        if self.instance is not None:
+            recruiter_id = self.instance.recruiter_id
+        else:
+            recruiter = getattr(self.context['request'].user, 'recruiter', None)
+            if recruiter is None:
+                return attrs
+            recruiter_id = recruiter.pk
+        original = dedupe.find_duplicate(
+            recruiter_id,
+            attrs.get('title', getattr(self.instance, 'title', '')),
+            attrs.get('description', getattr(self.instance, 'description', '')),
+            exclude=getattr(self.instance, 'pk', None),
+        )
+        if action == 'reject' and original is not None:
+            raise serializers.ValidationError({'duplicate_of': f'This job duplicates your job {original}.'})
+        if action == 'flag':
+            attrs['duplicate_of_id'] = original
+        return attrs
+
     def validate_salary(self, value):
         if not isinstance(value, Decimal):
             raise serializers.ValidationError("Salary must be a decimal value.")
         return value
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = [
@@ -139,6 +182,54 @@ class ApplicationSerializer(serializers.ModelSerializer):
         instance.is_active = validated_data.get('is_active', instance.is_active)
         instance.save()
         return instance
-    
 
-    
+
+class JobListSerializer(JobSerializer):
+    """Job card for list responses: no description."""
+
+    class Meta(JobSerializer.Meta):
+        fields = ['id', 'title', 'location', 'salary']
+
+
+class ApplicationListSerializer(ApplicationSerializer):
+    """Application row for list responses: no cover letter."""
+
+    class Meta(ApplicationSerializer.Meta):
+        fields = ['id', 'employee', 'job', 'submitted_at', 'status', 'is_active']
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'target', 'filename', 'size', 'checksum', 'offset', 'created_at']
+        read_only_fields = ['id', 'offset', 'created_at']
+
+    def validate_filename(self, value):
+        value = os.path.basename(value)
+        if not value:
+            raise serializers.ValidationError("A file name is required.")
+        return value
+
+    def validate_size(self, value):
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Files are limited to {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes."
+            )
+        return value
+
+    def validate_checksum(self, value):
+        if value and not re.fullmatch(r"[0-9a-fA-F]{64}", value):
+            raise serializers.ValidationError("Checksum must be a hex SHA-256 digest.")
+        return value.lower()
+
+    def validate_target(self, value):
+        user = self.context['request'].user
+        if value == 'resume' and not hasattr(user, 'employee'):
+            raise serializers.ValidationError("Only employees can upload a resume.")
+        if value == 'logo' and not hasattr(user, 'recruiter'):
+            raise serializers.ValidationError("Only recruiters can upload a logo.")
+        return value
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return super().create(validated_data)
@@ -0,0 +1,63 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import facets
+from .models import Application, ApplicationTombstone, Job, Recruiter
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_facets(sender, **kwargs):
+    facets.invalidate()
+
+
+@receiver(post_save, sender=Recruiter)
+def invalidate_company_facets(sender, update_fields=None, **kwargs):
+    # Only the company name is a facet value; other recruiter edits keep the cache.
+    if update_fields is None or 'company_name' in update_fields:
+        facets.invalidate()
+
+
+_tombstones = threading.local()
+
+
+@receiver(post_delete, sender=Application)
+def record_application_tombstone(sender, instance, **kwargs):
+    # Covers API deletes and cascades nobody tombstoned up front (JobPortal.sync).
+    if getattr(_tombstones, 'written', False):
+        return
+    ApplicationTombstone.objects.create(application_id=instance.pk, employee_id=instance.employee_id)
+
+
+@contextmanager
+def application_tombstones(rows):
+    """
+    Tombstone the applications in ``rows`` ((id, employee_id) pairs) with one
+    INSERT, and mute record_application_tombstone in this thread while the
+    block deletes them, directly or by cascade. Use it inside the transaction
+    that deletes them, so the tombstones commit or roll back with the rows.
+    """
+    ApplicationTombstone.objects.bulk_create(
+        [ApplicationTombstone(application_id=pk, employee_id=employee_id) for pk, employee_id in rows],
+        batch_size=1000,
+    )
+    _tombstones.written = True
+    try:
+        yield
+    finally:
+        _tombstones.written = False
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    # Feeds the query latency admission control sheds writes on. The
+    # DatabaseWrapper outlives its connections (CONN_MAX_AGE, health check
+    # reconnects), so the wrapper is installed once per DatabaseWrapper.
+    from .throttling import track_query_latency
+
+    if track_query_latency not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_query_latency)
@@ -0,0 +1,158 @@
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+    orjson = None
+
+
+STREAM_CHUNK_ROWS = 500
+
+
+def dumps(value):
+    """Encode ``value`` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=DjangoJSONEncoder().default)
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def _datetime(value, tz=None):
+    # Same output as DRF's DateTimeField: current timezone, 'Z' for UTC.
+    value = timezone.localtime(value, tz).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def _decimal(value):
+    # DRF renders decimals as strings (COERCE_DECIMAL_TO_STRING).
+    return format(value, 'f')
+
+
+def values_plan(serializer_class, fields=None):
+    """
+    Map a ModelSerializer's fields (or the ``fields`` subset of them) onto
+    ``QuerySet.values()`` columns.
+
+    Returns ``[(field_name, converter_or_None), ...]`` when every field is a
+    plain model field whose DRF representation can be reproduced from the
+    raw column value, or ``None`` if the serializer needs its own
+    ``to_representation`` (method fields, nested serializers, sources ...).
+    """
+    meta = serializer_class.Meta
+    if serializer_class._declared_fields:
+        return None
+    plan = []
+    for name in meta.fields:
+        if fields is not None and name not in fields:
+            continue
+        try:
+            field = meta.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        if isinstance(field, models.DateTimeField):
+            plan.append((name, _datetime))
+        elif isinstance(field, models.DecimalField):
+            plan.append((name, _decimal))
+        elif isinstance(field, (models.FileField, models.DateField, models.TimeField)):
+            return None
+        else:
+            plan.append((name, None))
+    return plan
+
+
+def narrow_queryset(queryset, serializer_class, fields):
+    """
+    ``queryset.only()`` the columns behind ``fields`` so a sparse fieldset
+    also shortens the SELECT; unchanged when the fields do not map onto
+    columns (see values_plan).
+    """
+    plan = values_plan(serializer_class, fields) if fields is not None else None
+    if plan is None:
+        return queryset
+    return queryset.only(*(name for name, _ in plan))
+
+
+def iter_rows(queryset, serializer_class, context=None, fields=None):
+    """
+    Yield one representation dict per row, streaming the queryset with
+    ``.iterator()``. Uses the ``values()`` fast path when the serializer
+    allows it and falls back to the serializer per row otherwise.
+    ``fields`` limits the output (and the selected columns) to a subset of
+    the serializer's fields.
+    """
+    plan = values_plan(serializer_class, fields)
+    if plan is None:
+        extra = {} if fields is None else {'fields': fields}
+        for instance in queryset.iterator(chunk_size=STREAM_CHUNK_ROWS):
+            yield serializer_class(instance, context=context, **extra).data
+        return
+
+    names = [name for name, _ in plan]
+    # Looking the current timezone up costs more than the conversion; once per stream.
+    tz = timezone.get_current_timezone()
+    converters = [
+        (name, functools.partial(convert, tz=tz) if convert is _datetime else convert)
+        for name, convert in plan if convert is not None
+    ]
+    for row in queryset.values(*names).iterator(chunk_size=STREAM_CHUNK_ROWS):
+        for name, convert in converters:
+            value = row[name]
+            if value is not None:
+                row[name] = convert(value)
+        yield row
+
+
+def _envelope(message, rows):
+    yield b'{"message":' + dumps(message) + b',"data":['
+    chunk = []
+    separator = b''
+    for row in rows:
+        chunk.append(dumps(row))
+        if len(chunk) >= STREAM_CHUNK_ROWS:
+            yield separator + b','.join(chunk)
+            separator = b','
+            chunk = []
+    if chunk:
+        yield separator + b','.join(chunk)
+    yield b']}'
+
+
+async def _aiterate(chunks):
+    # Each chunk is produced by the thread the view ran in, where the
+    # queryset's connection lives; the event loop only awaits it.
+    produce = sync_to_async(next)
+    while (chunk := await produce(chunks, None)) is not None:
+        yield chunk
+
+
+def _is_asgi(context):
+    request = (context or {}).get('request')
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def streaming_list_response(message, queryset, serializer_class, context=None, fields=None):
+    """
+    Stream ``{"message": ..., "data": [...]}`` without materializing the list.
+
+    The response body is produced after the view returns, so the database
+    alias is resolved now (e.g. the read replica picked for this request).
+    Under ASGI, Django reads a synchronous body to the end before sending
+    any of it, so when ``context['request']`` came through ASGI the body
+    is an async iterator instead.
+    """
+    queryset = queryset.using(queryset.db)
+    rows = iter_rows(queryset, serializer_class, context=context, fields=fields)
+    body = _envelope(message, rows)
+    if _is_asgi(context):
+        body = _aiterate(body)
+    return StreamingHttpResponse(body, content_type='application/json')
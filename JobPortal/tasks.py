@@ -1,135 +1,216 @@
-from django.core.mail import EmailMultiAlternatives
-from django.urls import reverse
+from smtplib import SMTPException
+
 from django.conf import settings
+from django.core.cache import cache
 from celery import shared_task
 import logging
 
+# JobHunt creates its Celery app lazily; touch it so the shared tasks below
+# bind to the configured app in whatever process imports this module.
+from JobHunt import celery_app  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
-@shared_task
-def send_welcome_email(user_email, user_name, user_role):
-    subject = 'Welcome to Our Platform'
-    text_message = f'Hi {user_name}, thank you for signing up as a {user_role}! We are excited to have you on board.'
-    
-    # HTML version of the email
-    html_message = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; color: #333;">
-        <h2>Welcome, {user_name}!</h2>
-        <p>Thank you for signing up as a <strong>{user_role}</strong>. We are excited to have you on board!</p>
-        <p>Feel free to explore our platform.</p>
-        <p>Best Regards,<br>Your Job Portal Team</p>
-    </body>
-    </html>
+# Notification tasks are fire-and-forget (ignore_result=True): nothing reads
+# their return value, so they skip the result backend write when they finish
+# and the subscription to their result when they are queued. Duration and
+# outcome go to JobPortal.metrics instead (JobHunt.celery_config).
+#
+# A failed send is retried with exponential backoff. acks_late does not
+# cover it: a task that raises is still acknowledged, so the retry is the
+# only second attempt the email gets.
+EMAIL_TASK_OPTIONS = {
+    'bind': True,
+    'ignore_result': True,
+    'autoretry_for': (SMTPException, OSError),
+    'retry_backoff': True,
+    'retry_backoff_max': 10 * 60,
+    'max_retries': 5,
+}
+
+
+CLAIM_PENDING = 'pending'
+CLAIM_DONE = 'done'
+
+
+def _claim_key(task, idempotency_key):
+    return f'task-claim:{task.name}:{idempotency_key or task.request.id}'
+
+
+def claim_task(task, idempotency_key=None):
+    """
+    Return True if this delivery should do the work.
+
+    Tasks are acknowledged late, so a message can be delivered more than
+    once (worker crash, visibility timeout). The key is the caller's
+    ``idempotency_key``, else the task id, which Celery keeps across
+    redeliveries and retries. The first delivery leases it in the shared
+    cache for TASK_CLAIM_LEASE seconds. complete_task marks it done after a
+    successful send, and release_task frees it after a failed one for the
+    task's retry. A later delivery skips once the work is done. While a lease
+    is held it comes back when the lease has run out, because the holder may
+    still be sending or may have died mid-send.
     """
+    key = _claim_key(task, idempotency_key)
+    if cache.add(key, CLAIM_PENDING, settings.TASK_CLAIM_LEASE):
+        return True
+    if cache.get(key) == CLAIM_DONE:
+        logger.info(f'Skipping duplicate delivery of {task.name} ({key})')
+        return False
+    # Waiting out a lease does not use up the send retries; it cannot go on
+    # for long, as the lease expires.
+    raise task.retry(countdown=settings.TASK_CLAIM_LEASE, max_retries=task.request.retries + 1)
+
+
+def complete_task(task, idempotency_key=None):
+    """Mark the claimed work done, so redeliveries within TASK_IDEMPOTENCY_TTL skip it."""
+    cache.set(_claim_key(task, idempotency_key), CLAIM_DONE, settings.TASK_IDEMPOTENCY_TTL)
+
+
+def release_task(task, idempotency_key=None):
+    """Give the claim up after a failed attempt, so the task's retry can claim it."""
+    cache.delete(_claim_key(task, idempotency_key))
+
+
+@shared_task(**EMAIL_TASK_OPTIONS)
+def send_welcome_email(self, user_email, user_name, user_role, idempotency_key=None):
+    if not claim_task(self, idempotency_key):
+        return
+    from .emails import build_email
+
+    subject = 'Welcome to Our Platform'
+    context = {'user_name': user_name, 'user_role': user_role}
 
     try:
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_message,  # Plain text message
-            from_email=settings.EMAIL_HOST_USER,
-            to=[user_email]
-        )
-        
-        # Attach the HTML content
-        email.attach_alternative(html_message, "text/html")
+        email = build_email('welcome', subject, context, [user_email])
         email.send()
+        complete_task(self, idempotency_key)
 
         logger.info(f'Welcome email sent successfully to {user_email}')
     except Exception as e:
+        release_task(self, idempotency_key)
         logger.error(f'Failed to send welcome email to {user_email}: {str(e)}')
+        raise
 
 
+@shared_task(**EMAIL_TASK_OPTIONS)
+def send_application_notification(self, recruiter_email, job_title, applicant_name, idempotency_key=None):
+    if not claim_task(self, idempotency_key):
+        return
+    from .emails import build_email
 
-
-logger = logging.getLogger(__name__)
-
-@shared_task
-def send_application_notification(recruiter_email, job_title, applicant_name):
-    # Subject of the email
     subject = f'New Application for {job_title}'
-    
-    # Plain text version of the email
-    text_message = f"{applicant_name} has applied for the position of {job_title}."
-    
-    # HTML version of the email with inline CSS (without a redirect link)
-    html_message = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; color: #333; padding: 20px; background-color: #f9f9f9; margin: 0; width: 100%; box-sizing: border-box;">
-        <div style="max-width: 600px; margin: auto; background-color: #ffffff; border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px;">
-            <p style="font-size: 16px;">Dear Recruiter,</p>
-            <p style="font-size: 16px; color: #333;">
-                <span style="color: #2c3e50; font-weight: bold;">{applicant_name}</span> has applied for the position of 
-                <span style="font-size: 18px; color: #2c3e50;">{job_title}</span>.
-            </p>
-            <p style="font-size: 16px; color: #333;">You can view this application in your Job Portal dashboard.</p>
-            <p style="margin-top: 20px; font-size: 12px; color: #777;">
-                Thank you, <br> Your Job Portal Team
-            </p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    # Send the email without a job link
+    context = {'applicant_name': applicant_name, 'job_title': job_title}
+
     try:
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_message,  # Plain text message
-            from_email=settings.EMAIL_HOST_USER,
-            to=[recruiter_email]
-        )
-        email.attach_alternative(html_message, "text/html")
+        email = build_email('application_notification', subject, context, [recruiter_email])
         email.send()
+        complete_task(self, idempotency_key)
         logger.info(f'Email sent successfully to {recruiter_email}')
     except Exception as e:
+        release_task(self, idempotency_key)
         logger.error(f'Failed to send email to {recruiter_email}: {str(e)}')
+        raise
 
 
+@shared_task(**EMAIL_TASK_OPTIONS)
+def send_application_status_update_notification(self, employee_email, application_status, job_title, idempotency_key=None):
+    if not claim_task(self, idempotency_key):
+        return
+    from .emails import build_email
 
+    subject = '📩 Your Application Status has been Updated'
+    context = {'application_status': application_status, 'job_title': job_title}
 
+    try:
+        email = build_email('application_status_update', subject, context, [employee_email])
+        email.send()
+        complete_task(self, idempotency_key)
 
+        logger.info(f'Notification sent successfully to {employee_email}')
+    except Exception as e:
+        release_task(self, idempotency_key)
+        logger.error(f'Failed to send notification to {employee_email}: {str(e)}')
+        raise
 
-logger = logging.getLogger(__name__)
 
 @shared_task
-def send_application_status_update_notification(employee_email, application_status, job_title):
-    # Subject of the email
-    subject = '📩 Your Application Status has been Updated'
+def deactivate_expired_jobs():
+    from .archival import deactivate_expired_jobs as deactivate
+
+    return deactivate()
+
+
+@shared_task
+def archive_closed_jobs():
+    from .archival import archive_closed_jobs as archive
+
+    return archive()
+
+
+@shared_task
+def cleanup_upload_sessions():
+    from .uploads import cleanup_abandoned_sessions
+
+    return cleanup_abandoned_sessions()
+
+
+@shared_task
+def prune_application_tombstones():
+    from .sync import prune_tombstones
+
+    return prune_tombstones()
+
 
-    # HTML version of the email without a link
-    html_message = f"""
-    <html>
-    <body style="font-family: 'Arial', sans-serif; background-color: #f4f4f4; margin: 0; padding: 20px;">
-        <div style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1); padding: 20px; max-width: 600px; margin: auto;">
-            <div style="background-color: #3498db; color: white; padding: 15px; border-radius: 8px 8px 0 0; text-align: center;">
-                Application Status Update
-            </div>
-            <div style="padding: 20px; font-size: 16px; color: #333;">
-                <p>Dear Applicant,</p>
-                <p>Your application for the position of <strong style="color: #e74c3c;">{job_title}</strong> has been updated to:</p>
-                <p style="font-weight: bold; font-size: 18px; color: #3498db;">{application_status}</p>
-                <p>Thank you for your interest in this position.</p>
-            </div>
-            <div style="margin-top: 30px; font-size: 12px; color: #7f8c8d; text-align: center;">
-                Your Job Portal Team
-            </div>
-        </div>
-    </body>
-    </html>
+@shared_task(ignore_result=True)
+def send_recruiter_digests():
     """
+    Send every digest-mode recruiter one email listing the applications
+    received since their last digest, grouped by job.
+    """
+    from django.core.mail import get_connection
+    from .digests import pending_digests
+    from . import metrics
 
-    # Sending the email
+    # One SMTP session for the whole run instead of one per email.
+    connection = get_connection()
+    connection.open()
     try:
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body="This email contains HTML content. Please enable HTML to view the content.",
-            from_email=settings.EMAIL_HOST_USER,
-            to=[employee_email]
-        )
-        email.attach_alternative(html_message, "text/html")
-        email.send()
-
-        logger.info(f'Notification sent successfully to {employee_email}')
-    except Exception as e:
-        logger.error(f'Failed to send notification to {employee_email}: {str(e)}')
+        sent, failed = _send_digests(connection, pending_digests())
+    finally:
+        connection.close()
+
+    metrics.incr('digests.sent', sent)
+    metrics.incr('digests.failed', failed)
+    return {'sent': sent, 'failed': failed}
+
+
+def _send_digests(connection, digests):
+    from .emails import build_batch
+    from .models import Application
+
+    digests = list(digests)
+    emails = build_batch('recruiter_digest', {}, [
+        (_digest_subject(len(application_ids)), {'count': len(application_ids), 'jobs': jobs}, [recruiter_email])
+        for recruiter_email, jobs, application_ids in digests
+    ], connection=connection)
+
+    sent = failed = 0
+    for (recruiter_email, _, application_ids), email in zip(digests, emails):
+        count = len(application_ids)
+        try:
+            email.send()
+        except Exception as e:
+            failed += 1
+            logger.error(f'Failed to send digest to {recruiter_email}: {str(e)}')
+            continue
+
+        # Only the applications listed in this email; newer ones wait for the next digest.
+        Application.objects.filter(id__in=application_ids).update(digest_pending=False)
+        sent += 1
+        logger.info(f'Digest with {count} applications sent to {recruiter_email}')
+    return sent, failed
+
+
+def _digest_subject(count):
+    return f'{count} new application{"s" if count != 1 else ""} on your job postings'
@@ -0,0 +1,23 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from JobPortal.denylist import denylist
+from JobPortal.utils import get_tokens_for_user
+
+
+class JobPortalTestCase(APITestCase):
+    """
+    Clears the per-process state tests would otherwise share: the cache
+    (task claims keyed by primary keys that the next test reuses, facets,
+    throttle buckets) and the token denylist.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        denylist.reset()
+
+    def authenticate(self, user):
+        """Send a real access token for ``user``, as the JWT authentication expects."""
+        token = get_tokens_for_user(user)['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
@@ -0,0 +1,106 @@
+"""
+Test data in one INSERT per model: every factory builds its rows and saves
+them with bulk_create. bulk_create skips save(), so the factories fill in
+what save() would (the role flags of a user, coordinates, job signatures).
+"""
+import itertools
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from JobPortal import dedupe, geo
+from JobPortal.models import Application, Employee, Job, Recruiter, User
+
+PASSWORD = 'Secret123'
+# Enough distinct words that two generated jobs are never near-duplicates.
+VOCABULARY = [f'word{i}' for i in range(2000)]
+
+_sequence = itertools.count(1)
+_random = random.Random(49)
+_password_hash = None
+
+
+def password_hash():
+    # Hashed once: make_password is the slow part of creating users.
+    global _password_hash
+    if _password_hash is None:
+        _password_hash = make_password(PASSWORD)
+    return _password_hash
+
+
+def make_users(count, role='employee', **fields):
+    users = []
+    for _ in range(count):
+        number = next(_sequence)
+        user = User(email=f'{role}{number}@example.com', name=f'{role.title()} {number}', role=role,
+                    password=password_hash(), **fields)
+        # As User.save() does.
+        user.is_superuser = role == 'superadmin'
+        user.is_staff = role in ('superadmin', 'subadmin')
+        users.append(user)
+    return User.objects.bulk_create(users)
+
+
+def make_user(role='employee', **fields):
+    return make_users(1, role, **fields)[0]
+
+
+def make_recruiters(count, **fields):
+    fields.setdefault('notification_mode', 'instant')
+    users = make_users(count, 'recruiter')
+    return Recruiter.objects.bulk_create([
+        Recruiter(user=user, company_name=f'Company {user.pk}', **fields) for user in users
+    ])
+
+
+def make_recruiter(**fields):
+    return make_recruiters(1, **fields)[0]
+
+
+def make_employees(count, location='Delhi', **fields):
+    users = make_users(count, 'employee')
+    latitude, longitude, geohash = geo.locate(location)
+    return Employee.objects.bulk_create([
+        Employee(user=user, phone_number='9999999999', location=location,
+                 latitude=latitude, longitude=longitude, geohash=geohash, geocoded_at=timezone.now(), **fields)
+        for user in users
+    ])
+
+
+def make_employee(**fields):
+    return make_employees(1, **fields)[0]
+
+
+def job_description(words=80):
+    return ' '.join(_random.sample(VOCABULARY, words))
+
+
+def make_jobs(recruiter, count, location='Delhi', **fields):
+    latitude, longitude, geohash = geo.locate(location)
+    jobs = []
+    for _ in range(count):
+        job = Job(**{
+            'title': f'Job {next(_sequence)}', 'description': job_description(), 'job_type': 'full_time',
+            **fields,
+        }, recruiter=recruiter, location=location, latitude=latitude, longitude=longitude, geohash=geohash,
+            geocoded_at=timezone.now())
+        for field, value in dedupe.signature(job.title, job.description).items():
+            setattr(job, field, value)
+        jobs.append(job)
+    return Job.objects.bulk_create(jobs)
+
+
+def make_job(recruiter, **fields):
+    return make_jobs(recruiter, 1, **fields)[0]
+
+
+def make_applications(employees, jobs, **fields):
+    """One application per (employee, job) pair."""
+    return Application.objects.bulk_create([
+        Application(employee=employee, job=job, **fields) for employee in employees for job in jobs
+    ])
+
+
+def make_application(employee, job, **fields):
+    return make_applications([employee], [job], **fields)[0]
@@ -0,0 +1,24 @@
+from unittest import skipUnless
+
+from django.db import connection
+
+from JobPortal.models import Employee, Job, Recruiter, User
+
+from .base import JobPortalTestCase
+
+
+@skipUnless(connection.vendor == 'sqlite', 'query plans are SQLite specific')
+class PrefixSearchIndexTests(JobPortalTestCase):
+    def test_admin_prefix_searches_use_an_index(self):
+        searches = [
+            (User, 'email', 'user_email_prefix_idx'),
+            (Recruiter, 'company_name', 'recruiter_company_prefix_idx'),
+            (Employee, 'phone_number', 'employee_phone_prefix_idx'),
+            (Employee, 'location', 'employee_location_prefix_idx'),
+            (Job, 'title', 'job_title_prefix_idx'),
+            (Job, 'location', 'job_location_prefix_idx'),
+        ]
+        for model, field, index in searches:
+            with self.subTest(field=f'{model.__name__}.{field}'):
+                plan = model.objects.filter(**{f'{field}__istartswith': 'Eng'}).explain()
+                self.assertIn(index, plan)
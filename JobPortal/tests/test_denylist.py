@@ -0,0 +1,72 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from JobPortal.denylist import KEY_PREFIX, LOG_KEY, SEQ_KEY, Denylist
+
+from .base import JobPortalTestCase
+
+EXP = 2 ** 40
+
+
+class DenylistSyncTests(JobPortalTestCase):
+    def test_revocations_reach_other_processes(self):
+        jti = uuid.uuid4().hex
+        Denylist().revoke(jti, EXP)
+
+        self.assertTrue(Denylist().is_revoked(jti))
+        self.assertFalse(Denylist().is_revoked(uuid.uuid4().hex))
+
+    def test_new_process_starts_at_the_oldest_live_mark(self):
+        cache.set(SEQ_KEY, 10 ** 6)
+        jti = uuid.uuid4().hex
+        Denylist().revoke(jti, EXP)
+
+        other = Denylist()
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            other.sync()
+
+        read = sum(len(call.args[0]) for call in get_many.call_args_list)
+        self.assertLess(read, 1000)
+        self.assertTrue(other.is_revoked(jti))
+
+    def test_late_log_write_is_picked_up(self):
+        other = Denylist()
+        other.sync()
+        cache.set(SEQ_KEY, 1)
+        other.sync(now=10 ** 6)
+        jti = uuid.uuid4().hex
+        cache.set(LOG_KEY.format(1), jti)
+        cache.set(KEY_PREFIX + jti, 1)
+        other.sync(now=2 * 10 ** 6)
+
+        self.assertTrue(other.is_revoked(jti))
+        self.assertEqual(other._missing, {})
+
+    @override_settings(SIMPLE_JWT={'REFRESH_TOKEN_LIFETIME': timedelta(seconds=60)})
+    def test_missing_numbers_are_dropped_after_a_lifetime(self):
+        other = Denylist()
+        cache.set(SEQ_KEY, 3)
+        other.sync(now=1000)
+        self.assertEqual(set(other._missing), {1, 2, 3})
+
+        other.sync(now=1000 + 61)
+
+        self.assertEqual(other._missing, {})
+
+    def test_checks_do_not_wait_for_another_threads_sync(self):
+        jti = uuid.uuid4().hex
+        other = Denylist()
+        other.revoke(jti, EXP)
+        other.sync()
+        other._next_sync = 0.0
+
+        # Another thread is pulling the log.
+        with other._sync_lock, mock.patch.object(cache, 'get_many') as get_many:
+            self.assertTrue(other.is_revoked(jti))
+            self.assertFalse(other.is_revoked(uuid.uuid4().hex))
+
+        get_many.assert_not_called()
@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from JobPortal import geo
+from JobPortal.models import Job
+
+from .base import JobPortalTestCase
+from .factories import make_recruiter
+
+
+class WithinRadiusTests(JobPortalTestCase):
+    def make_job(self, latitude, longitude):
+        # bulk_create, so that save() does not geocode the location over the coordinates.
+        job, = Job.objects.bulk_create([Job(title='Engineer', description='-', recruiter=self.recruiter,
+                                            location='-', job_type='full_time', latitude=latitude,
+                                            longitude=longitude, geohash=geo.geohash(latitude, longitude))])
+        return job
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+
+    def near(self, latitude, longitude, radius_km):
+        return set(geo.within_radius(Job.objects.all(), latitude, longitude, radius_km))
+
+    def test_box_corners_are_outside_the_circle(self):
+        inside = self.make_job(28.70, 77.20)
+        # Inside the 20 km box around Delhi, but ~24 km away diagonally.
+        corner = self.make_job(28.6139 + 0.15, 77.2090 + 0.17)
+        self.make_job(19.0760, 72.8777)
+
+        self.assertEqual(self.near(28.6139, 77.2090, 20), {inside})
+        self.assertGreater(geo.haversine_km(28.6139, 77.2090, [corner.latitude], [corner.longitude])[0], 20)
+
+    def test_across_the_antimeridian(self):
+        east = self.make_job(-17.0, 179.9)
+        west = self.make_job(-17.0, -179.9)
+        self.make_job(-17.0, 178.0)
+
+        self.assertEqual(self.near(-17.0, 179.95, 30), {east, west})
+
+
+class GeocodeCommandTests(JobPortalTestCase):
+    def test_unmatched_rows_are_tried_once(self):
+        recruiter = make_recruiter()
+        Job.objects.bulk_create([
+            Job(title='Engineer', description='-', recruiter=recruiter, location=location, job_type='full_time')
+            for location in ('Bangalore', 'Atlantis')
+        ])
+
+        self.assertIn('2 rows processed, 1 located', self.geocode())
+        self.assertIn('Job: 0 rows processed', self.geocode())
+        self.assertIn('Job: 2 rows processed', self.geocode('--all'))
+
+    def geocode(self, *args):
+        out = StringIO()
+        call_command('geocode_locations', *args, stdout=out)
+        return out.getvalue()
@@ -0,0 +1,26 @@
+import json
+
+from JobPortal import metrics
+
+from .base import JobPortalTestCase
+
+
+class ReportTests(JobPortalTestCase):
+    def test_report_logs_the_interval_and_starts_over(self):
+        metrics.reset()
+        metrics.incr('push.published', 3)
+        metrics.timing('jobs.expiry.duration', 0.5)
+
+        with self.assertLogs('JobPortal.metrics', 'INFO') as logs:
+            metrics.report()
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['counters'], {'push.published': 3})
+        self.assertEqual(line['timings'], {'jobs.expiry.duration': {'count': 1, 'total': 0.5, 'max': 0.5}})
+        self.assertEqual(metrics.snapshot(), {'counters': {}, 'timings': {}})
+
+    def test_nothing_to_report(self):
+        metrics.reset()
+
+        with self.assertNoLogs('JobPortal.metrics', 'INFO'):
+            metrics.report()
@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import time
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from JobPortal.middleware import RequestCaptureMiddleware
+
+from .base import JobPortalTestCase
+
+
+class RequestCaptureTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def capture(self, response):
+        with override_settings(REQUEST_CAPTURE_PATH=self.path):
+            middleware = RequestCaptureMiddleware(lambda request: response)
+        self.addCleanup(os.close, middleware.fd)
+        return middleware(RequestFactory().get('/jobs/'))
+
+    def records(self):
+        with open(self.path) as capture:
+            return [json.loads(line) for line in capture]
+
+    def test_streamed_response_is_timed_until_closed(self):
+        def slow_body():
+            yield b'['
+            time.sleep(0.05)
+            yield b']'
+
+        response = self.capture(StreamingHttpResponse(slow_body()))
+        self.assertEqual(self.records(), [])
+
+        b''.join(response.streaming_content)
+        response.close()
+
+        record, = self.records()
+        self.assertGreaterEqual(record['duration_ms'], 50)
+        self.assertEqual(record['status'], 200)
+
+    def test_response_is_recorded_when_the_view_returns(self):
+        self.capture(HttpResponse(status=201))
+
+        record, = self.records()
+        self.assertEqual((record['method'], record['path'], record['status']), ('GET', '/jobs/', 201))
@@ -0,0 +1,116 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from JobPortal.models import Application, Job
+from JobPortal.permissions import (
+    ALL, OWNER_LOOKUPS, PERMISSION_MATRIX, IsEmployeeRecruiterOrSuperadmin, IsRecruiterOrSuperadmin, Owner,
+    compile_matrix, grant,
+)
+
+from .base import JobPortalTestCase
+from .factories import make_application, make_employee, make_job, make_recruiter, make_user
+
+
+def request_for(user, method='GET'):
+    request = Request(getattr(APIRequestFactory(), method.lower())('/'))
+    request.user = user
+    return request
+
+
+class CompileMatrixTests(SimpleTestCase):
+    def test_owner_grants(self):
+        matrix = compile_matrix({'job': {'update': {'recruiter': 'own', 'superadmin': 'all'}}}, OWNER_LOOKUPS)
+
+        self.assertIs(matrix['superadmin', 'job', 'update'], ALL)
+        self.assertEqual(matrix['recruiter', 'job', 'update'], Owner('recruiter__user_id', 'recruiter_user_id',
+                                                                     ('recruiter', 'user_id')))
+
+    def test_rejects_bad_rules(self):
+        for rules in (
+            {'job': {'publish': {'recruiter': 'all'}}},
+            {'job': {'read': {'admin': 'all'}}},
+            {'job': {'read': {'recruiter': 'some'}}},
+            # No owner lookup for employees on jobs.
+            {'job': {'read': {'employee': 'own'}}},
+        ):
+            with self.subTest(rules=rules), self.assertRaises(ImproperlyConfigured):
+                compile_matrix(rules, OWNER_LOOKUPS)
+
+    def test_matrix_is_read_only(self):
+        with self.assertRaises(TypeError):
+            PERMISSION_MATRIX['employee', 'job', 'create'] = ALL
+
+
+class GrantTests(JobPortalTestCase):
+    def test_grant(self):
+        self.assertIsNone(grant(AnonymousUser(), 'job', 'read'))
+        self.assertIs(grant(make_user('superadmin'), 'job', 'create'), ALL)
+        self.assertIsNone(grant(make_user('subadmin'), 'job', 'create'))
+        self.assertEqual(grant(make_user('employee'), 'application', 'update').lookup, 'employee__user_id')
+        self.assertIsNone(grant(make_user('employee'), 'job', 'read'))
+
+
+class MatrixPermissionTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.employee = make_employee()
+        self.job = make_job(self.recruiter)
+        self.application = make_application(self.employee, self.job)
+        self.other_application = make_application(make_employee(), make_job(make_recruiter()))
+
+    def test_has_permission(self):
+        permission = IsRecruiterOrSuperadmin()
+        cases = [
+            (AnonymousUser(), 'GET', False),
+            (self.employee.user, 'GET', True),  # reads are scoped instead
+            (self.employee.user, 'POST', False),
+            (self.recruiter.user, 'POST', True),
+            (make_user('subadmin'), 'POST', False),
+            (make_user('subadmin'), 'DELETE', True),
+        ]
+        for user, method, expected in cases:
+            with self.subTest(role=getattr(user, 'role', 'anonymous'), method=method):
+                self.assertIs(permission.has_permission(request_for(user, method), None), expected)
+
+    def test_scope_queryset(self):
+        permission = IsEmployeeRecruiterOrSuperadmin()
+        cases = [
+            (self.employee.user, {self.application.pk}),
+            (self.recruiter.user, {self.application.pk}),
+            (make_user('subadmin'), {self.application.pk, self.other_application.pk}),
+        ]
+        for user, expected in cases:
+            with self.subTest(role=user.role):
+                queryset = permission.scope_queryset(request_for(user), Application.objects.all())
+                self.assertEqual({application.pk for application in queryset}, expected)
+
+        queryset = IsRecruiterOrSuperadmin().scope_queryset(request_for(self.employee.user), Job.objects.all())
+        self.assertFalse(queryset.exists())
+
+    def test_object_permission_uses_annotated_owner(self):
+        permission = IsEmployeeRecruiterOrSuperadmin()
+        request = request_for(self.recruiter.user, 'PATCH')
+        application = permission.scope_queryset(request, Application.objects.all()).get()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_object_permission(request, None, application))
+
+    def test_object_permission(self):
+        permission = IsEmployeeRecruiterOrSuperadmin()
+        superadmin = make_user('superadmin')
+        cases = [
+            (self.employee.user, 'DELETE', self.application, True),
+            (self.employee.user, 'PATCH', self.other_application, False),
+            (self.recruiter.user, 'PATCH', self.application, True),
+            (self.recruiter.user, 'DELETE', self.application, False),
+            (superadmin, 'DELETE', self.other_application, True),
+            (superadmin, 'PATCH', self.other_application, False),
+        ]
+        for user, method, application, expected in cases:
+            with self.subTest(role=user.role, method=method, application=application.pk):
+                request = request_for(user, method)
+                self.assertIs(permission.has_object_permission(request, None, application), expected)
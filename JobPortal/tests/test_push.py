@@ -0,0 +1,36 @@
+from asgiref.sync import async_to_sync
+from rest_framework_simplejwt.tokens import AccessToken
+
+from JobPortal.denylist import revoke_token
+from JobPortal.push import sse_app
+from JobPortal.utils import get_tokens_for_user
+
+from .base import JobPortalTestCase
+from .factories import make_employees
+
+
+class SseAuthenticationTests(JobPortalTestCase):
+    def status(self, token):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'query_string': f'token={token}'.encode(), 'headers': []}
+        async_to_sync(sse_app)(scope, receive, send)
+        return messages[0]['status']
+
+    def test_valid_token_connects(self):
+        employee, = make_employees(1)
+
+        self.assertEqual(self.status(get_tokens_for_user(employee.user)['access']), 200)
+
+    def test_revoked_token_is_refused(self):
+        employee, = make_employees(1)
+        access = get_tokens_for_user(employee.user)['access']
+        revoke_token(AccessToken(access))
+
+        self.assertEqual(self.status(access), 401)
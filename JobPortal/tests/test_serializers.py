@@ -0,0 +1,160 @@
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from JobPortal.models import Employee, Recruiter
+from JobPortal.serializers import (
+    ApplicationSerializer, JobListSerializer, JobSerializer, SignupSerializer, UploadSessionSerializer,
+)
+
+from .base import JobPortalTestCase
+from .factories import PASSWORD, make_employee, make_job, make_recruiter, make_user
+
+
+def context_for(user):
+    request = APIRequestFactory().post('/')
+    request.user = user
+    return {'request': request}
+
+
+class SignupSerializerTests(JobPortalTestCase):
+    def data(self, **fields):
+        return {'name': 'Ravi', 'email': 'ravi@example.com', 'password': PASSWORD,
+                'confirm_password': PASSWORD, 'role': 'employee', **fields}
+
+    def test_creates_user_with_profile_for_role(self):
+        for role, profile in (('employee', Employee), ('recruiter', Recruiter)):
+            serializer = SignupSerializer(data=self.data(email=f'{role}@example.com', role=role))
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+            user = serializer.save()
+
+            self.assertTrue(user.check_password(PASSWORD))
+            self.assertTrue(profile.objects.filter(user=user).exists())
+
+    def test_passwords_must_match(self):
+        serializer = SignupSerializer(data=self.data(confirm_password='Secret1234'))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('do not match', str(serializer.errors['non_field_errors']))
+
+    def test_password_strength(self):
+        serializer = SignupSerializer(data=self.data(password='weakpass', confirm_password='weakpass'))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('eight characters', str(serializer.errors['non_field_errors']))
+
+    def test_email_must_be_unique(self):
+        user = make_user()
+
+        serializer = SignupSerializer(data=self.data(email=user.email))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('email', serializer.errors)
+
+
+class JobSerializerTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.original = make_job(self.recruiter)
+
+    def repost(self, **fields):
+        data = {'title': self.original.title, 'description': self.original.description, 'location': 'Delhi', **fields}
+        return JobSerializer(data=data, context=context_for(self.recruiter.user))
+
+    def test_rejects_duplicate(self):
+        serializer = self.repost()
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['duplicate_of'][0], f'This job duplicates your job {self.original.pk}.')
+
+    @override_settings(JOB_DUPLICATE_ACTION='flag')
+    def test_flags_duplicate(self):
+        serializer = self.repost()
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        job = serializer.save()
+
+        self.assertEqual(job.duplicate_of, self.original)
+        self.assertEqual(JobSerializer(job).data['duplicate_of'], self.original.pk)
+
+    @override_settings(JOB_DUPLICATE_ACTION='off')
+    def test_duplicate_check_off(self):
+        self.assertTrue(self.repost().is_valid())
+
+    def test_other_recruiters_jobs_are_not_duplicates(self):
+        serializer = JobSerializer(data={
+            'title': self.original.title, 'description': self.original.description, 'location': 'Delhi',
+        }, context=context_for(make_recruiter().user))
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_editing_a_job_is_not_a_duplicate_of_itself(self):
+        serializer = JobSerializer(self.original, data={'title': self.original.title}, partial=True,
+                                   context=context_for(self.recruiter.user))
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_negative_salary(self):
+        serializer = JobSerializer(data={'title': 'x', 'description': 'y', 'location': 'Delhi', 'salary': '-1'},
+                                   context=context_for(self.recruiter.user))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('salary', serializer.errors)
+
+    def test_fields(self):
+        self.assertEqual(set(JobSerializer(self.original, fields=['id', 'title']).data), {'id', 'title'})
+        self.assertNotIn('description', JobListSerializer(self.original).data)
+
+
+class ApplicationSerializerTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee()
+        self.job = make_job(make_recruiter())
+
+    def test_create_sets_employee(self):
+        serializer = ApplicationSerializer(data={'job': self.job.pk, 'employee': 0},
+                                           context=context_for(self.employee.user))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        application = serializer.save()
+
+        self.assertEqual(application.employee, self.employee)
+        self.assertEqual(application.status, 'submitted')
+
+    def test_job_must_be_active(self):
+        job = make_job(self.job.recruiter, is_active=False)
+
+        serializer = ApplicationSerializer(data={'job': job.pk}, context=context_for(self.employee.user))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['job'][0], 'The selected job is not active.')
+
+    def test_cover_letter_length(self):
+        serializer = ApplicationSerializer(data={'job': self.job.pk, 'cover_letter': 'x' * 1001},
+                                           context=context_for(self.employee.user))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('cover_letter', serializer.errors)
+
+
+class UploadSessionSerializerTests(JobPortalTestCase):
+    def test_cleans_filename_and_checksum(self):
+        employee = make_employee()
+        serializer = UploadSessionSerializer(data={
+            'target': 'resume', 'filename': '../../cv.pdf', 'size': 10, 'checksum': 'A' * 64,
+        }, context=context_for(employee.user))
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['filename'], 'cv.pdf')
+        self.assertEqual(serializer.validated_data['checksum'], 'a' * 64)
+
+    def test_target_must_match_profile(self):
+        recruiter = make_recruiter()
+
+        serializer = UploadSessionSerializer(data={'target': 'resume', 'filename': 'cv.pdf', 'size': 10},
+                                             context=context_for(recruiter.user))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['target'][0], 'Only employees can upload a resume.')
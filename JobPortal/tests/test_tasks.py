@@ -0,0 +1,165 @@
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.utils import timezone
+
+from JobPortal import archival, emails, metrics, tasks
+from JobPortal.models import Application, ApplicationTombstone, Job
+
+from .base import JobPortalTestCase
+from .factories import make_applications, make_employees, make_job, make_jobs, make_recruiter
+
+
+class EmailTaskTests(JobPortalTestCase):
+    def run_like_a_worker(self):
+        # Eager tasks re-raise their errors (TEST_SETTINGS); a worker records
+        # them, retrying where the task asks for it.
+        worker = self.settings(CELERY_TASK_EAGER_PROPAGATES=False)
+        worker.enable()
+        self.addCleanup(worker.disable)
+
+    def test_welcome_email(self):
+        result = tasks.send_welcome_email.delay('new@example.com', 'New', 'employee', idempotency_key='welcome:1')
+
+        self.assertTrue(result.successful())
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['new@example.com'])
+        self.assertIn('New', message.body)
+        self.assertEqual(message.alternatives[0][1], 'text/html')
+
+    def test_redelivery_is_skipped(self):
+        for _ in range(2):
+            tasks.send_application_notification.delay('r@example.com', 'Engineer', 'Asha',
+                                                      idempotency_key='application-created:1')
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'New Application for Engineer')
+
+    def test_failed_send_is_retried(self):
+        self.run_like_a_worker()
+        metrics.reset()
+        send = mail.EmailMultiAlternatives.send
+        failures = [OSError('SMTP down')]
+
+        def flaky(message, *args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return send(message, *args, **kwargs)
+
+        with mock.patch.object(mail.EmailMultiAlternatives, 'send', flaky), \
+                self.assertLogs('JobPortal.tasks', 'ERROR'):
+            tasks.send_application_notification.delay('r@example.com', 'Engineer', 'Asha',
+                                                      idempotency_key='application-created:1')
+
+        self.assertEqual(len(mail.outbox), 1)
+        counters = metrics.snapshot()['counters']
+        self.assertEqual(counters['tasks.send_application_notification.retry'], 1)
+        self.assertEqual(counters['tasks.send_application_notification.success'], 1)
+
+    def test_send_fails_after_the_last_retry(self):
+        self.run_like_a_worker()
+        metrics.reset()
+        with mock.patch.object(mail.EmailMultiAlternatives, 'send', side_effect=OSError('SMTP down')), \
+                self.assertLogs('JobPortal.tasks', 'ERROR') as logs:
+            result = tasks.send_application_notification.delay('r@example.com', 'Engineer', 'Asha')
+
+        self.assertTrue(result.failed())
+        self.assertEqual(len(logs.records), tasks.EMAIL_TASK_OPTIONS['max_retries'] + 1)
+        self.assertEqual(metrics.snapshot()['counters']['tasks.send_application_notification.failure'], 1)
+
+    def test_notifications_are_fire_and_forget_and_measured(self):
+        metrics.reset()
+
+        tasks.send_application_status_update_notification.delay('e@example.com', 'offered', 'Engineer')
+
+        self.assertTrue(tasks.send_application_status_update_notification.ignore_result)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['counters']['tasks.send_application_status_update_notification.success'], 1)
+        self.assertEqual(snapshot['timings']['tasks.send_application_status_update_notification.duration']['count'], 1)
+
+    def test_status_update(self):
+        tasks.send_application_status_update_notification.delay('e@example.com', 'offered', 'Engineer')
+
+        self.assertEqual(mail.outbox[0].to, ['e@example.com'])
+        self.assertIn('offered', mail.outbox[0].body)
+
+
+class DigestTaskTests(JobPortalTestCase):
+    def test_one_digest_per_recruiter(self):
+        recruiters = [make_recruiter(notification_mode='digest') for _ in range(2)]
+        employees = make_employees(3)
+        make_applications(employees, make_jobs(recruiters[0], 2), digest_pending=True)
+        make_applications(employees[:1], make_jobs(recruiters[1], 1), digest_pending=True)
+        # Already sent in an earlier digest.
+        make_applications(employees, make_jobs(recruiters[1], 1))
+
+        with mock.patch.object(emails, 'render_batch', wraps=emails.render_batch) as render_batch:
+            result = tasks.send_recruiter_digests.delay().get()
+
+        self.assertEqual(result, {'sent': 2, 'failed': 0})
+        # Every digest is rendered in one pass.
+        render_batch.assert_called_once()
+        subjects = {message.to[0]: message.subject for message in mail.outbox}
+        self.assertEqual(subjects, {
+            recruiters[0].user.email: '6 new applications on your job postings',
+            recruiters[1].user.email: '1 new application on your job postings',
+        })
+        bodies = {message.to[0]: message.body for message in mail.outbox}
+        self.assertIn(employees[1].user.email, bodies[recruiters[0].user.email])
+        self.assertNotIn(employees[1].user.email, bodies[recruiters[1].user.email])
+        self.assertFalse(Application.objects.filter(digest_pending=True).exists())
+
+    def test_nothing_pending(self):
+        self.assertEqual(tasks.send_recruiter_digests.delay().get(), {'sent': 0, 'failed': 0})
+        self.assertEqual(mail.outbox, [])
+
+
+class MaintenanceTaskTests(JobPortalTestCase):
+    def test_deactivate_expired_jobs(self):
+        recruiter = make_recruiter()
+        expired = make_jobs(recruiter, 2, application_deadline=timezone.now() - timedelta(days=1))
+        open_job, = make_jobs(recruiter, 1, application_deadline=timezone.now() + timedelta(days=1))
+
+        result = tasks.deactivate_expired_jobs.delay().get()
+
+        self.assertEqual(result['deactivated'], 2)
+        self.assertEqual(set(Job.objects.filter(is_active=False).values_list('pk', flat=True)),
+                         {job.pk for job in expired})
+        self.assertTrue(Job.objects.get(pk=open_job.pk).is_active)
+
+    def test_archive_closed_jobs_bounds_batches_by_applications(self):
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir, ignore_errors=True)
+        recruiter = make_recruiter()
+        employees = make_employees(2)
+        closed = make_jobs(recruiter, 3, is_active=False, application_deadline=timezone.now() - timedelta(days=365))
+        for job, applicants in zip(closed, (employees, employees, employees[:1])):
+            make_applications(applicants, [job])
+        open_job = make_job(recruiter)
+        make_applications(employees, [open_job])
+
+        result = archival.archive_closed_jobs(max_applications=3, pause=0, archive_dir=archive_dir)
+
+        self.assertEqual((result['jobs'], result['applications'], result['batches']), (3, 5, 2))
+        self.assertEqual(list(Job.objects.values_list('pk', flat=True)), [open_job.pk])
+        self.assertEqual(Application.objects.count(), 2)
+        self.assertEqual(ApplicationTombstone.objects.count(), 5)
+        with gzip.open(f'{archive_dir}/jobs-{closed[1].pk}-{closed[2].pk}.jsonl.gz') as archive:
+            lines = [json.loads(line) for line in archive]
+        self.assertEqual([len(line['applications']) for line in lines], [2, 1])
+
+    def test_prune_application_tombstones(self):
+        old, recent = ApplicationTombstone.objects.bulk_create([
+            ApplicationTombstone(application_id=1, employee_id=1),
+            ApplicationTombstone(application_id=2, employee_id=1),
+        ])
+        ApplicationTombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=365))
+
+        self.assertEqual(tasks.prune_application_tombstones.delay().get(), 1)
+        self.assertEqual(list(ApplicationTombstone.objects.values_list('pk', flat=True)), [recent.pk])
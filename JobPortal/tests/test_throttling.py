@@ -0,0 +1,86 @@
+import functools
+import threading
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+
+from JobHunt import celery_app
+from JobPortal import throttling
+from JobPortal.throttling import queue_depth, track_query_latency
+
+from .base import JobPortalTestCase
+
+
+class QueryLatencyTests(JobPortalTestCase):
+    def test_wrapper_installed_once_per_connection(self):
+        from JobPortal.signals import time_queries
+
+        for _ in range(3):
+            time_queries(sender=None, connection=connection)
+
+        self.assertEqual(connection.execute_wrappers.count(track_query_latency), 1)
+
+
+@override_settings(THROTTLE_RATES={'auth': {'default': '2/m'}})
+class ClientAddressTests(JobPortalTestCase):
+    def login(self, **headers):
+        data = {'email': 'nobody@example.com', 'password': 'x'}
+        return self.client.post('/auth/?action=login', data, format='json', **headers).status_code
+
+    def test_forwarded_for_does_not_reset_the_bucket(self):
+        statuses = [self.login(HTTP_X_FORWARDED_FOR=f'10.0.0.{i}') for i in range(3)]
+
+        self.assertEqual(statuses, [401, 401, 429])
+
+    def test_clients_have_their_own_buckets(self):
+        statuses = [self.login(REMOTE_ADDR='10.0.0.1') for _ in range(3)]
+
+        self.assertEqual(statuses, [401, 401, 429])
+        self.assertEqual(self.login(REMOTE_ADDR='10.0.0.2'), 401)
+
+
+class QueueDepthTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        throttling._queue_depths.clear()
+
+    def wait_for_probes(self):
+        for thread in threading.enumerate():
+            if thread.name.startswith('queue-depth-'):
+                thread.join(5)
+
+    def test_unreachable_broker(self):
+        connect = celery_app.connection_for_read
+        unreachable = functools.partial(connect, 'redis://127.0.0.1:1/0')
+        with mock.patch.object(celery_app, 'connection_for_read', unreachable):
+            start = time.monotonic()
+            self.assertEqual(queue_depth('notifications'), 0)
+            self.assertLess(time.monotonic() - start, 0.1)
+            self.wait_for_probes()
+
+        depth, checked = throttling._queue_depths['notifications']
+        self.assertEqual(depth, 0)
+        self.assertGreaterEqual(checked, start)
+
+    def test_requests_do_not_wait_for_a_stalled_probe(self):
+        release = threading.Event()
+        probes = []
+
+        def stall(**kwargs):
+            probes.append(kwargs)
+            release.wait(5)
+            raise OSError('timed out')
+
+        with mock.patch.object(celery_app, 'connection_for_read', stall):
+            start = time.monotonic()
+            for _ in range(5):
+                queue_depth('notifications')
+            elapsed = time.monotonic() - start
+            release.set()
+            self.wait_for_probes()
+
+        self.assertLess(elapsed, 0.1)
+        self.assertEqual(len(probes), 1)
+        self.assertEqual(probes[0]['transport_options'], {'max_retries': 0})
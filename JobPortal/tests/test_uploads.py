@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from JobPortal import uploads
+from JobPortal.models import UploadSession
+
+from .base import JobPortalTestCase
+from .factories import make_employee
+
+
+class UploadTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        staging = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, staging, ignore_errors=True)
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings = override_settings(CHUNKED_UPLOAD_DIR=staging, MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = make_employee().user
+        self.session = UploadSession.objects.create(user=self.user, target='resume', filename='cv.txt', size=6)
+
+    def test_lost_staging_file_rewinds_the_session(self):
+        uploads.append_chunk(self.session.pk, self.user, 0, b'abc')
+        uploads.staging_path(self.session).unlink()
+
+        with self.assertRaisesMessage(uploads.OffsetMismatch, 'resume from offset 0'), \
+                self.assertLogs('JobPortal.uploads', 'WARNING'):
+            uploads.append_chunk(self.session.pk, self.user, 3, b'def')
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.offset, 0)
+        self.assertEqual(uploads.append_chunk(self.session.pk, self.user, 0, b'abc'), 3)
+
+    def test_finalize_checks_the_staging_file(self):
+        uploads.append_chunk(self.session.pk, self.user, 0, b'abc')
+        uploads.append_chunk(self.session.pk, self.user, 3, b'def')
+        with open(uploads.staging_path(self.session), 'r+b') as staging:
+            staging.truncate(4)
+
+        with self.assertRaises(uploads.OffsetMismatch), self.assertLogs('JobPortal.uploads', 'WARNING'):
+            uploads.finalize(self.session.pk, self.user)
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.offset, 4)
+
+    def test_finalize(self):
+        uploads.append_chunk(self.session.pk, self.user, 0, b'abcdef')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = uploads.finalize(self.session.pk, self.user)
+
+        self.assertEqual(profile.resume.read(), b'abcdef')
+        self.assertFalse(uploads.staging_path(self.session).exists())
+
+    def test_cleanup_removes_only_idle_sessions(self):
+        uploads.append_chunk(self.session.pk, self.user, 0, b'abc')
+        idle = UploadSession.objects.create(user=self.user, target='resume', filename='old.txt', size=6)
+        uploads.append_chunk(idle.pk, self.user, 0, b'abc')
+        UploadSession.objects.filter(pk=idle.pk).update(updated_at=timezone.now() - timedelta(days=2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = uploads.cleanup_abandoned_sessions()
+
+        self.assertEqual(result['sessions'], 1)
+        self.assertEqual(list(UploadSession.objects.values_list('pk', flat=True)), [self.session.pk])
+        self.assertTrue(uploads.staging_path(self.session).exists())
+        self.assertFalse(uploads.staging_path(idle).exists())
@@ -0,0 +1,337 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from JobPortal.models import Application, ApplicationTombstone, Job, Recruiter, User
+from JobPortal.utils import get_tokens_for_user
+
+from .base import JobPortalTestCase
+from .factories import (
+    PASSWORD, make_application, make_applications, make_employee, make_employees, make_job, make_jobs,
+    make_recruiter, make_user,
+)
+
+
+def streamed_json(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+class AuthViewTests(JobPortalTestCase):
+    def signup(self, **data):
+        payload = {'name': 'Asha', 'email': 'asha@example.com', 'password': PASSWORD,
+                   'confirm_password': PASSWORD, 'role': 'employee', **data}
+        return self.client.post('/auth/?action=register', payload, format='json')
+
+    def test_register_creates_profile_and_sends_welcome_email(self):
+        response = self.signup(role='recruiter')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data['token']), {'access', 'refresh'})
+        user = User.objects.get(email='asha@example.com')
+        self.assertTrue(Recruiter.objects.filter(user=user).exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['asha@example.com'])
+        self.assertEqual(mail.outbox[0].subject, 'Welcome to Our Platform')
+
+    def test_register_rejects_invalid_data(self):
+        response = self.signup(confirm_password='Other1234')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_login(self):
+        user = make_user()
+
+        response = self.client.post('/auth/?action=login', {'email': user.email, 'password': PASSWORD}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user_data']['email'], user.email)
+
+        response = self.client.post('/auth/?action=login', {'email': user.email, 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_tokens(self):
+        user = make_user('recruiter')
+        tokens = self.client.post('/auth/?action=login', {'email': user.email, 'password': PASSWORD},
+                                  format='json').data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+
+        response = self.client.post('/auth/?action=logout', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/jobs/').status_code, 401)
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_unknown_action(self):
+        self.assertEqual(self.client.post('/auth/?action=nope').status_code, 400)
+
+    @override_settings(THROTTLE_RATES={'auth': {'default': '2/m'}})
+    def test_login_is_throttled(self):
+        data = {'email': 'nobody@example.com', 'password': 'x'}
+        statuses = [self.client.post('/auth/?action=login', data, format='json').status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [401, 401, 429])
+
+
+class JobViewTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.jobs = make_jobs(self.recruiter, 3)
+        self.other_job = make_job(make_recruiter())
+
+    def test_recruiter_lists_own_jobs(self):
+        self.authenticate(self.recruiter.user)
+
+        response = self.client.get('/jobs/')
+        body = streamed_json(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['message'], 'Job List retrieved successfully.')
+        self.assertEqual({row['id'] for row in body['data']}, {job.pk for job in self.jobs})
+        # The compact list card.
+        self.assertEqual(set(body['data'][0]), {'id', 'title', 'location', 'salary'})
+
+    def test_superadmin_lists_all_jobs(self):
+        self.authenticate(make_user('superadmin'))
+
+        body = streamed_json(self.client.get('/jobs/'))
+
+        self.assertEqual(len(body['data']), 4)
+
+    def test_employee_sees_no_jobs(self):
+        self.authenticate(make_user('employee'))
+
+        self.assertEqual(streamed_json(self.client.get('/jobs/'))['data'], [])
+        self.assertEqual(self.client.get(f'/jobs/{self.jobs[0].pk}/').status_code, 404)
+
+    async def test_streams_asynchronously_under_asgi(self):
+        token = await sync_to_async(get_tokens_for_user)(self.recruiter.user)
+
+        response = await self.async_client.get('/jobs/', headers={'Authorization': f'Bearer {token["access"]}'})
+
+        self.assertTrue(response.is_async)
+        body = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual({row['id'] for row in body['data']}, {job.pk for job in self.jobs})
+
+    def test_sparse_fieldsets(self):
+        self.authenticate(self.recruiter.user)
+
+        body = streamed_json(self.client.get('/jobs/?fields=id,description'))
+        self.assertEqual(set(body['data'][0]), {'id', 'description'})
+
+        response = self.client.get(f'/jobs/{self.jobs[0].pk}/?omit=description')
+        self.assertNotIn('description', response.data['data'])
+
+        self.assertEqual(self.client.get('/jobs/?fields=id&omit=title').status_code, 400)
+        self.assertEqual(self.client.get('/jobs/?fields=nope').status_code, 400)
+
+    def test_create(self):
+        self.authenticate(self.recruiter.user)
+
+        response = self.client.post('/jobs/', {
+            'title': 'Backend developer', 'description': 'Django and PostgreSQL.', 'location': 'Pune',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(job.recruiter, self.recruiter)
+        self.assertIsNotNone(job.simhash)
+
+    def test_create_rejects_duplicate(self):
+        self.authenticate(self.recruiter.user)
+        original = self.jobs[0]
+
+        response = self.client.post('/jobs/', {
+            'title': original.title, 'description': original.description, 'location': 'Delhi',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(original.pk), str(response.data['duplicate_of']))
+
+    def test_employee_cannot_create(self):
+        self.authenticate(make_user('employee'))
+
+        response = self.client.post('/jobs/', {'title': 'x', 'description': 'y', 'location': 'Delhi'}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_recruiter_updates_and_deletes_own_job_only(self):
+        self.authenticate(self.recruiter.user)
+        job = self.jobs[0]
+
+        response = self.client.patch(f'/jobs/{job.pk}/', {'salary': '50000.00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['salary'], '50000.00')
+        self.assertEqual(self.client.patch(f'/jobs/{self.other_job.pk}/', {'salary': '1.00'},
+                                           format='json').status_code, 404)
+
+        self.assertEqual(self.client.delete(f'/jobs/{job.pk}/').status_code, 204)
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+
+    def test_deleting_a_job_tombstones_its_applications_in_one_insert(self):
+        job = self.jobs[0]
+        applications = make_applications(make_employees(3), [job])
+        self.authenticate(self.recruiter.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.delete(f'/jobs/{job.pk}/').status_code, 204)
+
+        self.assertEqual(set(ApplicationTombstone.objects.values_list('application_id', flat=True)),
+                         {application.pk for application in applications})
+        inserts = [query for query in queries if query['sql'].startswith('INSERT')
+                   and ApplicationTombstone._meta.db_table in query['sql']]
+        self.assertEqual(len(inserts), 1)
+
+    def test_subadmin_moderates_but_cannot_post(self):
+        self.authenticate(make_user('subadmin'))
+
+        response = self.client.patch(f'/jobs/{self.other_job.pk}/', {'title': 'Moderated'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/jobs/', {'title': 'x', 'description': 'y', 'location': 'Delhi'}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_facets(self):
+        make_job(self.recruiter, location='Mumbai', salary=30000)
+        self.authenticate(self.recruiter.user)
+
+        response = self.client.get('/jobs/facets/?location=Mumbai')
+
+        self.assertEqual(response.status_code, 200)
+        facets = response.data['data']
+        self.assertEqual(facets['total'], 1)
+        self.assertEqual(facets['facets']['salary'], [{'value': '25000-50000', 'count': 1}])
+
+    def test_anonymous_is_rejected(self):
+        self.assertEqual(self.client.get('/jobs/').status_code, 401)
+
+
+class ApplicationViewTests(JobPortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.employee = make_employee()
+
+    def apply(self, job):
+        return self.client.post('/applications/', {'job': job.pk, 'cover_letter': 'Hello'}, format='json')
+
+    def test_employee_applies_and_recruiter_is_notified(self):
+        self.authenticate(self.employee.user)
+
+        response = self.apply(self.job)
+
+        self.assertEqual(response.status_code, 201)
+        application = Application.objects.get(pk=response.data['data']['id'])
+        self.assertEqual(application.employee, self.employee)
+        self.assertFalse(application.digest_pending)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.recruiter.user.email])
+        self.assertEqual(mail.outbox[0].subject, f'New Application for {self.job.title}')
+
+    def test_digest_recruiter_is_not_emailed(self):
+        recruiter = make_recruiter(notification_mode='digest')
+        self.authenticate(self.employee.user)
+
+        response = self.apply(make_job(recruiter))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Application.objects.get(pk=response.data['data']['id']).digest_pending)
+        self.assertEqual(mail.outbox, [])
+
+    def test_inactive_job(self):
+        self.authenticate(self.employee.user)
+
+        response = self.apply(make_job(self.recruiter, is_active=False))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('job', response.data)
+
+    def test_only_employees_apply(self):
+        self.authenticate(self.recruiter.user)
+
+        self.assertEqual(self.apply(self.job).status_code, 403)
+
+    def test_lists_are_scoped(self):
+        mine = make_application(self.employee, self.job)
+        make_application(make_employee(), make_job(make_recruiter()))
+
+        for user, expected in ((self.employee.user, {mine.pk}), (self.recruiter.user, {mine.pk})):
+            self.authenticate(user)
+            body = streamed_json(self.client.get('/applications/'))
+            self.assertEqual({row['id'] for row in body['data']}, expected)
+            self.assertNotIn('cover_letter', body['data'][0])
+
+        self.authenticate(make_user('superadmin'))
+        self.assertEqual(len(streamed_json(self.client.get('/applications/'))['data']), 2)
+
+    def test_recruiter_updates_status_and_employee_is_notified(self):
+        application = make_application(self.employee, self.job)
+        self.authenticate(self.recruiter.user)
+
+        response = self.client.patch(f'/applications/{application.pk}/', {'status': 'interview'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        application.refresh_from_db()
+        self.assertEqual(application.status, 'interview')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.employee.user.email])
+
+    def test_recruiter_can_only_change_status(self):
+        application = make_application(self.employee, self.job)
+        self.authenticate(self.recruiter.user)
+
+        response = self.client.patch(f'/applications/{application.pk}/', {'cover_letter': 'x'}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_employee_edits_own_application(self):
+        application = make_application(self.employee, self.job)
+        self.authenticate(self.employee.user)
+
+        response = self.client.patch(f'/applications/{application.pk}/', {'cover_letter': 'Updated'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['cover_letter'], 'Updated')
+        self.assertEqual(mail.outbox, [])
+
+    def test_other_employee_cannot_see_application(self):
+        application = make_application(self.employee, self.job)
+        self.authenticate(make_employee().user)
+
+        self.assertEqual(self.client.get(f'/applications/{application.pk}/').status_code, 404)
+
+    def test_superadmin_deletes_and_subadmin_cannot(self):
+        application = make_application(self.employee, self.job)
+
+        self.authenticate(make_user('subadmin'))
+        self.assertEqual(self.client.delete(f'/applications/{application.pk}/').status_code, 403)
+
+        self.authenticate(make_user('superadmin'))
+        self.assertEqual(self.client.delete(f'/applications/{application.pk}/').status_code, 204)
+        self.assertTrue(ApplicationTombstone.objects.filter(application_id=application.pk).exists())
+
+    @override_settings(APPLICATION_SYNC_SETTLE_SECONDS=0)
+    def test_sync(self):
+        first, second = (make_application(self.employee, job) for job in make_jobs(self.recruiter, 2))
+        self.authenticate(self.employee.user)
+
+        data = self.client.get('/applications/sync/').data['data']
+        self.assertEqual([row['id'] for row in data['changed']], [first.pk, second.pk])
+        self.assertFalse(data['has_more'])
+
+        deleted_pk = first.pk
+        first.delete()
+        data = self.client.get('/applications/sync/', {'token': data['token']}).data['data']
+        self.assertEqual(data['changed'], [])
+        self.assertEqual(data['deleted'], [deleted_pk])
+
+    def test_sync_is_for_employees(self):
+        self.authenticate(self.recruiter.user)
+
+        self.assertEqual(self.client.get('/applications/sync/').status_code, 403)
+
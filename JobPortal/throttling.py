@@ -0,0 +1,242 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+KEY_PREFIX = 'throttle:'
+
+# GCRA step on Redis, atomic: the stored value is the bucket's theoretical
+# arrival time. Returns the seconds to wait, '0' when the request may pass.
+_REDIS_SCRIPT = """
+local now, interval, limit = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local new_tat = tat + interval
+local wait = new_tat - now - limit
+if wait > 0 then return tostring(wait) end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return '0'
+"""
+
+
+def parse_rate(rate):
+    """``'30/m'`` -> ``(30, 60)``: bucket capacity and the seconds it takes to refill."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def _gcra(tat, now, interval, limit):
+    """One token-bucket step as GCRA: ``(new tat or None, seconds to wait)``."""
+    new_tat = max(tat, now) + interval
+    wait = new_tat - now - limit
+    if wait > 0:
+        return None, wait
+    return new_tat, 0.0
+
+
+class MemoryBucketStore:
+    """Buckets in this process only: no I/O, but every worker has its own."""
+
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self._tats = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, interval, limit):
+        now = time.time()
+        with self._lock:
+            new_tat, wait = _gcra(self._tats.get(key, 0.0), now, interval, limit)
+            if new_tat is not None:
+                if len(self._tats) >= self.MAX_KEYS:
+                    # A bucket whose tat has passed is full again; forget it.
+                    self._tats = {k: tat for k, tat in self._tats.items() if tat > now}
+                self._tats[key] = new_tat
+        return wait
+
+
+class CacheBucketStore:
+    """
+    Buckets in the default cache, shared by every worker process. On Redis
+    each step is one atomic script call; other backends do a get and a set,
+    which lets a few extra requests through under races.
+    """
+
+    def __init__(self):
+        self._script = None
+
+    def _redis_script(self):
+        if self._script is None:
+            from django.core.cache import caches
+            from django.core.cache.backends.redis import RedisCache
+
+            backend = caches['default']
+            self._script = False
+            if isinstance(backend, RedisCache):
+                self._script = backend._cache.get_client(write=True).register_script(_REDIS_SCRIPT)
+        return self._script or None
+
+    def take(self, key, interval, limit):
+        now = time.time()
+        key = KEY_PREFIX + key
+        script = self._redis_script()
+        if script is not None:
+            return float(script(keys=[cache.make_and_validate_key(key)], args=[now, interval, limit]))
+        new_tat, wait = _gcra(cache.get(key, 0.0), now, interval, limit)
+        if new_tat is not None:
+            cache.set(key, new_tat, math.ceil(new_tat - now))
+        return wait
+
+
+_stores = {'memory': MemoryBucketStore(), 'cache': CacheBucketStore()}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket per scope and user (client address when anonymous), with
+    the rate picked by the user's role from THROTTLE_RATES[scope] (``None``
+    means unlimited). A rate of ``'30/m'`` allows a burst of 30 and refills
+    one token every two seconds.
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.wait_seconds = None
+
+    def allow_request(self, request, view):
+        user = request.user
+        role = getattr(user, 'role', None) if user and user.is_authenticated else 'anonymous'
+        rates = settings.THROTTLE_RATES.get(self.scope, {})
+        rate = rates.get(role, rates.get('default'))
+        if rate is None:
+            return True
+        capacity, period = parse_rate(rate)
+        interval = period / capacity
+        ident = f'user:{user.pk}' if user and user.is_authenticated else f'ip:{self.get_ident(request)}'
+        wait = _stores[settings.THROTTLE_BACKEND].take(f'{self.scope}:{ident}', interval, interval * capacity)
+        if wait > 0:
+            self.wait_seconds = wait
+            metrics.incr(f'throttle.rejected.{self.scope}')
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class QueryLatency:
+    """
+    Moving average of this process' database query time, fed by
+    track_query_latency. Samples older than ADMISSION_SAMPLE_TTL no longer
+    count, so a quiet process reads as healthy.
+    """
+
+    ALPHA = 0.05
+
+    def __init__(self):
+        self.average = 0.0
+        self.updated = 0.0
+
+    def observe(self, seconds):
+        self.average += self.ALPHA * (seconds - self.average)
+        self.updated = time.monotonic()
+
+    def current(self):
+        if time.monotonic() - self.updated > settings.ADMISSION_SAMPLE_TTL:
+            return 0.0
+        return self.average
+
+
+query_latency = QueryLatency()
+
+
+def track_query_latency(execute, sql, params, many, context):
+    """Connection execute wrapper timing every query into query_latency."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        query_latency.observe(time.perf_counter() - start)
+
+
+_queue_depths = {}
+_probing = set()
+_probing_lock = threading.Lock()
+
+
+def _probe_queue(queue):
+    from JobHunt import celery_app
+
+    try:
+        with celery_app.connection_for_read(connect_timeout=settings.ADMISSION_PROBE_TIMEOUT,
+                                            transport_options={'max_retries': 0}) as connection:
+            depth = connection.default_channel.queue_declare(queue, passive=True).message_count
+    except Exception:
+        # An unreachable broker is the task layer's problem; don't shed on it.
+        depth = 0
+    # Stamped after the probe: a slow one must not leave the value stale on arrival.
+    _queue_depths[queue] = (depth, time.monotonic())
+    with _probing_lock:
+        _probing.discard(queue)
+
+
+def queue_depth(queue):
+    """
+    Messages waiting in a Celery queue, as last read from the broker.
+
+    Requests never wait on the broker: once the value is older than
+    ADMISSION_CHECK_SECONDS one background thread per queue re-reads it,
+    and requests keep using the previous value in the meantime.
+    """
+    depth, checked = _queue_depths.get(queue, (0, -math.inf))
+    if time.monotonic() - checked >= settings.ADMISSION_CHECK_SECONDS:
+        with _probing_lock:
+            start = queue not in _probing
+            _probing.add(queue)
+        if start:
+            threading.Thread(target=_probe_queue, args=(queue,), name=f'queue-depth-{queue}', daemon=True).start()
+    return depth
+
+
+def admission_check(scope):
+    """Seconds a write in ``scope`` should back off for, or None to admit it."""
+    if query_latency.current() * 1000 > settings.ADMISSION_DB_LATENCY_MS:
+        metrics.incr('admission.shed.db_latency')
+        return settings.ADMISSION_RETRY_AFTER
+    for queue, limit in settings.ADMISSION_QUEUE_LIMITS.get(scope, {}).items():
+        if queue_depth(queue) > limit:
+            metrics.incr(f'admission.shed.queue.{queue}')
+            return settings.ADMISSION_RETRY_AFTER
+    return None
+
+
+class WriteThrottleMixin:
+    """
+    View mixin throttling the actions listed in ``throttle_scopes``
+    (action -> THROTTLE_RATES scope). Admission control runs first and
+    sheds the request without spending a token; both answer 429 with
+    Retry-After.
+    """
+
+    throttle_scopes = {}
+
+    def get_throttle_scope(self, request):
+        return self.throttle_scopes.get(getattr(self, 'action', None))
+
+    def check_throttles(self, request):
+        scope = self.get_throttle_scope(request)
+        if scope is None:
+            return
+        retry_after = admission_check(scope)
+        if retry_after is not None:
+            raise Throttled(wait=retry_after, detail='Server is busy, please retry later.')
+        throttle = TokenBucketThrottle(scope)
+        if not throttle.allow_request(request, self):
+            self.throttled(request, throttle.wait())
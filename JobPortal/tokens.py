@@ -1,9 +1,45 @@
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
-def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+from .denylist import is_token_revoked, revoke_token
 
-    return {
-        'refresh': str(refresh),
-        'access': str(refresh.access_token),
-    }
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh that rotates: every refresh token is single-use and the response
+    carries a new one. The old jti goes on the denylist (JobPortal.denylist)
+    instead of simplejwt's token_blacklist tables, so a refresh costs one
+    cache write and no database lookup.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if not revoke_token(refresh):
+            raise InvalidToken('Token has already been used or revoked.')
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        data = {'access': str(refresh.access_token)}
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+        data['refresh'] = str(refresh)
+        return data
+
+
+class DenylistJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that also rejects access tokens revoked at logout."""
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_token_revoked(token):
+            raise InvalidToken('Token has been revoked.')
+        return token
@@ -0,0 +1,209 @@
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from . import metrics
+from .models import UploadSession
+
+logger = logging.getLogger(__name__)
+
+
+class OffsetMismatch(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Upload-Offset does not match the current upload offset.'
+    default_code = 'offset_mismatch'
+
+
+class ChecksumMismatch(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = 'Checksum does not match the uploaded data.'
+    default_code = 'checksum_mismatch'
+
+
+def staging_path(session):
+    return Path(settings.CHUNKED_UPLOAD_DIR) / f'{session.pk}.part'
+
+
+def _stored_size(path):
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _rewind_if_lost(session, path):
+    """
+    Rewind ``session`` to the bytes its staging file really holds and return
+    True if the file is shorter than the offset: it was lost or cut short
+    (a cleanup race, a lost disk, a replaced container). Without this the
+    next write would land past the end and the gap read back as zeros.
+    """
+    stored = _stored_size(path)
+    if stored >= session.offset:
+        return False
+    logger.warning('Upload %s lost staging data: %s of %s bytes left', session.pk, stored, session.offset)
+    session.offset = stored
+    session.save(update_fields=['offset', 'updated_at'])
+    return True
+
+
+def parse_checksum(header):
+    """
+    Parse a tus-style ``Upload-Checksum: sha256 <base64 digest>`` header into
+    the raw digest (None when the header is absent).
+    """
+    if not header:
+        return None
+    algorithm, _, encoded = header.partition(' ')
+    if algorithm.lower() != 'sha256':
+        raise ValidationError({'Upload-Checksum': 'Only sha256 is supported.'})
+    try:
+        return base64.b64decode(encoded.strip(), validate=True)
+    except (binascii.Error, ValueError):
+        raise ValidationError({'Upload-Checksum': 'Digest must be base64 encoded.'})
+
+
+def _write_chunk(session, path, offset, data):
+    # Called with the session row locked.
+    if offset != session.offset:
+        raise OffsetMismatch(f'Expected offset {session.offset}, got {offset}.')
+    if session.offset + len(data) > session.size:
+        raise ValidationError({'detail': 'Chunk goes past the declared upload size.'})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'r+b' if path.exists() else 'wb') as staging:
+        staging.seek(offset)
+        staging.write(data)
+        staging.truncate()
+        staging.flush()
+        os.fsync(staging.fileno())
+
+    session.offset += len(data)
+    session.save(update_fields=['offset', 'updated_at'])
+
+
+def append_chunk(session_id, user, offset, data, digest=None):
+    """
+    Write ``data`` at ``offset`` of the session's staging file and return the
+    new offset.
+
+    The session row is locked for the write, so concurrent or retried chunks
+    are serialized and a chunk is only accepted at the current offset. The
+    file is truncated after every write: if a write landed but the offset
+    update did not commit, the retried chunk simply overwrites it. A staging
+    file shorter than the offset rewinds the session, and the chunk is
+    refused with the offset to resume from.
+    """
+    if digest is not None and hashlib.sha256(data).digest() != digest:
+        raise ChecksumMismatch()
+
+    with transaction.atomic():
+        session = get_object_or_404(UploadSession.objects.select_for_update(), pk=session_id, user=user)
+        path = staging_path(session)
+        # Committed before refusing the chunk, so the client reads the rewound offset.
+        lost = _rewind_if_lost(session, path)
+        if not lost:
+            _write_chunk(session, path, offset, data)
+    if lost:
+        raise OffsetMismatch(f'Upload data was lost; resume from offset {session.offset}.')
+    metrics.incr('uploads.chunk_bytes', len(data))
+    return session.offset
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as staging:
+        for block in iter(lambda: staging.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _attach(session, path, user):
+    # Called with the session row locked.
+    if session.offset != session.size:
+        raise OffsetMismatch(f'Upload incomplete: {session.offset} of {session.size} bytes received.')
+    if _stored_size(path) != session.size:
+        raise OffsetMismatch('Staging file does not match the declared upload size.')
+    if session.checksum and _file_sha256(path) != session.checksum.lower():
+        raise ChecksumMismatch('Checksum of the assembled file does not match.')
+
+    if session.target == 'resume':
+        profile, field_name = user.employee, 'resume'
+    else:
+        profile, field_name = user.recruiter, 'logo'
+    with open(path, 'rb') as staging:
+        getattr(profile, field_name).save(session.filename, File(staging), save=True)
+    session.delete()
+    transaction.on_commit(lambda: path.unlink(missing_ok=True))
+    return profile
+
+
+def finalize(session_id, user):
+    """
+    Attach the completed upload to the user's profile and end the session.
+
+    Runs in one transaction with the session locked: the file is copied into
+    storage, the profile row updated and the session deleted together. The
+    staging file is removed only after the commit. A staging file that no
+    longer holds every byte rewinds the session, as in append_chunk.
+    """
+    with transaction.atomic():
+        session = get_object_or_404(UploadSession.objects.select_for_update(), pk=session_id, user=user)
+        path = staging_path(session)
+        lost = _rewind_if_lost(session, path)
+        if not lost:
+            profile = _attach(session, path, user)
+    if lost:
+        raise OffsetMismatch(f'Upload data was lost; resume from offset {session.offset}.')
+    metrics.incr('uploads.finalized')
+    return profile
+
+
+def cleanup_abandoned_sessions(max_age=None):
+    """
+    Delete upload sessions without activity for ``max_age`` and their staging
+    files, plus staging files whose session no longer exists.
+    """
+    max_age = max_age or timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY)
+    cutoff = timezone.now() - max_age
+    removed = 0
+    stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+    for pk in list(stale.values_list('pk', flat=True)):
+        # One locked row at a time, re-checked: a session resumed since the
+        # scan keeps its row and its file. The file goes once the delete commits.
+        with transaction.atomic():
+            session = stale.select_for_update().filter(pk=pk).first()
+            if session is None:
+                continue
+            path = staging_path(session)
+            session.delete()
+            transaction.on_commit(lambda path=path: path.unlink(missing_ok=True))
+        removed += 1
+
+    staging_dir = Path(settings.CHUNKED_UPLOAD_DIR)
+    orphans = 0
+    if staging_dir.exists():
+        live = {str(pk) for pk in UploadSession.objects.values_list('pk', flat=True)}
+        oldest_allowed = time.time() - max_age.total_seconds()
+        for path in staging_dir.glob('*.part'):
+            if path.stem not in live and path.stat().st_mtime < oldest_allowed:
+                path.unlink(missing_ok=True)
+                orphans += 1
+
+    metrics.incr('uploads.sessions_expired', removed)
+    metrics.incr('uploads.orphan_files_removed', orphans)
+    logger.info('Removed %s abandoned upload sessions and %s orphan staging files', removed, orphans)
+    return {'sessions': removed, 'orphan_files': orphans}
@@ -6,12 +6,14 @@ from rest_framework.routers import DefaultRouter
 from JobPortal.views import (
     UserAuthAPIView,
     JobViewSet,
-    ApplicationViewSet
+    ApplicationViewSet,
+    UploadSessionViewSet,
 
 )
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet)
 router.register(r'applications', ApplicationViewSet)
+router.register(r'uploads', UploadSessionViewSet, basename='upload')
 
 
 urlpatterns = [
@@ -4,20 +4,48 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import viewsets
 from rest_framework import status
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.permissions import AllowAny
-from .models import User, Recruiter, Job, Employee, Application
-from .serializers import SignupSerializer, UserProfileSerializer, RecruiterSerializer, JobSerializer, EmployeeSerializer, ApplicationSerializer
+from rest_framework import mixins
+from rest_framework.decorators import action
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.conf import settings
+from django.db import transaction
+from .models import User, Recruiter, Job, Employee, Application, UploadSession
+from .serializers import SignupSerializer, UserProfileSerializer, RecruiterSerializer, JobSerializer, JobListSerializer, EmployeeSerializer, ApplicationSerializer, ApplicationListSerializer, UploadSessionSerializer
 from .utils import get_tokens_for_user
+from .tokens import DenylistJWTAuthentication
+from .denylist import revoke_token
 from .pagination import MyPageNumberPagination
-from  .permissions import IsRecruiterOrSuperadmin, IsEmployeeRecruiterOrSuperadmin
+from  .permissions import ALL, IsRecruiterOrSuperadmin, IsEmployeeRecruiterOrSuperadmin, grant
 from django.shortcuts import get_object_or_404
-from rest_framework.exceptions import PermissionDenied
-from .tasks import send_application_notification, send_application_status_update_notification, send_welcome_email
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from .db_routers import ReplicaReadMixin
+from .streaming import narrow_queryset, streaming_list_response
+from .fieldsets import SparseFieldsetMixin
+from .sync import changes_since
+from .push import publish_on_commit
+from .signals import application_tombstones
+from .throttling import WriteThrottleMixin
+from . import facets, geo, uploads
 
 
-class UserAuthAPIView(APIView):
+def _enqueue(task_name, *args, **kwargs):
+    """
+    Queue ``JobPortal.tasks.<task_name>``. Celery and the task module are
+    imported on the first call instead of at web startup.
+    """
+    from . import tasks
+
+    return getattr(tasks, task_name).delay(*args, **kwargs)
+
+
+class UserAuthAPIView(WriteThrottleMixin, APIView):
     permission_classes = [AllowAny]
+    throttle_scopes = {'register': 'auth', 'login': 'auth', 'logout': 'auth'}
+
+    def get_throttle_scope(self, request):
+        return self.throttle_scopes.get(request.query_params.get('action'))
 
     def post(self, request, *args, **kwargs):
         action = request.query_params.get('action')
@@ -25,6 +53,8 @@ class UserAuthAPIView(APIView):
             return self.signup(request)
         elif action == 'login':
             return self.login(request)
+        elif action == 'logout':
+            return self.logout(request)
         else:
             return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -33,7 +63,7 @@ class UserAuthAPIView(APIView):
         if serializer.is_valid():
             user = serializer.save()
             login(request, user)
-            send_welcome_email.delay(user.email, user.name, user.role)
+            _enqueue('send_welcome_email', user.email, user.name, user.role, idempotency_key=f'welcome:{user.pk}')
             token = get_tokens_for_user(user)
             
             return Response({
@@ -61,31 +91,87 @@ class UserAuthAPIView(APIView):
         
         return Response({'error': 'Invalid email or password'}, status=status.HTTP_401_UNAUTHORIZED)
 
+    def logout(self, request):
+        """Revoke the posted refresh token and the access token the request was made with."""
+        try:
+            refresh = RefreshToken(request.data.get('refresh', ''))
+        except TokenError:
+            return Response({'error': 'Invalid or expired refresh token'}, status=status.HTTP_400_BAD_REQUEST)
+        revoke_token(refresh)
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
+
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(WriteThrottleMixin, SparseFieldsetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
-    authentication_classes = [JWTAuthentication]
+    list_serializer_class = JobListSerializer
+    authentication_classes = [DenylistJWTAuthentication]
     permission_classes = [IsRecruiterOrSuperadmin]
     pagination_class = MyPageNumberPagination
+    throttle_scopes = {'create': 'job-create'}
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role == 'recruiter':
-            recruiter = Recruiter.objects.get(user=user)
-            return Job.objects.filter(recruiter=recruiter)
-        if user.is_superuser:
-            return Job.objects.all()
-        return Job.objects.none() 
+        queryset = IsRecruiterOrSuperadmin().scope_queryset(self.request, Job.objects.all())
+        if self.action in ('list', 'facets'):
+            queryset = facets.filter_jobs(queryset, self.request.query_params)
+            if self.request.query_params.get('near'):
+                queryset = self.filter_near(queryset)
+        return queryset
+
+    def filter_near(self, queryset):
+        """
+        ``?near=<lat,lon or place>&radius_km=<km>``: jobs within the radius
+        (default geo.DEFAULT_RADIUS_KM) of the point.
+        """
+        params = self.request.query_params
+        point = geo.parse_point(params['near'])
+        if point is None:
+            raise ValidationError({'near': 'Unknown location; use "lat,lon" or a known city.'})
+        try:
+            radius_km = float(params.get('radius_km', geo.DEFAULT_RADIUS_KM))
+        except ValueError:
+            radius_km = -1
+        if not 0 < radius_km <= geo.MAX_RADIUS_KM:
+            raise ValidationError({'radius_km': f'Must be a number between 0 and {geo.MAX_RADIUS_KM}.'})
+        return geo.within_radius(queryset, *point, radius_km)
     
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
+        fields = self.get_sparse_fields()
+        if request.accepted_renderer.format == 'json':
+            return streaming_list_response(
+                "Job List retrieved successfully.", queryset,
+                self.get_serializer_class(), self.get_serializer_context(), fields=fields,
+            )
+        queryset = narrow_queryset(queryset, self.get_serializer_class(), fields)
         serializer = self.get_serializer(queryset, many=True)
         return Response({
             "message": "Job List retrieved successfully.",
             "data": serializer.data
         }, status=status.HTTP_200_OK)
         
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Counts by job_type, salary bucket, location and company for the jobs
+        the list would return with the same filters.
+        """
+        user = request.user
+        # Cache partition: the jobs scope_queryset lets this user see.
+        rule = grant(user, 'job', 'read')
+        if rule is ALL:
+            scope = 'all'
+        elif rule is not None:
+            scope = f'{user.role}:{user.pk}'
+        else:
+            scope = 'none'
+        return Response({
+            "message": "Job facets retrieved successfully.",
+            "data": facets.cached_facets(self.get_queryset(), scope, request.query_params)
+        })
+
     def create(self, request, *args, **kwargs):
         user = request.user
         try:
@@ -130,6 +216,11 @@ class JobViewSet(viewsets.ModelViewSet):
             "data": serializer.data
         })
 
+    def perform_destroy(self, instance):
+        # The applications go with the job; tombstone them in one INSERT.
+        with transaction.atomic(), application_tombstones(instance.applications.values_list('id', 'employee_id')):
+            instance.delete()
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self.perform_destroy(instance)
@@ -138,33 +229,43 @@ class JobViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_204_NO_CONTENT)
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(WriteThrottleMixin, SparseFieldsetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
-    authentication_classes = [JWTAuthentication]
+    list_serializer_class = ApplicationListSerializer
+    authentication_classes = [DenylistJWTAuthentication]
     permission_classes = [IsEmployeeRecruiterOrSuperadmin]
     pagination_class = MyPageNumberPagination
+    throttle_scopes = {'create': 'application-create'}
+    # A lagging replica could let the sync cursor move past rows it has not
+    # replicated yet; the settle window only covers in-flight transactions.
+    primary_only_actions = ('sync',)
 
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role == 'employee':
-            return self.queryset.filter(employee__user=user)
-        elif user.role == 'recruiter':
-            recruiter = get_object_or_404(Recruiter, user=user)
-            return self.queryset.filter(job__recruiter=recruiter)
-        return self.queryset
+        return IsEmployeeRecruiterOrSuperadmin().scope_queryset(self.request, self.queryset.all())
 
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        application = serializer.save()
-        job = application.job
-        recruiter_email = job.recruiter.user.email
-        job_title = job.title
-        applicant_name = request.user.name  
-        send_application_notification.delay(recruiter_email, job_title, applicant_name)
+        job = serializer.validated_data['job']
+        # Digest-mode recruiters get the application in their next digest
+        # (send_recruiter_digests) instead of an email per application.
+        digest = job.recruiter.notification_mode == 'digest'
+        application = serializer.save(digest_pending=digest)
+        publish_on_commit(job.recruiter.user_id, 'application.created', {
+            'id': application.pk, 'job': job.pk, 'job_title': job.title, 'applicant_name': request.user.name,
+        })
+        if not digest:
+            recruiter_email = job.recruiter.user.email
+            job_title = job.title
+            applicant_name = request.user.name  
+            _enqueue(
+                'send_application_notification',
+                recruiter_email, job_title, applicant_name,
+                idempotency_key=f'application-created:{application.pk}',
+            )
 
         return Response({
             "message": "Application created successfully.",
@@ -173,12 +274,46 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
+        fields = self.get_sparse_fields()
+        if request.accepted_renderer.format == 'json':
+            return streaming_list_response(
+                "Applications List retrieved successfully.", queryset,
+                self.get_serializer_class(), self.get_serializer_context(), fields=fields,
+            )
+        queryset = narrow_queryset(queryset, self.get_serializer_class(), fields)
         serializer = self.get_serializer(queryset, many=True)
         return Response({
             "message": "Applications List retrieved successfully.",
             "data": serializer.data
         }, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """
+        Incremental inbox sync for employees: ``?token=<token from the last
+        call>`` (omit it for the first sync) returns the applications created
+        or changed since, the ids deleted since, and the next token. Call
+        again while ``has_more`` is true.
+        """
+        if request.user.role != 'employee':
+            raise PermissionDenied("Only employees can sync their application inbox.")
+        employee_id = Employee.objects.filter(user_id=request.user.pk).values_list('pk', flat=True).first()
+        if employee_id is None:
+            return Response({"error": "Employee profile not found."}, status=status.HTTP_400_BAD_REQUEST)
+
+        changed, deleted, token, has_more = changes_since(
+            Application.objects.filter(employee_id=employee_id), employee_id, request.query_params.get('token'),
+        )
+        return Response({
+            "message": "Applications synced successfully.",
+            "data": {
+                "changed": self.get_serializer(changed, many=True).data,
+                "deleted": deleted,
+                "token": token,
+                "has_more": has_more,
+            }
+        })
+
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -209,7 +344,10 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             employee_email = instance.employee.user.email
             job_title = instance.job.title
             application_id = instance.id 
-            send_application_status_update_notification.delay(employee_email, new_status, job_title)
+            _enqueue('send_application_status_update_notification', employee_email, new_status, job_title)
+            publish_on_commit(instance.employee.user_id, 'application.status', {
+                'id': instance.pk, 'status': instance.status, 'job_title': job_title,
+            })
 
         return Response({
             "message": "Application updated successfully.",
@@ -221,8 +359,87 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return Response({
             "message": "Application deleted successfully."
-        }, status=status.HTTP_204_NO_CONTENT) 
-    
+        }, status=status.HTTP_204_NO_CONTENT)
+
 
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    Resumable chunked uploads for resumes and logos (tus-like):
+
+    - POST   /uploads/                  start a session: target, filename, size[, checksum]
+    - GET    /uploads/<id>/             current offset (also in the Upload-Offset header)
+    - PATCH  /uploads/<id>/             raw chunk body, Upload-Offset and optional
+                                        "Upload-Checksum: sha256 <base64>" headers
+    - POST   /uploads/<id>/finalize/    attach the completed file to the profile
+    - DELETE /uploads/<id>/             abandon the upload
+    """
+    serializer_class = UploadSessionSerializer
+    authentication_classes = [DenylistJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    lookup_value_regex = '[0-9a-fA-F-]{36}'
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user_id=self.request.user.pk)
 
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        session = serializer.save()
+        response = Response({
+            "message": "Upload started successfully.",
+            "data": serializer.data
+        }, status=status.HTTP_201_CREATED)
+        response['Location'] = f"{request.path}{session.pk}/"
+        response['Upload-Offset'] = session.offset
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        response = Response({
+            "message": "Upload retrieved successfully.",
+            "data": serializer.data
+        })
+        response['Upload-Offset'] = instance.offset
+        response['Upload-Length'] = instance.size
+        return response
+
+    def partial_update(self, request, *args, **kwargs):
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset header is required."}, status=status.HTTP_400_BAD_REQUEST)
+        digest = uploads.parse_checksum(request.headers.get('Upload-Checksum'))
+
+        max_chunk = settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE
+        data = request.stream.read(max_chunk + 1) if request.stream is not None else b''
+        if len(data) > max_chunk:
+            return Response({
+                "error": f"Chunks are limited to {max_chunk} bytes."
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        new_offset = uploads.append_chunk(kwargs['pk'], request.user, offset, data, digest)
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        response['Upload-Offset'] = new_offset
+        return response
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        profile = uploads.finalize(pk, request.user)
+        field = profile.resume if hasattr(profile, 'resume') else profile.logo
+        return Response({
+            "message": "Upload completed successfully.",
+            "data": {"file": field.name}
+        })
+
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        uploads.staging_path(instance).unlink(missing_ok=True)
+        self.perform_destroy(instance)
+        return Response({
+            "message": "Upload cancelled successfully."
+        }, status=status.HTTP_204_NO_CONTENT)
 
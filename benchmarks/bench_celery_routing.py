@@ -0,0 +1,97 @@
+"""
+Ordering guarantees of the notification queues under load.
+
+Publishes a burst of bulk status updates and new-application notifications
+followed by a few welcome emails to Celery's in-memory broker, once with
+every task on one queue (the old setup) and once with the configured routes.
+Each queue is then drained by its own worker pool at a fixed SMTP send time,
+and the time until the welcome emails go out is reported. Finally the tasks
+are run eagerly twice per message to check that redelivery is idempotent.
+
+    python -m benchmarks.bench_celery_routing --bulk 2000 --welcome 20
+"""
+import argparse
+from collections import defaultdict
+
+from benchmarks.common import print_table, setup_django
+
+
+def publish(tasks, bulk, notifications, welcome, single_queue):
+    options = {'queue': 'default'} if single_queue else {}
+    for i in range(bulk):
+        tasks.send_application_status_update_notification.apply_async(
+            (f'employee{i}@bench.local', 'rejected', 'Engineer'), **options)
+    for i in range(notifications):
+        tasks.send_application_notification.apply_async(
+            ('recruiter@bench.local', 'Engineer', f'Applicant {i}'), **options)
+    for i in range(welcome):
+        tasks.send_welcome_email.apply_async(
+            (f'new{i}@bench.local', f'New {i}', 'employee'),
+            kwargs={'idempotency_key': f'welcome:{i}'}, **options)
+
+
+def drain(app, concurrency, send_ms):
+    """
+    Pop every queue in broker order and give each message the time at which a
+    pool of ``concurrency`` workers dedicated to that queue would finish it.
+    """
+    finished = defaultdict(list)
+    messages = []
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in app.amqp.queues:
+            position = 0
+            while (message := channel.basic_get(queue, no_ack=True)) is not None:
+                done_ms = (position // concurrency + 1) * send_ms
+                finished[message.headers['task'].rsplit('.', 1)[-1]].append(done_ms)
+                messages.append(message)
+                position += 1
+    return finished, messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--bulk', type=int, default=2000)
+    parser.add_argument('--notifications', type=int, default=200)
+    parser.add_argument('--welcome', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4, help='worker processes per queue')
+    parser.add_argument('--send-ms', type=float, default=50, help='simulated SMTP time per email')
+    args = parser.parse_args()
+
+    setup_django(temp_db=False, CELERY_BROKER_URL='memory://', CELERY_RESULT_BACKEND='cache+memory://')
+    from django.conf import settings
+    from django.core import mail
+
+    from JobHunt.celery_config import app
+    from JobPortal import tasks
+
+    rows = []
+    for single_queue in (True, False):
+        publish(tasks, args.bulk, args.notifications, args.welcome, single_queue)
+        finished, messages = drain(app, args.concurrency, args.send_ms)
+        for task, times in sorted(finished.items()):
+            rows.append({
+                'setup': 'single queue' if single_queue else 'routed',
+                'task': task,
+                'messages': len(times),
+                'first_done_s': min(times) / 1000,
+                'last_done_s': max(times) / 1000,
+            })
+    print_table(
+        f'Simulated completion times, {args.concurrency} workers per queue, {args.send_ms} ms per email',
+        rows,
+    )
+
+    # Redelivery: run every welcome message twice, eagerly, keeping its task id.
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    mail.outbox = []
+    publish(tasks, 0, 0, args.welcome, single_queue=False)
+    _, messages = drain(app, args.concurrency, args.send_ms)
+    for message in messages * 2:
+        args_, kwargs, _ = message.decode()
+        tasks.send_welcome_email.apply(args_, kwargs, task_id=message.headers['id'])
+    print(f'\nredelivered {len(messages)} welcome messages twice: {len(mail.outbox)} emails sent')
+
+
+if __name__ == '__main__':
+    main()
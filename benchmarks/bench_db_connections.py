@@ -0,0 +1,60 @@
+"""
+Connection-setup cost per request with and without persistent connections.
+
+Simulates the request lifecycle Django drives (request_started -> one query
+-> request_finished) with CONN_MAX_AGE=0 (reconnect every request) and with
+the configured DB_CONN_MAX_AGE. Point DB_ENGINE/DB_HOST at the production
+server to measure a real network handshake:
+
+    python -m benchmarks.bench_db_connections
+    DB_ENGINE=mysql DB_HOST=... python -m benchmarks.bench_db_connections
+"""
+import argparse
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+
+def run(requests, conn_max_age):
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+
+    from JobPortal.models import Job
+
+    connection.close()
+    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    def handle_request():
+        request_started.send(sender=None)
+        Job.objects.filter(is_active=True).exists()
+        request_finished.send(sender=None)
+
+    connection_created.connect(count)
+    try:
+        samples = timed(handle_request, requests)
+    finally:
+        connection_created.disconnect(count)
+        connection.close()
+    return dict(conn_max_age=conn_max_age, connections=len(opened), **summarize(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    rows = [run(args.requests, 0), run(args.requests, settings.DB_CONN_MAX_AGE or 60)]
+    print_table(f'{args.requests} simulated requests on {settings.DATABASES["default"]["ENGINE"]}', rows)
+    saved = rows[0]['mean_ms'] - rows[1]['mean_ms']
+    print(f'\nconnection setup removed per request: {saved:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Per-message cost of rendering notification emails.
+
+Compares parsing the template for every message (what an uncached loader
+does), render_email() per message through the cached loader, and
+render_batch() rendering all recipients in one pass with a shared context.
+
+    python -m benchmarks.bench_email_render --messages 5000
+"""
+import argparse
+import time
+
+from benchmarks.common import print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--messages', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django(temp_db=False)
+    from django.template import Context, Template
+    from django.template.loader import get_template
+
+    from JobPortal.emails import render_batch, render_email
+
+    shared = {'job_title': 'Senior Engineer <Platform>'}
+    recipients = [{'application_status': 'rejected', 'applicant': f'Applicant {i}'} for i in range(args.messages)]
+    text_source = get_template('JobPortal/emails/application_status_update.txt').template.source
+    html_source = get_template('JobPortal/emails/application_status_update.html').template.source
+
+    def uncached():
+        for recipient in recipients:
+            context = Context({**shared, **recipient})
+            Template(text_source).render(context)
+            Template(html_source).render(context)
+
+    def per_message():
+        for recipient in recipients:
+            render_email('application_status_update', {**shared, **recipient})
+
+    def batch():
+        render_batch('application_status_update', shared, recipients)
+
+    rows = []
+    for name, func in (('parse per message', uncached), ('render_email', per_message), ('render_batch', batch)):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        rows.append({'path': name, 'total_s': elapsed, 'us_per_message': elapsed / args.messages * 1e6})
+    print_table(f'{args.messages} status-update emails (text + html)', rows)
+
+    _, html = render_email('application_status_update', {**shared, 'application_status': 'rejected'})
+    print('\nautoescaped:', '&lt;Platform&gt;' in html)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Radius search over jobs: full scan vs geohash cells, box and haversine in SQL.
+
+Jobs get random coordinates around a few metro areas (plus a uniform spread
+world-wide). The full scan computes the distance of every row in Python, as
+a search over the free-text column without coordinates would have to; the
+indexed path is JobPortal.geo.within_radius. Both must return the same ids.
+
+    python -m benchmarks.bench_geo_search --jobs 100000 --radius 50
+"""
+import argparse
+import random
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+METROS = [(28.6139, 77.2090), (19.0760, 72.8777), (12.9716, 77.5946), (51.5074, -0.1278), (40.7128, -74.0060)]
+
+
+def seed(jobs, rng):
+    from JobPortal.geo import geohash
+    from JobPortal.models import Job, Recruiter, User
+
+    recruiter_user = User.objects.create_user('recruiter@bench.local', 'x', role='recruiter')
+    recruiter = Recruiter.objects.create(user=recruiter_user, company_name='Bench')
+
+    def point():
+        if rng.random() < 0.2:
+            return rng.uniform(-60, 70), rng.uniform(-180, 180)
+        lat, lon = rng.choice(METROS)
+        return lat + rng.gauss(0, 1.5), lon + rng.gauss(0, 1.5)
+
+    # bulk_create skips save(), so the coordinate columns are set directly.
+    rows = []
+    for i in range(jobs):
+        lat, lon = point()
+        rows.append(Job(title=f'Job {i}', description='-', recruiter=recruiter, location='somewhere',
+                        job_type='full_time', latitude=lat, longitude=lon, geohash=geohash(lat, lon)))
+    Job.objects.bulk_create(rows, batch_size=2000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--radius', type=float, default=50)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from JobPortal import geo
+    from JobPortal.models import Job
+
+    rng = random.Random(38)
+    seed(args.jobs, rng)
+    centers = [(lat + rng.gauss(0, 0.5), lon + rng.gauss(0, 0.5)) for lat, lon in METROS for _ in range(args.queries // len(METROS))]
+
+    def full_scan(lat, lon):
+        ids, lats, lons = zip(*Job.objects.values_list('pk', 'latitude', 'longitude'))
+        distances = geo.haversine_km(lat, lon, lats, lons)
+        return {pk for pk, distance in zip(ids, distances) if distance <= args.radius}
+
+    def indexed(lat, lon):
+        return set(geo.within_radius(Job.objects.all(), lat, lon, args.radius).values_list('pk', flat=True))
+
+    matches = [len(indexed(*center)) for center in centers]
+    assert all(full_scan(*center) == indexed(*center) for center in centers), 'result mismatch'
+
+    rows = []
+    for name, func in (('full scan', full_scan), ('geohash + box + haversine', indexed)):
+        samples = []
+        for center in centers:
+            samples += timed(lambda: func(*center), 1)
+        rows.append({'path': name, **summarize(samples)})
+    print_table(
+        f'{args.jobs} jobs, radius {args.radius:g} km, {len(centers)} queries '
+        f'(avg {sum(matches) / len(matches):.0f} matches, numpy={"yes" if geo.numpy else "no"})',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
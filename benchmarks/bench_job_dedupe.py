@@ -0,0 +1,114 @@
+"""
+Near-duplicate job detection: LSH band lookup vs scanning the recruiter's jobs.
+
+One recruiter gets --jobs postings drawn from a word list, all sharing a
+company blurb like real postings do. The full scan reads every signature of
+the recruiter and compares it in Python; the indexed path is
+JobPortal.dedupe.find_duplicate. Both must agree. A second table shows how
+many edited reposts are caught and how many fresh postings are wrongly
+matched, and the last line times ``manage.py dedupe_jobs`` over the table.
+
+    python -m benchmarks.bench_job_dedupe --jobs 20000
+"""
+import argparse
+import io
+import random
+import time
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+VOCABULARY = [f'term{i}' for i in range(5000)]
+
+
+def posting(rng, blurb):
+    return f'{blurb} ' + ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(60, 250)))
+
+
+def edit(rng, text, words):
+    tokens = text.split()
+    for _ in range(words):
+        tokens[rng.randrange(len(tokens))] = rng.choice(VOCABULARY)
+    return ' '.join(tokens)
+
+
+def seed(jobs, rng, blurb):
+    from JobPortal import dedupe
+    from JobPortal.models import Job, Recruiter, User
+
+    recruiter_user = User.objects.create_user('recruiter@bench.local', 'x', role='recruiter')
+    recruiter = Recruiter.objects.create(user=recruiter_user, company_name='Bench')
+    # bulk_create skips save(), so the signature columns are set directly.
+    rows = []
+    for i in range(jobs):
+        job = Job(title=f'Role {i % 50}', description=posting(rng, blurb), recruiter=recruiter,
+                  location='Delhi', job_type='full_time')
+        for field, value in dedupe.signature(job.title, job.description).items():
+            setattr(job, field, value)
+        rows.append(job)
+    Job.objects.bulk_create(rows, batch_size=2000)
+    return recruiter, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+
+    from JobPortal import dedupe
+    from JobPortal.models import Job
+
+    rng = random.Random(47)
+    blurb = ' '.join(rng.choice(VOCABULARY) for _ in range(60))
+    recruiter, jobs = seed(args.jobs, rng, blurb)
+
+    def full_scan(title, description):
+        simhash = dedupe.signature(title, description)['simhash']
+        for pk, other, original in Job.objects.filter(recruiter=recruiter, is_active=True).order_by(
+                'posted_date', 'pk').values_list('pk', 'simhash', 'duplicate_of'):
+            if dedupe.distance(simhash, other) <= settings.JOB_DUPLICATE_MAX_DISTANCE:
+                return original or pk
+        return None
+
+    def indexed(title, description):
+        return dedupe.find_duplicate(recruiter.pk, title, description)
+
+    cases = {
+        'exact repost': lambda job: (job.title, job.description),
+        '2-word edit': lambda job: (job.title, edit(rng, job.description, 2)),
+        'new posting': lambda job: ('Role 0', posting(rng, blurb)),
+    }
+    rows = []
+    for case, make in cases.items():
+        queries = [make(rng.choice(jobs)) for _ in range(args.queries)]
+        assert all(full_scan(*query) == indexed(*query) for query in queries), f'result mismatch: {case}'
+        for name, func in (('full scan', full_scan), ('lsh bands', indexed)):
+            samples = []
+            for query in queries:
+                samples += timed(lambda: func(*query), 1)
+            rows.append({'case': case, 'path': name, **summarize(samples)})
+    print_table(f'{args.jobs} jobs of one recruiter, {args.queries} lookups per case '
+                f'(numpy={"yes" if dedupe.numpy else "no"})', rows)
+
+    rows = []
+    for words in (0, 1, 2, 3, 5, 10):
+        caught = sum(
+            indexed(job.title, edit(rng, job.description, words)) is not None
+            for job in rng.sample(jobs, args.queries)
+        )
+        rows.append({'repost': f'{words}-word edit', 'matched_%': caught / args.queries * 100})
+    wrong = sum(indexed('Role 0', posting(rng, blurb)) is not None for _ in range(args.queries))
+    rows.append({'repost': 'new posting (false match)', 'matched_%': wrong / args.queries * 100})
+    print_table(f'Detection at max distance {settings.JOB_DUPLICATE_MAX_DISTANCE}', rows)
+
+    start = time.perf_counter()
+    call_command('dedupe_jobs', stdout=io.StringIO())
+    print(f'\nmanage.py dedupe_jobs over {args.jobs} jobs: {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
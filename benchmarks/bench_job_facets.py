@@ -0,0 +1,73 @@
+"""
+Job board facet counts: one query per facet vs one UNION ALL query vs cache.
+
+"per facet" is the straightforward implementation (a separate aggregate
+query for job_type, salary bucket, location and company); "one query" is
+JobPortal.facets.compute_facets; "cached" is cached_facets() after the first
+call for the same filters. Set DB_ENGINE to a server database to see the
+round trips that "one query" saves.
+
+    python -m benchmarks.bench_job_facets --jobs 100000
+"""
+import argparse
+import random
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+
+def seed(jobs, rng):
+    from JobPortal.models import Job, Recruiter, User
+
+    users = User.objects.bulk_create(User(email=f'recruiter{i}@bench.local', role='recruiter') for i in range(200))
+    recruiters = Recruiter.objects.bulk_create(Recruiter(user=user, company_name=f'Company {i}') for i, user in enumerate(users))
+    cities = ['Delhi', 'Mumbai', 'Bangalore', 'Pune', 'Hyderabad', 'Chennai', 'Kolkata', 'Remote'] + [f'Town {i}' for i in range(100)]
+    job_types = ['full_time', 'part_time', 'internship', 'contract']
+    Job.objects.bulk_create(
+        (Job(title=f'Job {i}', description='-', recruiter=rng.choice(recruiters), location=rng.choice(cities),
+             job_type=rng.choice(job_types), salary=rng.choice([None, rng.randrange(5000, 400000)]))
+         for i in range(jobs)),
+        batch_size=2000,
+    )
+
+
+def per_facet(queryset):
+    from django.db.models import Count
+
+    from JobPortal.facets import _facet_expressions
+
+    queryset = queryset.order_by()
+    return {
+        facet: list(queryset.values(value=expression).annotate(count=Count('pk')))
+        for facet, expression in _facet_expressions().items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.http import QueryDict
+
+    from JobPortal import facets
+    from JobPortal.models import Job
+
+    seed(args.jobs, random.Random(39))
+    rows = []
+    for label, query in (('all jobs', ''), ('full_time, 50k-100k', 'job_type=full_time&salary=50000-100000')):
+        params = QueryDict(query)
+        queryset = facets.filter_jobs(Job.objects.all(), params)
+        facets.cached_facets(queryset, 'all', params)
+        for name, func in (
+            ('per facet', lambda: per_facet(queryset)),
+            ('one query', lambda: facets.compute_facets(queryset)),
+            ('cached', lambda: facets.cached_facets(queryset, 'all', params)),
+        ):
+            rows.append({'filters': label, 'path': name, **summarize(timed(func, args.repeat))})
+    print_table(f'Facet counts over {args.jobs} jobs', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Memory and latency of the application list: buffered DRF path vs streaming.
+
+The buffered path is what ApplicationViewSet.list did before streaming:
+``ApplicationSerializer(queryset, many=True).data`` rendered by DRF's
+JSONRenderer. The streaming path consumes the StreamingHttpResponse chunk by
+chunk the way a WSGI server writes it out.
+
+A second table compares the representations a list can stream: the full
+serializer, the compact list serializer the list endpoints now default to,
+and a sparse ``?fields=`` selection, for applications and jobs.
+
+    python -m benchmarks.bench_list_rendering --applications 50000 --jobs 20000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.common import print_table, setup_django
+
+
+def seed(applications, jobs):
+    from JobPortal.models import Application, Employee, Job, Recruiter, User
+
+    recruiter_user = User.objects.create_user('recruiter@bench.local', 'x', role='recruiter')
+    recruiter = Recruiter.objects.create(user=recruiter_user, company_name='Bench')
+    jobs = Job.objects.bulk_create(
+        Job(title=f'Job {i}', description='Lorem ipsum ' * 40, recruiter=recruiter,
+            location='Delhi', job_type='full_time', salary=50000 + i)
+        for i in range(jobs)
+    )
+    users = User.objects.bulk_create(
+        User(email=f'employee{i}@bench.local', role='employee') for i in range(1000)
+    )
+    employees = Employee.objects.bulk_create(
+        Employee(user=user, phone_number='0', location='Delhi') for user in users
+    )
+    Application.objects.bulk_create(
+        (Application(employee=employees[i % len(employees)], job=jobs[i % 100],
+                     cover_letter='I would like to apply. ' * 10)
+         for i in range(applications)),
+        batch_size=2000,
+    )
+
+
+def buffered():
+    from rest_framework.renderers import JSONRenderer
+
+    from JobPortal.models import Application
+    from JobPortal.serializers import ApplicationSerializer
+
+    data = ApplicationSerializer(Application.objects.all(), many=True).data
+    body = JSONRenderer().render({'message': 'Applications List retrieved successfully.', 'data': data})
+    return len(body)
+
+
+def streaming():
+    from JobPortal.models import Application
+    from JobPortal.serializers import ApplicationSerializer
+    from JobPortal.streaming import streaming_list_response
+
+    response = streaming_list_response(
+        'Applications List retrieved successfully.', Application.objects.all(), ApplicationSerializer,
+    )
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def representation(model_name, serializer_name, fields=None):
+    def render():
+        from JobPortal import models, serializers
+        from JobPortal.streaming import streaming_list_response
+
+        response = streaming_list_response(
+            'List retrieved successfully.', getattr(models, model_name).objects.all(),
+            getattr(serializers, serializer_name), fields=fields,
+        )
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return render
+
+
+REPRESENTATIONS = [
+    ('applications: full', 'Application', 'ApplicationSerializer', None),
+    ('applications: compact (default)', 'Application', 'ApplicationListSerializer', None),
+    ('applications: ?fields=id,job,status', 'Application', 'ApplicationSerializer', ['id', 'job', 'status']),
+    ('jobs: full', 'Job', 'JobSerializer', None),
+    ('jobs: compact (default)', 'Job', 'JobListSerializer', None),
+    ('jobs: ?fields=id,title', 'Job', 'JobSerializer', ['id', 'title']),
+]
+
+
+def measure(name, func):
+    # Latency without tracemalloc (it slows allocation-heavy code), then memory.
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'path': name, 'seconds': elapsed, 'peak_mb': peak / 2 ** 20, 'body_mb': size / 2 ** 20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--applications', type=int, default=50000)
+    parser.add_argument('--jobs', type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django()
+    from JobPortal import streaming as streaming_module
+
+    seed(args.applications, max(args.jobs, 100))
+    rows = [measure('buffered (DRF)', buffered), measure('streaming', streaming)]
+    encoder = 'orjson' if streaming_module.orjson is not None else 'json'
+    print_table(f'{args.applications} applications, streaming encoder: {encoder}', rows)
+
+    rows = [measure(name, representation(*spec)) for name, *spec in REPRESENTATIONS]
+    print_table(f'Representations ({args.applications} applications, {max(args.jobs, 100)} jobs)', rows)
+
+
+if __name__ == '__main__':
+    main()
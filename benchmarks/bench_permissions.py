@@ -0,0 +1,134 @@
+"""
+Per-request permission overhead: compiled permission matrix vs ad hoc role checks.
+
+For every role and method the benchmark times what runs per request: the
+decision (has_permission, then has_object_permission on a row of the
+scoped queryset) and scope_queryset (building the queryset, not running
+it), which is mostly ORM work either way. The ad hoc
+classes are the role/is_superuser checks the permission classes made
+before the matrix (without subadmin). A full GET /applications/<id>/
+through the test client is timed for scale.
+
+    python -m benchmarks.bench_permissions --repeat 20000
+"""
+import argparse
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+METHODS = ['GET', 'POST', 'PATCH', 'DELETE']
+
+
+def adhoc_classes():
+    from django.db.models import F
+    from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+    from JobPortal.permissions import _owner_user_id
+
+    class AdHocJobs(BasePermission):
+        def has_permission(self, request, view):
+            if request.method in SAFE_METHODS:
+                return request.user.is_authenticated
+            return request.user.is_authenticated and (request.user.role == 'recruiter' or request.user.is_superuser)
+
+        def scope_queryset(self, request, queryset):
+            user = request.user
+            if user.role == 'recruiter':
+                queryset = queryset.filter(recruiter__user_id=user.pk)
+            elif not user.is_superuser:
+                return queryset.none()
+            return queryset.annotate(recruiter_user_id=F('recruiter__user_id'))
+
+        def has_object_permission(self, request, view, obj):
+            if request.method in SAFE_METHODS:
+                return True
+            if request.user.role == 'recruiter':
+                return _owner_user_id(obj, 'recruiter_user_id', ('recruiter', 'user_id')) == request.user.pk
+            return request.user.is_superuser
+
+    class AdHocApplications(BasePermission):
+        def has_permission(self, request, view):
+            return request.user.is_authenticated
+
+        def scope_queryset(self, request, queryset):
+            user = request.user
+            if user.role == 'employee':
+                queryset = queryset.filter(employee__user_id=user.pk)
+            elif user.role == 'recruiter':
+                queryset = queryset.filter(job__recruiter__user_id=user.pk)
+            return queryset.annotate(employee_user_id=F('employee__user_id'),
+                                     job_recruiter_user_id=F('job__recruiter__user_id'))
+
+        def has_object_permission(self, request, view, obj):
+            if request.user.is_superuser:
+                return request.method in ('GET', 'DELETE')
+            if request.user.role == 'employee' and request.method in ('GET', 'PUT', 'PATCH', 'DELETE'):
+                return _owner_user_id(obj, 'employee_user_id', ('employee', 'user_id')) == request.user.pk
+            if request.user.role == 'recruiter' and request.method in ('GET', 'PUT', 'PATCH'):
+                return _owner_user_id(obj, 'job_recruiter_user_id', ('job', 'recruiter', 'user_id')) == request.user.pk
+            return False
+
+    return AdHocJobs(), AdHocApplications()
+
+
+def seed():
+    from JobPortal.models import Application, Employee, Job, Recruiter, User
+
+    users = {role: User.objects.create_user(f'{role}@bench.local', 'x', role=role)
+             for role in ('employee', 'recruiter', 'superadmin', 'subadmin')}
+    recruiter = Recruiter.objects.create(user=users['recruiter'], company_name='Bench')
+    employee = Employee.objects.create(user=users['employee'], phone_number='0', location='Delhi')
+    job = Job.objects.create(title='Job', description='-', recruiter=recruiter, location='Delhi', job_type='full_time')
+    application = Application.objects.create(employee=employee, job=job)
+    return users, job, application
+
+
+def decide(permission, request, obj):
+    return permission.has_permission(request, None) and permission.has_object_permission(request, None, obj)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django(CELERY_BROKER_URL='memory://', CELERY_RESULT_BACKEND='cache+memory://')
+    from rest_framework.request import Request
+    from rest_framework.test import APIClient, APIRequestFactory
+
+    from JobPortal.models import Application, Job
+    from JobPortal.permissions import IsEmployeeRecruiterOrSuperadmin, IsRecruiterOrSuperadmin
+
+    users, job, application = seed()
+    factory = APIRequestFactory()
+    adhoc_jobs, adhoc_applications = adhoc_classes()
+    resources = [
+        ('job', Job.objects.all(), IsRecruiterOrSuperadmin(), adhoc_jobs),
+        ('application', Application.objects.all(), IsEmployeeRecruiterOrSuperadmin(), adhoc_applications),
+    ]
+
+    rows = []
+    for name, queryset, matrix, adhoc in resources:
+        for path, permission in (('matrix', matrix), ('ad hoc', adhoc)):
+            decisions, scopes = [], []
+            for user in users.values():
+                for method in METHODS:
+                    request = Request(getattr(factory, method.lower())('/'))
+                    request.user = user
+                    # A row as the view gets it: scoped, with the owners annotated.
+                    obj = matrix.scope_queryset(request, queryset).first() or queryset.first()
+                    decisions += timed(lambda: decide(permission, request, obj), args.repeat // 16)
+                    scopes += timed(lambda: permission.scope_queryset(request, queryset), args.repeat // 64)
+            rows.append({'resource': name, 'path': path, 'step': 'decision', **summarize(decisions)})
+            rows.append({'resource': name, 'path': path, 'step': 'scope_queryset', **summarize(scopes)})
+    print_table('Permission work per request (all roles x GET/POST/PATCH/DELETE)', rows)
+
+    client = APIClient()
+    client.force_authenticate(users['employee'])
+    url = f'/applications/{application.pk}/'
+    client.get(url)
+    request_samples = timed(lambda: client.get(url), 500)
+    print_table('For scale', [{'request': f'GET {url} (employee)', **summarize(request_samples)}])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Idle SSE connections per process and publish-to-delivery latency.
+
+Opens N in-process Server-Sent Events streams against JobHunt.asgi (fake
+ASGI receive/send, no sockets, so the number measures the server side only),
+then publishes one event per user from a separate thread, the way sync views
+publish after commit, and waits until every stream has written it.
+
+    python -m benchmarks.bench_push_fanout --connections 20000
+"""
+import argparse
+import asyncio
+import threading
+import time
+import tracemalloc
+
+from benchmarks.common import print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--connections', type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django(temp_db=False)
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from JobHunt.asgi import application
+    from JobPortal.models import User
+    from JobPortal.push import hub
+
+    async def run():
+        delivered = asyncio.Event()
+        received = 0
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal received
+            if message.get('body', b'').startswith(b'id: '):
+                received += 1
+                if received == args.connections:
+                    delivered.set()
+
+        def scope(user_id):
+            token = AccessToken.for_user(User(pk=user_id))
+            return {'type': 'http', 'path': '/events/', 'query_string': f'token={token}'.encode(), 'headers': []}
+
+        scopes = [scope(user_id) for user_id in range(1, args.connections + 1)]
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        streams = [asyncio.ensure_future(application(s, receive, send)) for s in scopes]
+        while hub.connection_count() < args.connections:
+            await asyncio.sleep(0.01)
+        connect_seconds = time.perf_counter() - start
+        per_connection = (tracemalloc.get_traced_memory()[0] - before) / args.connections
+        tracemalloc.stop()
+
+        def publisher():
+            for user_id in range(1, args.connections + 1):
+                hub.publish(user_id, 'application.status', {'id': user_id, 'status': 'interview'})
+
+        start = time.perf_counter()
+        threading.Thread(target=publisher).start()
+        await delivered.wait()
+        fanout_seconds = time.perf_counter() - start
+
+        disconnect.set()
+        await asyncio.gather(*streams)
+        return [{
+            'connections': args.connections,
+            'threads': threading.active_count(),
+            'connect_s': connect_seconds,
+            'kb_per_connection': per_connection / 1024,
+            'deliver_all_s': fanout_seconds,
+            'us_per_event': fanout_seconds / args.connections * 1e6,
+            'open_after_close': hub.connection_count(),
+        }]
+
+    print_table('SSE streams in one process', asyncio.run(run()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Parallel writers and readers on one SQLite file, default vs production profile.
+
+Writer processes submit Applications the way ApplicationViewSet.create does
+(validate the job, then insert) inside a transaction; reader processes list
+a user's applications. Each profile runs on a fresh database file, since WAL
+mode is persistent.
+
+    python -m benchmarks.bench_sqlite_concurrency --writers 4 --readers 4
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import print_table, summarize
+
+
+def _setup(environ):
+    os.environ.update(environ)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'JobHunt.settings'
+    import django
+
+    django.setup()
+
+
+def _prepare(environ):
+    _setup(environ)
+    from django.core.management import call_command
+
+    from JobPortal.models import Employee, Job, Recruiter, User
+
+    call_command('migrate', verbosity=0)
+    recruiter_user = User.objects.create_user('recruiter@bench.local', 'x', role='recruiter')
+    recruiter = Recruiter.objects.create(user=recruiter_user, company_name='Bench')
+    Job.objects.create(title='Engineer', description='...', recruiter=recruiter,
+                       location='Delhi', job_type='full_time')
+    employee_user = User.objects.create_user('employee@bench.local', 'x', role='employee')
+    Employee.objects.create(user=employee_user, phone_number='0', location='Delhi')
+
+
+def _writer(environ, seconds, results):
+    _setup(environ)
+    from django.db import OperationalError, transaction
+
+    from JobPortal.models import Application, Employee, Job
+
+    employee = Employee.objects.get()
+    job_id = Job.objects.values_list('id', flat=True).get()
+    samples, errors = [], 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                job = Job.objects.get(pk=job_id, is_active=True)
+                Application.objects.create(employee=employee, job=job, cover_letter='x' * 200)
+        except OperationalError:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - start)
+    results.put(('writer', samples, errors))
+
+
+def _reader(environ, seconds, results):
+    _setup(environ)
+    from django.db import OperationalError
+
+    from JobPortal.models import Application
+
+    samples, errors = [], 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            list(Application.objects.filter(employee__user__email='employee@bench.local')
+                 .order_by('-id').values('id', 'status')[:50])
+        except OperationalError:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - start)
+    results.put(('reader', samples, errors))
+
+
+def run_profile(profile, writers, readers, seconds):
+    workdir = tempfile.mkdtemp(prefix='jobhunt-sqlite-')
+    environ = {'SQLITE_PATH': os.path.join(workdir, 'bench.sqlite3'), 'SQLITE_PROFILE': profile}
+    context = multiprocessing.get_context('spawn')
+    try:
+        prepare = context.Process(target=_prepare, args=(environ,))
+        prepare.start()
+        prepare.join()
+
+        results = context.Queue()
+        processes = [context.Process(target=_writer, args=(environ, seconds, results)) for _ in range(writers)]
+        processes += [context.Process(target=_reader, args=(environ, seconds, results)) for _ in range(readers)]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    rows = []
+    for role in ('writer', 'reader'):
+        samples = [s for kind, batch, _ in collected if kind == role for s in batch]
+        errors = sum(e for kind, _, e in collected if kind == role)
+        row = dict(profile=profile or 'default', role=role, ops_per_s=len(samples) / seconds, locked_errors=errors)
+        row.update(summarize(samples) if samples else dict(mean_ms=0.0, p50_ms=0.0, p99_ms=0.0))
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    rows = run_profile('', args.writers, args.readers, args.seconds)
+    rows += run_profile('production', args.writers, args.readers, args.seconds)
+    print_table(f'{args.writers} writers / {args.readers} readers for {args.seconds}s', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Cold-start cost of the web and worker processes.
+
+Starts fresh interpreters under ``python -X importtime`` for each process
+type and INSTALLED_APPS profile, and reports the wall time, the total import
+time and the top-level imports that dominate it. "web" sets Django up and
+loads the URLconf and WSGI handler (what gunicorn does before its first
+request); "worker" sets Django up and imports the task modules through the
+Celery app (what ``celery -A JobHunt worker`` does before consuming).
+
+    python -m benchmarks.bench_startup --repeat 5 --top 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table
+
+SCENARIOS = {
+    'web': (
+        'import django; django.setup()\n'
+        'from django.conf import settings; from django.urls import get_resolver\n'
+        'get_resolver(settings.ROOT_URLCONF).url_patterns\n'
+        'from django.core.wsgi import get_wsgi_application; get_wsgi_application()\n'
+    ),
+    'worker': (
+        'import django; django.setup()\n'
+        'from JobHunt import celery_app\n'
+        'celery_app.loader.import_default_modules()\n'
+    ),
+}
+
+PROFILES = {
+    'full': {},
+    'production': {'APPS_PROFILE': 'production'},
+}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)')
+
+
+def parse_importtime(stderr):
+    """Return ``{top-level module: cumulative seconds}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match[3]) == 1:
+            modules[match[4]] = int(match[2]) / 1e6
+    return modules
+
+
+def run(scenario, environ):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'JobHunt.settings', **environ}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCENARIOS[scenario]],
+        env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        sys.exit(result.stderr)
+    return elapsed, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append')
+    args = parser.parse_args()
+
+    rows = []
+    breakdowns = {}
+    for scenario in args.scenario or sorted(SCENARIOS):
+        for profile, environ in PROFILES.items():
+            samples = [run(scenario, environ) for _ in range(args.repeat)]
+            walls = [wall for wall, _ in samples]
+            imports = [sum(modules.values()) for _, modules in samples]
+            rows.append({
+                'process': scenario,
+                'profile': profile,
+                'wall_ms': statistics.median(walls) * 1000,
+                'imports_ms': statistics.median(imports) * 1000,
+                'modules': len(samples[-1][1]),
+            })
+            breakdowns[scenario, profile] = samples[-1][1]
+    print_table(f'Process start-up, median of {args.repeat}', rows)
+
+    for (scenario, profile), modules in breakdowns.items():
+        top = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print_table(
+            f'{scenario} / {profile}: slowest top-level imports',
+            [{'module': name, 'cumulative_ms': seconds * 1000} for name, seconds in top],
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Notification task throughput with and without stored results.
+
+Queues --tasks new-application notifications on Celery's in-memory broker,
+then drains the queue and runs every message through the worker's own
+tracer (result backend write, signals, metrics hook), with mail going to
+the locmem backend. This runs once with ``ignore_result=False`` forced (what
+every notification task did before) and once fire-and-forget, as the tasks
+are now declared. The cache+memory result backend is local, so
+--backend-ms adds the round trip a Redis write would cost to each stored
+result.
+
+    python -m benchmarks.bench_task_throughput --tasks 5000 --backend-ms 0.5
+"""
+import argparse
+import time
+
+from benchmarks.common import print_table, setup_django
+
+
+def publish(task, count, options):
+    for i in range(count):
+        task.apply_async(('recruiter@bench.local', 'Engineer', f'Applicant {i}'), **options)
+
+
+def drain(app, queue):
+    from celery.app.trace import trace_task_ret
+
+    executed = 0
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        while (message := channel.basic_get(queue, no_ack=True)) is not None:
+            headers = message.headers
+            trace_task_ret(headers['task'], headers['id'], dict(headers), message.body,
+                           message.content_type, message.content_encoding, app=app)
+            executed += 1
+    return executed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--backend-ms', type=float, default=0.5, help='simulated result backend round trip')
+    args = parser.parse_args()
+
+    setup_django(temp_db=False, CELERY_BROKER_URL='memory://', CELERY_RESULT_BACKEND='cache+memory://')
+    from django.conf import settings
+    from django.core import mail
+    from django.core.cache import cache
+
+    from JobHunt.celery_config import app
+    from JobPortal import metrics, tasks
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    backend = app.backend
+    store = backend.set
+
+    def slow_set(key, value):
+        time.sleep(args.backend_ms / 1000)
+        return store(key, value)
+
+    backend.set = slow_set
+    task = tasks.send_application_notification
+    queue = settings.CELERY_TASK_ROUTES[task.name]['queue']
+
+    rows = []
+    for mode, options in (('stored results', {'ignore_result': False}), ('fire-and-forget', {})):
+        backend.client.cache.clear()
+        cache.clear()
+        metrics.reset()
+        mail.outbox = []
+
+        start = time.perf_counter()
+        publish(task, args.tasks, options)
+        published = time.perf_counter() - start
+        start = time.perf_counter()
+        executed = drain(app, queue)
+        elapsed = time.perf_counter() - start
+
+        assert executed == len(mail.outbox) == args.tasks, mode
+        snapshot = metrics.snapshot()
+        recorded = snapshot['timings'][f'tasks.{task.name.rsplit(".", 1)[-1]}.duration']
+        rows.append({
+            'mode': mode,
+            'publish_per_s': args.tasks / published,
+            'execute_per_s': executed / elapsed,
+            'results_stored': len(backend.client.cache),
+            'metrics_samples': recorded['count'],
+            'mean_task_ms': recorded['total'] / recorded['count'] * 1000,
+        })
+    print_table(f'{args.tasks} notifications, result backend round trip {args.backend_ms} ms', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Refresh-token throughput with rotation, and the cost of a revocation check.
+
+Refreshes run through the serializer behind /api/token/refresh/ (signing
+included, HTTP excluded): simplejwt's stock non-rotating refresh against the
+rotating one that denylists every used token. Revocation checks compare the
+denylist's Bloom-filter path for tokens that were never revoked with a cache
+read and an indexed database lookup, the per-request cost of simplejwt's
+token_blacklist app.
+
+    python -m benchmarks.bench_token_refresh --refreshes 5000 --revoked 100000
+"""
+import argparse
+import time
+import uuid
+
+from benchmarks.common import print_table, setup_django
+
+
+def rate(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    return {'ops_per_s': len(items) / elapsed, 'us_per_op': elapsed / len(items) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--refreshes', type=int, default=5000)
+    parser.add_argument('--revoked', type=int, default=100000)
+    parser.add_argument('--checks', type=int, default=200000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from JobPortal.denylist import denylist
+    from JobPortal.models import User
+    from JobPortal.tokens import RotatingTokenRefreshSerializer
+
+    user = User.objects.create_user('bench@bench.local', 'x', role='employee')
+
+    def stock(token):
+        serializer = TokenRefreshSerializer(data={'refresh': token})
+        serializer.is_valid(raise_exception=True)
+
+    def rotating(token):
+        serializer = RotatingTokenRefreshSerializer(data={'refresh': token})
+        serializer.is_valid(raise_exception=True)
+
+    rows = []
+    for name, func in (('stock, no rotation', stock), ('rotating + denylist', rotating)):
+        tokens = [str(RefreshToken.for_user(user)) for _ in range(args.refreshes)]
+        rows.append({'refresh': name, **rate(func, tokens)})
+    print_table(f'{args.refreshes} refreshes', rows)
+
+    exp = time.time() + 3600
+    for _ in range(args.revoked):
+        denylist.revoke(uuid.uuid4().hex, exp)
+    fresh = [uuid.uuid4().hex for _ in range(args.checks)]
+    false_positives = sum(1 for jti in fresh if denylist.is_revoked(jti))
+    filter_bytes = len(denylist._current.bits) + len(denylist._previous.bits)
+    user_ids = [user.pk] * min(args.checks, 20000)
+
+    rows = [
+        {'check': 'denylist.is_revoked', **rate(denylist.is_revoked, fresh)},
+        {'check': 'cache.get', **rate(lambda jti: cache.get('jwt-deny:' + jti), fresh)},
+        {'check': 'indexed DB lookup', **rate(lambda pk: User.objects.filter(pk=pk).exists(), user_ids)},
+    ]
+    print_table(
+        f'revocation check, token not revoked ({args.revoked} revoked, {false_positives} false positives '
+        f'in {args.checks}, filters {filter_bytes / 1024:.0f} KiB)',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Every benchmark runs against a throwaway, freshly migrated SQLite database
+unless DB_ENGINE points at a server backend. Run them from the project root:
+
+    python -m benchmarks.<name>
+"""
+import atexit
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+
+def setup_django(temp_db=True, **environ):
+    """Configure settings (optionally on a temporary database) and call django.setup()."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'JobHunt.settings')
+    # Benchmarks read metrics.snapshot(); a reporter would reset it mid-run.
+    os.environ.setdefault('METRICS_REPORT_SECONDS', '0')
+    os.environ.update({key: str(value) for key, value in environ.items()})
+    if temp_db and os.getenv('DB_ENGINE', 'sqlite3') == 'sqlite3':
+        workdir = tempfile.mkdtemp(prefix='jobhunt-bench-')
+        atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+        os.environ['SQLITE_PATH'] = os.path.join(workdir, 'bench.sqlite3')
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.ALLOWED_HOSTS = ['*']
+    if temp_db:
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+
+
+def timed(func, repeat):
+    """Call ``func`` ``repeat`` times and return the per-call durations in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p99_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+    }
+
+
+def print_table(title, rows):
+    """Print a list of dicts with the same keys as an aligned table."""
+    print(f'\n{title}')
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[_format(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(cell[i]) for cell in cells)) for i, column in enumerate(columns)]
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for cell in cells:
+        print('  '.join(value.ljust(width) for value, width in zip(cell, widths)))
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f'{value:.3f}'
+    return str(value)